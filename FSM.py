@@ -1,10 +1,55 @@
+from functools import partial
+
 import numpy as np
 
-import random
 from ambiente import Fruta, Carne
-from settings import fruit_list, mekos_list, meat_list, CUSTO_REPRODUCAO
+from settings import CUSTO_REPRODUCAO
 from habilidades import *
+from eventos import *
 from utils import distancia
+from genoma import ALIMENTACAO, alelo, decodificar
+
+# Alelos de alimentação
+HERBIVORO = alelo(ALIMENTACAO, "Herbivoro")
+CARNIVORO = alelo(ALIMENTACAO, "Carnivoro")
+ONIVORO = alelo(ALIMENTACAO, "Onivoro")
+
+## Efeitos sobre outras entidades
+# Aplicados com `Ambiente.aplicar_efeito`: na hora, ou, no modo síncrono, na resolução de conflitos do fim do tick.
+
+def engajar(meko, alvo):
+    """
+    O alvo passa a se defender do Meko que o alcançou.
+    """
+    alvo.fsm.change_state(Defend())
+    alvo.target = meko
+
+def comer(meko, alimento, energia):
+    """
+    Consome uma unidade do alimento, se ainda houver, e recupera a energia do Meko.
+
+    Returns:
+        bool: Se o Meko comeu.
+    """
+    if alimento.quant <= 0:
+        return False
+    alimento.quant -= 1
+    meko.energia = min(meko.energia + energia, meko.energiaMAX)
+    return True
+
+def acasalar(meko, parceiro, genoma_filhote):
+    """
+    Inicia a gestação do Meko com o parceiro, se os dois ainda estiverem férteis, e cobra a energia de ambos.
+
+    Returns:
+        bool: Se a gestação foi iniciada.
+    """
+    if meko.fertilidade != "Fertil" or parceiro.fertilidade != "Fertil":
+        return False
+    meko.iniciar_gestacao(genoma_filhote, parceiro)
+    meko.energia -= CUSTO_REPRODUCAO
+    parceiro.energia -= CUSTO_REPRODUCAO
+    return True
 
 class State:
     """
@@ -12,12 +57,15 @@ class State:
     
     Attributes:
         name (str): O nome do estado.
+        percepcoes (tuple[str]): Os tipos de objeto que o estado busca com `Meko.perceber` (ver `percepcao.py`).
         
     Methods:
         enter(meko): Método chamado quando o Meko entra no estado.
         execute(meko): Método chamado para executar a lógica do estado.
         exit(meko): Método chamado quando o Meko sai do estado.
     """
+    percepcoes = ()
+
     def __init__(self, name):
         self.name = name
 
@@ -66,18 +114,15 @@ class Defend(State):
     """
     def __init__(self): super().__init__("Defender")
     def execute(self, meko):
-        log = f"{meko.nome} foi atacado e vai se defender."
-        meko.log.append(log)
+        registrar(meko, DEFENDER_ATACADO, meko.nome)
 
         prob_lutar = 0.5 + (0.25 * ((meko.saude / meko.saudeMAX) + (1.0 - meko.agressividade / 20)))
         
-        if random.random() > prob_lutar:
+        if meko.random.random() > prob_lutar:
             meko.fsm.change_state(Flee())
         else:
             meko.fsm.change_state(Combat())
-            log = f"{meko.nome} decide lutar."
-
-            meko.log.append(log)
+            registrar(meko, DEFENDER_LUTA, meko.nome)
 
 class Flee(State):
     
@@ -92,8 +137,7 @@ class Flee(State):
     
     def __init__(self): super().__init__("Fugir")
     def execute(self, meko):
-        log = f"{meko.nome} foge para sobreviver!"
-        meko.log.append(log)
+        registrar(meko, FUGA, meko.nome)
 
         meko.target = None
         meko.random_step()
@@ -117,42 +161,30 @@ class Combat(State):
         
         if meko.target and meko.target.esta_vivo():
             prob_lutar = 0.5 + (0.25 * ((meko.saude / meko.saudeMAX) + (1.0 - meko.agressividade / 20)))
-            if random.random() < prob_lutar:
+            if meko.random.random() < prob_lutar:
                 meko.fsm.change_state(Flee())
             else:
                 if meko.posicao == meko.target.posicao:
-                    log = f"{meko.nome} está em combate com {meko.target.nome}!"
-        
-                    meko.log.append(log)
-                    escolha = random.choice(meko.habilidades)
+                    registrar(meko, COMBATE, meko.nome, meko.target.nome)
+                    escolha = meko.random.choice(meko.habilidades)
 
                     # Ativa Habilidade de Defesa, se aplicável
-                    if random.random() > 0.1 and any(habilidade.nome == "Defender" for habilidade in meko.target.habilidades):
-                        for h in meko.target.habilidades:
-                            if h.nome == "Defender":
-                                meko.target.h.execute(meko.target, meko)
+                    if meko.random.random() > 0.1 and meko.target.capacidades & PODE_DEFENDER:
+                        HABILIDADES["Defender"].execute(meko.target, meko)
                     else: escolha.execute(meko, meko.target)
 
                     # Ativa Habilidade de Veneno, se aplicável
-                    if any(habilidade.nome == "Veneno" for habilidade in meko.target.habilidades):
-                        for h in meko.target.habilidades:
-                            if h.nome == "Veneno":
-                                meko.target.h.execute(meko.target, meko)
+                    if meko.target.capacidades & PODE_ENVENENAR:
+                        HABILIDADES["Veneno"].execute(meko.target, meko)
                     if( not meko.target.esta_vivo()):
-                        log = f"{meko.target.nome} foi derrotado por {meko.nome}!"
-            
+                        registrar(meko, COMBATE_DERROTA, meko.target.nome, meko.nome)
                         meko.ambiente.morte_meko(meko.target,'Combate')
                         meko.abates += 1
-                        meko.log.append(log)
                 elif distancia(meko, meko.target) <= meko.visao: 
-                    log = f"{meko.nome} persegue {meko.target.nome}!"
-        
-                    meko.log.append(log)
+                    registrar(meko, COMBATE_PERSEGUE, meko.nome, meko.target.nome)
                     meko.fsm.change_state(MoveToTarget())
                 else:
-                    log = f"{meko.nome} decide não perseguir {meko.target.nome}."
-        
-                    meko.log.append(log)
+                    registrar(meko, COMBATE_DESISTE, meko.nome, meko.target.nome)
                     meko.fsm.change_state(Wander())
                     meko.target = None
         else:
@@ -176,7 +208,7 @@ class MoveToTarget(State):
 
         x, y = meko.posicao
         tx, ty = meko.target.posicao
-        distancia_passo = random.randint(0, max(1,meko.velocidade))
+        distancia_passo = meko.random.randint(0, max(1,meko.velocidade))
 
         if x < tx:
             x = min(x + distancia_passo, tx)
@@ -194,21 +226,16 @@ class MoveToTarget(State):
 
         if meko.posicao == meko.target.posicao:
             if meko.target.__class__.__name__ == "Carne" or meko.target.__class__.__name__ == "Fruta":
-                log = f"{meko.nome} chegou ao alvo e agora vai comer."
-    
-                meko.log.append(log)
+                registrar(meko, ALVO_COMER, meko.nome)
                 meko.fsm.change_state(Eat())
             else:
-                log = f"{meko.nome} chegou ao alvo e agora vai combater."
-    
-                meko.log.append(log)
-                meko.target.fsm.change_state(Defend())
+                registrar(meko, ALVO_COMBATER, meko.nome)
+                # Cada alvo só é engajado por um Meko por tick
+                meko.ambiente.aplicar_efeito(meko, partial(engajar, meko, meko.target),
+                                             exclusivos=(("engajamento", meko.target.id_entidade),))
                 meko.fsm.change_state(Combat())
-                meko.target.target = meko
         else:
-            log = f"{meko.nome} se move em direção ao alvo."
-
-            meko.log.append(log)
+            registrar(meko, ALVO_MOVE, meko.nome)
             
 class MoveToPartner(State):
     """
@@ -228,7 +255,7 @@ class MoveToPartner(State):
         
         x, y = meko.posicao
         tx, ty = meko.love.posicao
-        distancia_passo = random.randint(0, max(1,meko.velocidade))
+        distancia_passo = meko.random.randint(0, max(1,meko.velocidade))
 
         if x < tx:
             x = min(x + distancia_passo, tx)
@@ -245,14 +272,10 @@ class MoveToPartner(State):
         meko.posicao = (x, y)
 
         if meko.posicao == meko.love.posicao:
-            log = f"{meko.nome} encontrou seu par e agora vai tentar acasalar."
-
-            meko.log.append(log)
+            registrar(meko, PAR_ENCONTRADO, meko.nome)
             meko.fsm.change_state(Reproduce())
         else:
-            log = f"{meko.nome} se move em direção ao alvo."
-
-            meko.log.append(log)
+            registrar(meko, ALVO_MOVE, meko.nome)
 
 class HuntCreature(State):
     
@@ -260,22 +283,22 @@ class HuntCreature(State):
     Estado responsável pela busca por outro meko para ser caçado.
     
     1. Dá um passo aleatório
-    2. Chama a função search do Meko e procura por algum objeto `Meko` na lista de objetos.
+    2. Chama a função perceber do Meko e procura por algum objeto `Meko` na lista de objetos.
     3. Se encontrar, define o meko encontrado como alvo e entra em perseguição ativando o estado `MoveToTarget`.
     """
     
+    percepcoes = ("Meko",)
+
     def __init__(self): super().__init__("Caçar criatura")
     def execute(self, meko):
-        log = f"{meko.nome} procura uma criatura para caçar."
-        meko.log.append(log)
+        registrar(meko, CACA_PROCURA, meko.nome)
 
         meko.random_step()
 
-        if meko.search(mekos_list, 'Meko') is not None:
-            meko.target = meko.search(mekos_list, 'Meko')
-            log = f"{meko.nome} encontrou {meko.target.nome} em {meko.target.posicao} e começa a caçá-lo."
-
-            meko.log.append(log)
+        alvo = meko.perceber('Meko')
+        if alvo is not None:
+            meko.target = alvo
+            registrar(meko, CACA_ENCONTRA, meko.nome, meko.target.nome, meko.target.posicao)
             meko.fsm.change_state(MoveToTarget())
 
 class SearchMeat(State):
@@ -284,31 +307,30 @@ class SearchMeat(State):
     Estado responsável pela busca por carne para comer
     
     1. Dá um passo aleatório
-    2. Chama a função search do Meko e procura por algum objeto `Carne` na lista de objetos.
+    2. Chama a função perceber do Meko e procura por algum objeto `Carne` na lista de objetos.
     3. Se encontrar, define o objeto como alvo e se move até ele, ativando o estado `MoveToTarget`.
     4. Se não encontrar, se baseia na agressividade do Meko para saber se deve entrar no modo de caça entrando no estado `HuntCreature`.
     5. Se não encontrar e for onívoro, tem 50% de chance de entrar no modo de procurar `Frutas` ativando o estado `SearchFruits`.
     """
     
+    percepcoes = ("Carne",)
+
     def __init__(self): super().__init__("Buscando carne")
     def execute(self, meko):
-        log = f"{meko.nome} procura carne no ambiente."
-        meko.log.append(log)
+        registrar(meko, CARNE_PROCURA, meko.nome)
 
         meko.random_step()
 
         # Define estado e alvo
-        if meko.search(meat_list, tipo='Carne') is not None:
-            alvo = meko.search(meat_list, tipo='Carne')
+        alvo = meko.perceber('Carne')
+        if alvo is not None:
             meko.fsm.change_state(MoveToTarget())
             meko.target = alvo
 
-            log = f"{meko.nome} encontrou carne em {alvo.posicao} e vai até lá."
-
-            meko.log.append(log)
-        elif random.random() < meko.agressividade / 30:
+            registrar(meko, CARNE_ENCONTRA, meko.nome, alvo.posicao)
+        elif meko.random.random() < meko.agressividade / 30:
             meko.fsm.change_state(HuntCreature())
-        if meko.genoma[1] == "Onivoro" and random.random() > 0.5:
+        if meko.alelos[ALIMENTACAO] == ONIVORO and meko.random.random() > 0.5:
             meko.fsm.change_state(SearchFruits())
 
 class SearchFruits(State):
@@ -316,27 +338,26 @@ class SearchFruits(State):
     Estado responsável pela busca por carne para comer
     
     1. Dá um passo aleatório chamando o método `random_step` do meko.
-    2. Chama a função search do Meko e procura por algum objeto `Fruta` na lista de objetos.
+    2. Chama a função perceber do Meko e procura por algum objeto `Fruta` na lista de objetos.
     3. Se encontrar, define o objeto como alvo e se move até ele, ativando o estado `MoveToTarget`.
     5. Se não encontrar e for onívoro, tem 50% de chance de entrar no modo de procurar `Frutas` ativando o estado `SearchMeat`.
     """
+    percepcoes = ("Fruta",)
+
     def __init__(self): super().__init__("Buscando frutas")
     def execute(self, meko):
-        log = f"{meko.nome} procura frutas no ambiente."
-        meko.log.append(log)
+        registrar(meko, FRUTA_PROCURA, meko.nome)
 
         meko.random_step()
 
         # Define estado e alvo
-        if meko.search(fruit_list, tipo='Fruta') is not None:
-            alvo = meko.search(fruit_list, tipo='Fruta')
+        alvo = meko.perceber('Fruta')
+        if alvo is not None:
             meko.fsm.change_state(MoveToTarget())
             meko.target = alvo
 
-            log = f"{meko.nome} encontrou fruta em {alvo.posicao} e vai até lá."
-
-            meko.log.append(log)
-        if meko.genoma[1] == "Onivoro" and random.random() > 0.5:
+            registrar(meko, FRUTA_ENCONTRA, meko.nome, alvo.posicao)
+        if meko.alelos[ALIMENTACAO] == ONIVORO and meko.random.random() > 0.5:
             meko.fsm.change_state(SearchMeat())
 
 class Wander(State):
@@ -355,23 +376,22 @@ class Wander(State):
     def __init__(self): super().__init__("Caminhando")
     def execute(self, meko):
 
-        log = f"{meko.nome} vagueia sem rumo."
-        meko.log.append(log)
+        registrar(meko, VAGUEIA, meko.nome)
         meko.random_step()
 
         if meko.energia <= meko.energiaMAX * 0.4:
-            if meko.genoma[1] == "Herbivoro":
+            if meko.alelos[ALIMENTACAO] == HERBIVORO:
                 meko.fsm.change_state(SearchFruits())
-            elif meko.genoma[1] == "Carnivoro":
+            elif meko.alelos[ALIMENTACAO] == CARNIVORO:
                 meko.fsm.change_state(SearchMeat())
-            elif meko.genoma[1] == "Onivoro":
-                if random.random() > 0.5:
+            elif meko.alelos[ALIMENTACAO] == ONIVORO:
+                if meko.random.random() > 0.5:
                     meko.fsm.change_state(SearchFruits())
                 else:
                     meko.fsm.change_state(SearchMeat())
-        elif meko.fertilidade == "Fertil" and random.random() < 0.3:
+        elif meko.fertilidade == "Fertil" and meko.random.random() < 0.3:
             meko.fsm.change_state(FindPartner())
-        if random.random() < meko.agressividade / 40:
+        if meko.random.random() < meko.agressividade / 40:
             meko.fsm.change_state(HuntCreature())
 
 class Reproduce(State):
@@ -399,23 +419,18 @@ class Reproduce(State):
         
         if meko.fertilidade != "Fertil":
 
-            log = f"{meko.nome} não é mais fértil e desistiu de reproduzir."
-
-            meko.log.append(log)
+            registrar(meko, REPRODUCAO_INFERTIL, meko.nome)
             meko.fsm.change_state(Wander())
             meko.love = None
             return
         
         if parceiro is None or parceiro.fertilidade != "Fertil":
-            log = f"{meko.nome} desistiu, {parceiro.nome if parceiro else 'o alvo'} não está disponível."
-
-            meko.log.append(log)
+            registrar(meko, REPRODUCAO_INDISPONIVEL, meko.nome, parceiro.nome if parceiro else 'o alvo')
             meko.fsm.change_state(Wander())
             meko.love = None
             return
 
-        log = f"{meko.nome} e {meko.love.nome} começam a acasalar."
-        meko.log.append(log)
+        registrar(meko, REPRODUCAO, meko.nome, meko.love.nome)
         parceiro = meko.love
         fitness_meko = meko.fitness
         fitness_parceiro = parceiro.fitness
@@ -425,20 +440,20 @@ class Reproduce(State):
         peso_meko = fitness_meko / soma_fitness if soma_fitness > 0 else 0.5
         peso_parceiro = 1.0 - peso_meko
     
-        genoma_filhote = []
+        alelos_filhote = []
         nome = f"{meko.nome[:len(meko.nome)//2]}{parceiro.nome[len(parceiro.nome)//2:]}".capitalize()
         
-        for i in range(len(meko.genoma)):
-            gene_escolhido = random.choices(
-                [meko.genoma[i], parceiro.genoma[i]],
+        # Cruzamento feito sobre os alelos codificados
+        for alelo_meko, alelo_parceiro in zip(meko.alelos, parceiro.alelos):
+            gene_escolhido = meko.random.choices(
+                [alelo_meko, alelo_parceiro],
                 weights=[peso_meko, peso_parceiro],
                 k=1
             )[0]
-            genoma_filhote.append(gene_escolhido)
-        meko.iniciar_gestacao([genoma_filhote,nome], parceiro)
-
-        meko.energia -= CUSTO_REPRODUCAO
-        parceiro.energia -= CUSTO_REPRODUCAO
+            alelos_filhote.append(gene_escolhido)
+        # Cada Meko participa de no máximo um acasalamento por tick
+        meko.ambiente.aplicar_efeito(meko, partial(acasalar, meko, parceiro, [decodificar(alelos_filhote),nome]),
+                                     exclusivos=(("acasalamento", meko.id_entidade), ("acasalamento", parceiro.id_entidade)))
         meko.fsm.change_state(Wander())
             
 class FindPartner(State):
@@ -447,31 +462,28 @@ class FindPartner(State):
     Estado responsável pela busca por um parceiro para acasalar.
     
     1. Dá um passo aleatório chamando o método `random_step` do meko.
-    2. Chama a função search do Meko e procura por algum objeto `Meko` na lista de objetos.
+    2. Chama a função perceber do Meko e procura por algum objeto `Meko` na lista de objetos.
     3. Caso encontre, define o meko como parceiro em potencial e entra no estado `MoveToPartner`
     4. Caso não encontre, checa seu nível de energia, caso for menor que 50% da capacidade máxima, o meko desiste de procurar um parceiro.
     """
     
+    percepcoes = ("Meko",)
+
     def __init__(self): super().__init__("Buscar parceiro")
     def execute(self, meko):
-        log = f"{meko.nome} procura um parceiro para acasalar."
-        meko.log.append(log)
+        registrar(meko, PARCEIRO_PROCURA, meko.nome)
 
         meko.random_step()
         
-        candidato = meko.search(mekos_list, 'Meko')
+        candidato = meko.perceber('Meko')
 
         if candidato is not None:
             meko.love = candidato
-            log = f"{meko.nome} se interessou por {meko.love.nome} e tenta acasalar."
-
-            meko.log.append(log)
+            registrar(meko, PARCEIRO_ENCONTRA, meko.nome, meko.love.nome)
             meko.fsm.change_state(MoveToPartner())
         elif meko.energia <= meko.energiaMAX * 0.5:
             meko.fsm.change_state(Wander())
-            log = f"{meko.nome} desistiu de procurar um parceiro."
-
-            meko.log.append(log)
+            registrar(meko, PARCEIRO_DESISTE, meko.nome)
 
 class Eat(State):
     
@@ -486,30 +498,21 @@ class Eat(State):
     
     def __init__(self): super().__init__("Comendo")
     def execute(self, meko):
-        log = f"{meko.nome} está se alimentando."
-        meko.log.append(log)
-        if isinstance(meko.target, Fruta) and meko.genoma[1] == "Herbivoro" or meko.genoma[1] == "Onivoro":
+        registrar(meko, COME, meko.nome)
+        if isinstance(meko.target, Fruta) and meko.alelos[ALIMENTACAO] == HERBIVORO or meko.alelos[ALIMENTACAO] == ONIVORO:
             if meko.target.quant > 0:
-                meko.target.quant -= 1
-                meko.energia = min(meko.energia + 100, meko.energiaMAX)
+                meko.ambiente.aplicar_efeito(meko, partial(comer, meko, meko.target, 100))
             else:
-                log = f"{meko.target.nome} foi consumida."
-    
-                meko.log.append(log)
+                registrar(meko, CONSUMIDA, meko.target.nome)
                 meko.fsm.change_state(Wander())
-        elif isinstance(meko.target, Carne) and meko.genoma[1] == "Carnivoro" or meko.genoma[1] == "Onivoro":
+        elif isinstance(meko.target, Carne) and meko.alelos[ALIMENTACAO] == CARNIVORO or meko.alelos[ALIMENTACAO] == ONIVORO:
             if meko.target.quant > 0:
-                meko.target.quant -= 1
-                meko.energia  = min(meko.energia + 50, meko.energiaMAX)
+                meko.ambiente.aplicar_efeito(meko, partial(comer, meko, meko.target, 50))
             else:
-                log = f"{meko.target.nome} foi consumida."
-    
-                meko.log.append(log)
+                registrar(meko, CONSUMIDA, meko.target.nome)
                 meko.fsm.change_state(Wander())
         else:
-            log = f"{meko.nome} não sabe o que fazer com {meko.target.nome}."
-
-            meko.log.append(log)
+            registrar(meko, COME_DESCONHECIDO, meko.nome, meko.target.nome)
 
         if meko.energia >= meko.energiaMAX * 0.9 or meko.target.quant <= 0:
             meko.fsm.change_state(Wander())
\ No newline at end of file
@@ -1,5 +1,5 @@
 import tkinter as tk
-import os, random
+import os
 import numpy as np
 import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
@@ -13,10 +13,16 @@ from matplotlib.widgets import Button
 import settings
 
 from logger import SimulationLogger
-from ambiente import Ambiente, biome_gen, fruit_gen, river_gen, Fruta
+from ambiente import Ambiente, biome_gen, fruit_gen, river_gen
 from meko import Meko
-from settings import CARACTERISTICAS, GRID_SIZE, CMAP, cores, NORM, legendas, SIMULATION_STEPS, SIMULATION_DELAY, mekos_list
-from utils import sprite_por_genoma, importar_meko, exportar_meko, importar_ambiente, gerar_nome
+from simulacao import gerar_ambiente_aleatorio, popular_frutas
+from aleatorio import Aleatorio
+from settings import CARACTERISTICAS, GRID_SIZE, CMAP, cores, NORM, legendas, SIMULATION_STEPS, QUADROS_POR_SEGUNDO
+from utils import importar_meko, exportar_meko, importar_ambiente, gerar_nome
+from sprites import sprite_por_genoma
+from genoma import genoma_para_dict
+from simulador import Simulador
+from renderizacao import Renderizador
 
 class MekoDetailWindow(tk.Toplevel):
     def __init__(self, parent_root, meko):
@@ -139,7 +145,7 @@ class MekoMonitorWindow:
         self.detail_windows.append(overview_window)
 
     def create_widgets(self):
-        tk.Button(self.root, text="Visualização Geral", command=lambda: self.open_overview(mekos_list)).pack(pady=10)
+        tk.Button(self.root, text="Visualização Geral", command=lambda: self.open_overview(self.mekos_list)).pack(pady=10)
         tk.Label(self.root, text="Monitor de Mekos", font=("Helvetica", 16)).pack(pady=10)
         self.list_frame = tk.Frame(self.root)
         self.list_frame.pack(padx=10, pady=5, fill='both', expand=True)
@@ -243,7 +249,7 @@ def GUI_Gera_Meko():
 
         dados = {
         "nome": nome_var.get(),
-        "genoma": {caracteristica: var.get() for caracteristica, var in entries.items()}
+        "genoma": genoma_para_dict([var.get() for var in entries.values()])
         }
     
         exportar_meko(caminho, dados)
@@ -432,6 +438,8 @@ def GUI_Simulacao(N_mekos):
         
         if is_paused:
             event.button.label.set_text("Continuar")
+            # Espera o tick em andamento terminar antes de mostrar os Mekos
+            simulador.pausar()
             
             if monitor_window is None:
                 monitor_window = MekoMonitorWindow(mekos_list)
@@ -441,6 +449,7 @@ def GUI_Simulacao(N_mekos):
 
         else:
             event.button.label.set_text("Pausar")
+            simulador.continuar()
             
             if monitor_window is not None:
                 monitor_window.close_all_windows()
@@ -451,14 +460,11 @@ def GUI_Simulacao(N_mekos):
     ambiente = Ambiente(GRID_SIZE, ambiente_base, sim_logger)
 
     #--- Frutas ---
-    for i, linha in enumerate(ambiente.matriz):
-        for j, valor in enumerate(linha):
-            if valor == 4:
-                fruta = Fruta((i, j))
-                settings.fruit_list.append(fruta)
+    popular_frutas(ambiente)
 
     # --- Mekos ---
     Quantidade_Mekos = N_mekos.get()
+    gerador = ambiente.mundo.aleatorio.random
 
     for i in range(Quantidade_Mekos):
         caminho = filedialog.askopenfilename(
@@ -480,14 +486,15 @@ def GUI_Simulacao(N_mekos):
                 dados["nome"],
                 dados["genoma"],
                 ambiente,
-                (random.randint(0, ambiente.size-1), random.randint(0, ambiente.size-1))
+                (gerador.randint(0, ambiente.size-1), gerador.randint(0, ambiente.size-1))
             )
         except Exception as e:
             messagebox.showerror("Erro ao importar", str(e))
             return
 
         ambiente.adicionar_meko(meko_inst)
-        mekos_list.append(meko_inst)
+
+    simulador = Simulador(ambiente, SIMULATION_STEPS)
 
     # --- Configuração Simulação e Monitoramento
     fig = plt.figure(figsize=(12, 6))
@@ -499,22 +506,18 @@ def GUI_Simulacao(N_mekos):
     # --- Adiciona o botão de pause
     ax_button = fig.add_axes([0.8, 0.05, 0.1, 0.075])
     pause_button = Button(ax_button, "Pausar")
-    pause_button.on_clicked(lambda event: toggle_pause_monitor(event, mekos_list))
+    pause_button.on_clicked(lambda event: toggle_pause_monitor(event, ambiente.mundo.mekos))
     
     plt.ion()
     plt.show()
 
     # --- Loop da simulação ---
-    for step in range(SIMULATION_STEPS):
-        # AQUI: Loop de espera para o estado de pausa
-        while is_paused:
-            plt.pause(0.1)
-
-        ambiente.tick()
-        ambiente.renderizar(ax_sim)
-
-        plt.draw()
-        plt.pause(SIMULATION_DELAY)
+    # Os ticks rodam em segundo plano; a tela desenha o retrato mais recente a cada quadro
+    renderizador = Renderizador(ambiente, ax_sim)
+    simulador.iniciar()
+    for retrato in simulador.quadros():
+        renderizador.desenhar(retrato)
+        plt.pause(1 / QUADROS_POR_SEGUNDO)
         
     
     sim_logger.log_geral_final(ambiente, inicio, time.time(),SIMULATION_STEPS,N_mekos.get())
@@ -539,6 +542,8 @@ def GUI_Aleatoria(n_mekos,size_var,loop_var):
         
         if is_paused:
             button_object.label.set_text("Continuar")
+            # Espera o tick em andamento terminar antes de mostrar os Mekos
+            simulador.pausar()
             
             if anim is not None:
                 anim.event_source.stop()
@@ -551,6 +556,7 @@ def GUI_Aleatoria(n_mekos,size_var,loop_var):
 
         else:
             button_object.label.set_text("Pausar")
+            simulador.continuar()
             
             if anim is not None:
                 anim.event_source.start()
@@ -559,53 +565,37 @@ def GUI_Aleatoria(n_mekos,size_var,loop_var):
                 monitor_window.close_all_windows()
                 monitor_window = None
                 
-    def update_frame(i):
-        """Executa um passo de simulação."""
-        global is_paused
-        
-        if is_paused:
-            return
+    def init_frame():
+        """Desenha o terreno e o estado inicial."""
+        return renderizador.iniciar()
 
-        ambiente.tick(i)
-        ambiente.renderizar(ax_sim)
-        
-        return ax_sim
+    def update_frame(retrato):
+        """Desenha o retrato mais recente da simulação, que roda em segundo plano."""
+        return renderizador.desenhar(retrato)
 
     # --- Ambiente ---
     
-    grid = np.zeros((size, size))
-    n_biomas = random.randint(2, 4)
-    scale = random.uniform(5.0, 30.0)
-    random_weights = [random.random() for _ in range(n_biomas)]
-    soma_total = sum(random_weights)
-    biome_weights = [w / soma_total for w in random_weights]
-    seed = random.randint(0, 99999)
+    aleatorio = Aleatorio()
+    ambiente_base = gerar_ambiente_aleatorio(size, aleatorio=aleatorio)
     
-    ambiente_base = biome_gen(grid,size,n_biomas,scale,seed,biome_weights)
-    ambiente_base = fruit_gen(ambiente_base,size)
-    ambiente_base = river_gen(ambiente_base,size)
-    
-    ambiente = Ambiente(size, ambiente_base, sim_logger)
+    ambiente = Ambiente(size, ambiente_base, sim_logger, aleatorio=aleatorio)
 
 #--- Frutas ---
-    for i, linha in enumerate(ambiente.matriz):
-        for j, valor in enumerate(linha):
-            if valor == 4:
-                fruta = Fruta((i, j))
-                settings.fruit_list.append(fruta)
+    popular_frutas(ambiente)
 
     # --- Mekos ---
     n_iteracoes = max(n_mekos.get(),1)
+    gerador = aleatorio.random
     for i in range(n_iteracoes):
         
-        genoma = [random.choice(valores) for _, valores in CARACTERISTICAS]
+        genoma = [gerador.choice(valores) for _, valores in CARACTERISTICAS]
         
         try:
             meko_inst = Meko(
-                gerar_nome(),
+                gerar_nome(gerador),
                 genoma,
                 ambiente,
-                (random.randint(0, ambiente.size-1), random.randint(0, ambiente.size-1))
+                (gerador.randint(0, ambiente.size-1), gerador.randint(0, ambiente.size-1))
             )
             
         except Exception as e:
@@ -613,7 +603,8 @@ def GUI_Aleatoria(n_mekos,size_var,loop_var):
             continue
 
         ambiente.adicionar_meko(meko_inst)
-        mekos_list.append(meko_inst)
+
+    simulador = Simulador(ambiente, loop)
 
     # --- Configuração Simulação e Monitoramento
     fig = plt.figure(figsize=(12, 6))
@@ -625,22 +616,29 @@ def GUI_Aleatoria(n_mekos,size_var,loop_var):
     # --- Adiciona o botão de pause
     ax_button = fig.add_axes([0.8, 0.05, 0.1, 0.075])
     pause_button = Button(ax_button, "Pausar")
-    pause_button.on_clicked(lambda event: toggle_pause_monitor(event, pause_button, mekos_list))
+    pause_button.on_clicked(lambda event: toggle_pause_monitor(event, pause_button, ambiente.mundo.mekos))
 
     # --- Loop da simulação ---
+    # Os ticks rodam em segundo plano; cada quadro desenha o retrato mais recente
+    renderizador = Renderizador(ambiente, ax_sim)
+    simulador.iniciar()
     anim = animation.FuncAnimation(
         fig, 
         update_frame, 
-        frames= loop, 
-        interval=500, 
-        blit=False,
-        repeat=False
+        init_func=init_frame,
+        frames=simulador.quadros(), 
+        interval=1000 / QUADROS_POR_SEGUNDO, 
+        blit=True,
+        repeat=False,
+        cache_frame_data=False
     )
     
     plt.show()
     
+    # Fechar a janela encerra a simulação
+    simulador.parar()
     sim_logger.export_logs()
-    sim_logger.log_geral_final(ambiente, inicio, time.time(),loop,n_mekos.get())
+    sim_logger.log_geral_final(ambiente, inicio, time.time(),simulador.tick,n_mekos.get())
     
     # GERAR E EXIBIR O RELATÓRIO FINAL
     relatorio = sim_logger.gerar_relatorio_final(ambiente)
@@ -0,0 +1,62 @@
+"""
+Geradores aleatórios de uma simulação.
+
+Cada simulação tem o seu próprio `Aleatorio`, guardado no `Mundo` do ambiente: um `numpy.random.Generator` (`rng`),
+usado na geração do terreno, das frutas, dos rios e das carnes, e um `random.Random` (`random`), usado pelos Mekos, pela
+FSM e pelas habilidades. Os dois vêm da mesma `SeedSequence`, então a semente determina toda a trajetória da
+simulação, sem depender do estado global de `random` ou `np.random`.
+
+Para execuções em paralelo, `dividir` cria geradores filhos independentes a partir da mesma semente.
+"""
+import random as _random
+
+import numpy as np
+
+class Aleatorio:
+    """
+    Par de geradores aleatórios (NumPy e `random`) derivados de uma mesma semente.
+
+    Attributes:
+        semente (np.random.SeedSequence): A semente da qual os geradores são derivados.
+        rng (np.random.Generator): Gerador NumPy.
+        random (random.Random): Gerador do módulo `random`, com a mesma interface das funções do módulo.
+
+    Methods:
+        `dividir`: Cria geradores filhos independentes, um para cada execução paralela.
+    """
+    def __init__(self, seed=None):
+        if isinstance(seed, np.random.SeedSequence):
+            self.semente = seed
+        else:
+            self.semente = np.random.SeedSequence(seed)
+
+        semente_np, semente_py = self.semente.spawn(2)
+        self.rng = np.random.default_rng(semente_np)
+        self.random = _random.Random(int.from_bytes(semente_py.generate_state(4).tobytes(), "little"))
+
+    def __repr__(self):
+        return f"Aleatorio(entropia={self.semente.entropy})"
+
+    def dividir(self, n):
+        """
+        Cria `n` geradores independentes entre si e dos geradores deste objeto.
+
+        Returns:
+            list[Aleatorio]: Os geradores filhos.
+        """
+        return [Aleatorio(filha) for filha in self.semente.spawn(n)]
+
+# Geradores usados por objetos criados fora de uma simulação (ex: Mekos do editor da GUI)
+PADRAO = Aleatorio()
+
+def rng_de(aleatorio=None):
+    """
+    Retorna o gerador NumPy de `aleatorio`, ou o gerador padrão se for `None`.
+    """
+    return (aleatorio or PADRAO).rng
+
+def random_de(aleatorio=None):
+    """
+    Retorna o gerador `random.Random` de `aleatorio`, ou o gerador padrão se for `None`.
+    """
+    return (aleatorio or PADRAO).random
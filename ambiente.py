@@ -1,7 +1,19 @@
+from collections import deque
+
 import numpy as np
 
+import settings
+
 from utils import generate_perlin_noise_2d
-from settings import CMAP, meat_list, mekos_list
+from espacial import IndiceEspacial
+from populacao import Populacao
+from mundo import Mundo
+from recursos import Fruta, Frutas
+from sincrono import Resolucao
+from percepcao import Percepcao
+from aleatorio import rng_de
+from eventos import registrar, MORTE, NIVEL_DEBUG
+from habilidades import TERRENO_POR_CAPACIDADE, CAPACIDADES_TERRENO
 from logger import *
 
 class Ambiente:
@@ -10,20 +22,55 @@ class Ambiente:
     
     Attributes:
         size (int): O tamanho do ambiente (size x size).
-        matriz (np.ndarray): A matriz que representa o ambiente.
-        mekos (list): A lista de objetos Meko presentes no ambiente.
+        matriz (np.ndarray): A matriz que representa o ambiente. Ao atribuir uma nova matriz, os custos de movimento
+            são recalculados; depois de modificá-la no lugar, chame `terreno_alterado`.
+        custos_terreno (np.ndarray): O custo de movimento de cada tipo de terreno para cada variante de capacidades
+            (ver `calcular_custos_terreno`), calculado uma vez por terreno.
+        mekos (Colecao): Os Mekos presentes no ambiente, incluindo os que morreram durante o tick atual.
+        mundo (Mundo): As coleções de Mekos vivos, frutas e carnes da simulação.
+        indice (IndiceEspacial): O índice espacial de Mekos, carnes e frutas usado nas buscas. `None` se desativado.
+        populacao (Populacao): O armazenamento em arrays do estado dos Mekos. `None` se desativado.
+        nivel_eventos (int): O nível mínimo dos eventos guardados em `Meko.log` (ver `eventos.py`).
+        periodo_recarga (int): Ticks até uma fruta ganhar mais uma unidade. Com 0, as frutas não recarregam.
+        sincrono (bool): Se os ticks usam o modo síncrono (ver `sincrono.py`). Exige uma `Populacao`, criada se preciso.
+        resolucao (Resolucao): Os efeitos adiados do tick síncrono em andamento, ou `None`.
+        percepcao (Percepcao): As buscas dos Mekos calculadas em lote a cada tick. `None` se desativada.
     
     Methods:
         `adicionar_meko`: Adiciona um objeto Meko à lista de mekos.
+        `adicionar_fruta`: Adiciona uma fruta ao mundo.
+        `adicionar_frutas`: Adiciona de uma vez frutas em várias posições.
+        `adicionar_carne`: Adiciona uma carne ao mundo e ao índice espacial.
+        `remover_carne`: Remove uma carne do mundo e do índice espacial.
+        `aplicar_efeito`: Aplica, ou adia no modo síncrono, um efeito de um Meko sobre outras entidades.
+        `terreno_alterado`: Descarta os custos de movimento depois de uma mudança no terreno.
+        `custos_movimento`: Retorna de uma vez o custo de movimento de vários Mekos.
         `tick`: Atualiza o estado do ambiente e dos mekos.
         `renderizar`: Renderiza o ambiente e os mekos em um gráfico.
     """
-    def __init__(self, size, matriz = None, logger = None, mekos = []):
+    def __init__(self, size, matriz = None, logger = None, mekos = None, indice_espacial = True, populacao = False,
+                 nivel_eventos = NIVEL_DEBUG, mundo = None, periodo_recarga = settings.PERIODO_RECARGA_FRUTA,
+                 aleatorio = None, sincrono = False, percepcao = False):
         # Atributos do Ambiente
         self.size = size
+        self._custos_terreno = None
         self.matriz = matriz
-        self.mekos = mekos
+        self.mundo = mundo if mundo is not None else Mundo(aleatorio)
+        self.mekos = self.mundo.nova_colecao()
+        for meko in mekos or []:
+            self.mekos.adicionar(meko)
         self.logger = logger
+        self.indice = IndiceEspacial(size) if indice_espacial else None
+        if self.indice is not None:
+            # As frutas ficam em arrays e são indexadas em grupo
+            self.indice.adicionar_grupo("Fruta", self.mundo.frutas)
+        self.populacao = Populacao() if populacao or sincrono else None
+        self.nivel_eventos = nivel_eventos
+        self.periodo_recarga = periodo_recarga
+        self.sincrono = sincrono
+        self.resolucao = None
+        self.percepcao = Percepcao(self) if percepcao else None
+        self._renderizador = None
         
         #Variáveis de controle
         self.nascimentos_tick = 0
@@ -32,13 +79,88 @@ class Ambiente:
         self.total_mortes_fome = 0
         self.total_mortes_idade = 0
 
+    @property
+    def matriz(self):
+        return self._matriz
+
+    @matriz.setter
+    def matriz(self, matriz):
+        self._matriz = matriz
+        self._custos_terreno = None
+
+    @property
+    def custos_terreno(self):
+        if self._custos_terreno is None and self._matriz is not None:
+            self._custos_terreno = calcular_custos_terreno(self._matriz)
+        return self._custos_terreno
+
+    def terreno_alterado(self):
+        """
+        Descarta os custos de movimento guardados, para que sejam recalculados na próxima consulta. Necessário apenas
+        depois de modificar `matriz` no lugar; atribuir uma nova matriz já os descarta.
+        """
+        self._custos_terreno = None
+
+    def custos_movimento(self, posicoes, capacidades):
+        """
+        Retorna o custo de movimento de vários Mekos com uma única indexação, com as mesmas regras de
+        `Meko.calcular_custo_movimento`. Assim como ele, ainda não é chamado pela simulação.
+
+        Args:
+            posicoes (np.ndarray): Array `(n, 2)` com as posições dos Mekos.
+            capacidades (np.ndarray): Array `(n,)` com os bits de capacidade dos Mekos (`Meko.capacidades`).
+
+        Returns:
+            np.ndarray: Array `(n,)` com o custo de cada Meko.
+        """
+        posicoes = np.asarray(posicoes, dtype=np.intp).reshape(-1, 2)
+        variantes = np.asarray(capacidades, dtype=np.intp) & CAPACIDADES_TERRENO
+        tipos = np.asarray(self.matriz)[posicoes[:, 0], posicoes[:, 1]].astype(np.intp)
+        return self.custos_terreno[variantes, tipos]
+
     def adicionar_meko(self, meko):
         """
-        Adiciona um objeto Meko à lista de mekos.
+        Adiciona um objeto Meko à lista de mekos do ambiente e aos Mekos vivos do mundo.
         """
         self.nascimentos_tick += 1
     
-        self.mekos.append(meko)
+        self.mekos.adicionar(meko)
+        self.mundo.mekos.adicionar(meko)
+        if self.populacao is not None:
+            self.populacao.adicionar(meko)
+        if self.indice is not None:
+            self.indice.inserir(meko)
+
+    def adicionar_fruta(self, fruta):
+        """
+        Adiciona uma fruta ao mundo. O objeto passa a ser uma visão da sua linha em `mundo.frutas`.
+        """
+        self.mundo.frutas.adicionar(fruta)
+
+    def adicionar_frutas(self, posicoes):
+        """
+        Adiciona de uma vez frutas novas em várias posições, sem criar um objeto `Fruta` por posição.
+
+        Args:
+            posicoes (np.ndarray): Array `(k, 2)` de posições, como o retornado por `posicoes_frutas`.
+        """
+        self.mundo.frutas.adicionar_posicoes(posicoes)
+
+    def adicionar_carne(self, carne):
+        """
+        Adiciona uma carne ao mundo e ao índice espacial do ambiente.
+        """
+        self.mundo.carnes.adicionar(carne)
+        if self.indice is not None:
+            self.indice.inserir(carne)
+
+    def remover_carne(self, carne):
+        """
+        Remove uma carne do mundo e do índice espacial do ambiente.
+        """
+        self.mundo.carnes.remover(carne)
+        if self.indice is not None:
+            self.indice.remover(carne)
         
     def morte_meko(self, meko, causa = "Desconhecida"):
         """
@@ -52,101 +174,188 @@ class Ambiente:
         elif causa == 'Idade':
             self.total_mortes_idade += 1
             
-        if meko in mekos_list:
-            mekos_list.remove(meko)
+        self.mundo.mekos.remover(meko)
+        if self.indice is not None:
+            self.indice.remover(meko)
 
-        log = f"{meko.nome} morreu. Causa: {causa}."
-        meko.log.append(log)
+        registrar(meko, MORTE, meko.nome, causa)
+
+    def aplicar_efeito(self, ator, efeito, exclusivos = ()):
+        """
+        Aplica um efeito de `ator` sobre outras entidades (ex: engajar um alvo, comer, acasalar, nascer um filhote).
+
+        No modo sequencial, o efeito é aplicado na hora. No modo síncrono, é guardado e aplicado na resolução de
+        conflitos do fim do tick (ver `sincrono.Resolucao.adicionar`).
+
+        Args:
+            ator (Meko): O Meko que causa o efeito.
+            efeito (Callable): Função sem argumentos que aplica o efeito.
+            exclusivos (tuple): Chaves de que o efeito precisa com exclusividade dentro de um tick síncrono.
+        """
+        if self.resolucao is None:
+            efeito()
+        else:
+            self.resolucao.adicionar(ator, efeito, exclusivos)
 
     def tick(self,tick):
         """
         Atualiza o estado do ambiente e dos mekos.
         
-        Para cada objeto na lista de mekos no ambiente, verifica se ele está na lista global `mekos_list`.
-        Se não estiver, adiciona-o à lista chamando a função `adicionar_meko`.
-        
-        Em seguida, para cada objeto na lista de mekos, verifica se ele está vivo.
-        Se estiver vivo, chama o método `update` do objeto `Meko`. Caso contrário, remove o objeto da lista local de mekos,
-        cria um objeto `Carne` na posição do meko morto, adiciona-o à lista global de carnes, remove o Meko da lista global de mekos e imprime uma mensagem indicando que o Meko morreu.
+        Para cada objeto na lista de mekos, verifica se ele está vivo.
+        Se estiver vivo, chama o método `update` do objeto `Meko`. Caso contrário, remove o objeto da lista local de mekos
+        e cria um objeto `Carne` na posição do meko morto, adicionando-o às carnes do mundo.
+
+        Depois dos Mekos, as frutas recarregam de uma vez (`Frutas.recarregar`), a cada `periodo_recarga` ticks.
+
+        As remoções do tick deixam lápides nas coleções (ver `mundo.Colecao`), descartadas ao final do tick.
+
+        Se o ambiente tiver uma `Populacao`, a primeira parte é feita por `tick_populacao`, ou por `tick_sincrono` no
+        modo síncrono. Com a percepção em lote, as buscas do tick partem das posições guardadas antes de tudo isso.
         """
-        mekos_remover = []
-        
-        for meko in self.mekos:
-            meko.idade += 1
-            if not meko.esta_vivo():
-                mekos_remover.append(meko)
-            else:   
-                meko.update()
-                self.logger.log_meko_data(tick, meko)
-                meko.log = []
+        if self.percepcao is not None:
+            self.percepcao.iniciar()
+
+        if self.sincrono:
+            mekos_remover = self.tick_sincrono(tick)
+        elif self.populacao is not None:
+            mekos_remover = self.tick_populacao(tick)
+        else:
+            mekos_remover = []
+            
+            for meko in self.mekos:
+                meko.idade += 1
+                if not meko.esta_vivo():
+                    mekos_remover.append(meko)
+                else:   
+                    meko.update()
+                    self.logger.log_meko_data(tick, meko)
+                    meko.log = []
                 
         for meko in mekos_remover:
             
-            meat = Carne(meko.posicao)
-            meat_list.append(meat)
+            self.adicionar_carne(Carne(meko.posicao, self))
             
-            if meko in self.mekos:
-                self.mekos.remove(meko)
+            self.mekos.remover(meko)
+            if self.populacao is not None:
+                self.populacao.remover(meko)
         
+        self.mundo.frutas.recarregar(self.periodo_recarga)
+
         self.total_nascimentos += self.nascimentos_tick
         # if len(self.mekos) <= 0:
         #     self.logger.log_geral_final_.append({
         #     "tick_extincao": tick,
         # })
-        self.logger.log_geral_tick(tick, mekos_list, self.nascimentos_tick)
+        self.logger.log_geral_tick(tick, self.mundo.mekos, self.nascimentos_tick)
         self.nascimentos_tick = 0
 
-    def renderizar(self, ax):
+        # Descarta de uma vez as posições deixadas pelas remoções do tick
+        self.mekos.compactar()
+        self.mundo.compactar()
+
+    def tick_populacao(self, tick):
+        """
+        Atualiza os mekos usando a `Populacao` do ambiente.
+
+        Envelhecimento, fome, gasto de energia, fitness e fertilidade são aplicados a todos os mekos de uma vez.
+        Em seguida, cada meko vivo avança a gestação e executa sua FSM, como em `Meko.update`. Como as mortes e a
+        fertilidade de todos são decididas antes das FSMs, e não Meko a Meko, a simulação difere da sequencial para a
+        mesma semente (ver `Populacao.atualizar`).
+        Mekos nascidos durante o tick só são atualizados a partir do tick seguinte.
+
+        Returns:
+            list[Meko]: Os mekos mortos que devem ser removidos do ambiente.
+        """
+        vivo, mekos = self._atualizar_populacao()
+        mekos_remover = []
+
+        for meko in mekos:
+            # Mekos derrotados por outros durante este tick também são removidos
+            if not vivo[meko._slot] or meko.saude < 0:
+                mekos_remover.append(meko)
+            else:
+                meko.agir()
+                self.logger.log_meko_data(tick, meko)
+                meko.log = []
+
+        return mekos_remover
+
+    def tick_sincrono(self, tick):
+        """
+        Versão síncrona de `tick_populacao` (ver `sincrono.py`).
+
+        Depois do envelhecimento vetorizado, a população é congelada: cada meko vivo executa sua FSM lendo o estado
+        dos outros no retrato do início do tick, e os efeitos sobre outras entidades ficam guardados. Ao fim, a
+        `Resolucao` aplica posições, mortes em combate e efeitos, e só então os logs dos mekos são registrados.
+
+        Returns:
+            list[Meko]: Os mekos mortos que devem ser removidos do ambiente.
+        """
+        vivo, mekos = self._atualizar_populacao()
+        mekos_remover = []
+        ativos = []
+
+        self.populacao.congelar()
+        self.resolucao = Resolucao(self)
+        for meko in mekos:
+            # A saúde dos outros mekos vem do retrato do início do tick
+            if not vivo[meko._slot] or meko.saude < 0:
+                mekos_remover.append(meko)
+            else:
+                self.populacao.ator = meko._slot
+                meko.agir()
+                ativos.append(meko)
+
+        mekos_remover.extend(self.resolucao.resolver())
+        self.resolucao = None
+
+        for meko in ativos:
+            self.logger.log_meko_data(tick, meko)
+            meko.log = []
+
+        return mekos_remover
+
+    def _atualizar_populacao(self):
+        """
+        Aplica o envelhecimento vetorizado da `Populacao` e contabiliza as mortes por fome e idade.
+
+        Returns:
+            tuple[np.ndarray, list[Meko]]: A máscara por slot dos mekos vivos e os mekos do início do tick.
+        """
+        vivo, morte_fome, morte_idade = self.populacao.atualizar()
+        mekos = list(self.mekos)
+
+        for meko in mekos:
+            if morte_fome[meko._slot]:
+                self.morte_meko(meko, causa='Fome')
+            elif morte_idade[meko._slot]:
+                self.morte_meko(meko, causa='Idade')
+
+        return vivo, mekos
+
+    def renderizar(self, ax, rotulos = True):
         """
         Renderiza o ambiente e os mekos em um gráfico.
+
+        O terreno é desenhado apenas na primeira chamada para cada eixo; nas seguintes, só os pontos e os nomes dos
+        Mekos são atualizados (ver `renderizacao.Renderizador`). Cada meko é representado por um ponto vermelho se
+        estiver vivo, ou cinza se estiver morto, com seu nome exibido no centro do ponto enquanto houver poucos Mekos.
         
         Args:
             ax (matplotlib.axes.Axes): O eixo do gráfico onde o ambiente será renderizado
+            rotulos (bool): Se os nomes dos Mekos são desenhados.
         
-        Return:  
-            Limpa o eixo fornecido, exibe a matriz do ambiente como uma imagem usando um mapa de cores definido (CMAP),
-            e itera sobre a lista de mekos para desenhá-los na imagem. Cada meko é representado por um ponto vermelho se estiver vivo,
-            ou cinza se estiver morto, com seu nome exibido no centro do ponto.
+        Returns:
+            list[Artist]: Os artistas atualizados, para uso com `FuncAnimation(..., blit=True)`.
         """
-        ax.clear()
-        ax.imshow(self.matriz, cmap=CMAP, interpolation="none")
-
-        for meko in self.mekos:
-            if meko.esta_vivo():
-                i, j = map(int, meko.posicao)
-                ax.scatter(j, i, c="red", s=100, alpha=0.6, marker="o")
-                ax.text(j, i, meko.nome, color="white", ha="center", va="center", weight="bold")
-            else:
-                i, j = map(int, meko.posicao)
-                ax.scatter(j, i, c="gray", s=100, alpha=0.6, marker="o")
-                ax.text(j, i, meko.nome, color="white", ha="center", va="center", weight="bold")
-
-class Fruta:
-    """
-    Classe que representa as frutas. Os objetos são gerados nas áreas de recursos no ambiente.
-
-    Attributes:
-        posicao (tuple[int, int]): A posição da fruta no ambiente.
-        nome (string): O nome da fruta, gerado a partir de sua posição.
-        quantMAX (int): A quantidade máxima de frutas que podem ser geradas.
-        quant (int): A quantidade atual de frutas disponíveis.
-        recarga (int): Índice de contagem do tempo de recarga.
+        # Importado aqui para que a simulação sem interface não precise do matplotlib
+        from renderizacao import Renderizador
 
-    Methods:
-        recarregar: Recarrega a fruta após um tempo de espera.
-    """
-    def __init__(self, posicao):
-        self.posicao = posicao
-        x,y = posicao
-        self.nome = str("fruit" + str(x) + str(y))
-        self.quantMAX = 3
-        self.quant = 1
-        self.recarga = 0
-
-    def recarregar(self):
-        if self.recarga >= 15:
-            self.quant = min(self.quant + 1, self.quantMAX)
-        else: self.recarga += 1
+        renderizador = self._renderizador
+        if renderizador is None or renderizador.ax is not ax:
+            renderizador = self._renderizador = Renderizador(self, ax, rotulos)
+        renderizador.rotulos = rotulos
+        return renderizador.atualizar()
 
 class Carne:
     """
@@ -155,21 +364,51 @@ class Carne:
         posicao (tuple[int, int]): A posição da carne no ambiente.
         nome (string): O nome da carne, gerado a partir de sua posição.
         quant (int): A quantidade atual de carne disponível.
+        ambiente (Ambiente): O ambiente em que a carne está, usado para removê-la do mundo.
         
     Methods:
-        acabar: Remove a carne da lista global se a quantidade chegar a zero.
+        acabar: Remove a carne do mundo se a quantidade chegar a zero.
     """
-    def __init__(self, posicao):
+    def __init__(self, posicao, ambiente = None):
         x, y = posicao
         self.nome = str("meat" + str(x) + str(y))
         self.posicao = posicao
-        self.quant = np.random.randint(1, 4)
+        self.ambiente = ambiente
+        self.quant = int(rng_de(ambiente.mundo.aleatorio if ambiente is not None else None).integers(1, 4))
 
     def acabar(self):
-        if self.quant <= 0:
-            meat_list.remove(self)
+        if self.quant <= 0 and self.ambiente is not None:
+            self.ambiente.remover_carne(self)
+
+def calcular_custos_terreno(matriz):
+    """
+    Calcula o custo de movimento de cada tipo de terreno de uma matriz para cada combinação das capacidades que
+    anulam custos (`PODE_NADAR` no rio, `PODE_ESCALAR` na montanha, `PODE_CAMUFLAR` na floresta), a partir de
+    `CUSTO_TERRENO`. Terrenos fora de `CUSTO_TERRENO` não têm custo.
+
+    A tabela tem uma coluna por tipo de terreno, e não uma por célula, então o tamanho não depende do tamanho do mapa.
+
+    Args:
+        matriz (np.ndarray): A matriz de terrenos.
+
+    Returns:
+        np.ndarray: Array somente leitura `(CAPACIDADES_TERRENO + 1, n_tipos)`, indexado por
+        `[capacidades & CAPACIDADES_TERRENO, matriz[x, y]]`.
+    """
+    n_tipos = max(max(settings.CUSTO_TERRENO), int(np.max(matriz, initial=0))) + 1
+
+    # tabela[variante, tipo de terreno] -> custo
+    tabela = np.zeros((CAPACIDADES_TERRENO + 1, n_tipos), dtype=np.int16)
+    for tipo, custo in settings.CUSTO_TERRENO.items():
+        tabela[:, tipo] = custo
+    variantes = np.arange(CAPACIDADES_TERRENO + 1)
+    for capacidade, tipo in TERRENO_POR_CAPACIDADE.items():
+        tabela[(variantes & capacidade) != 0, tipo] = 0
+
+    tabela.setflags(write=False)
+    return tabela
 
-def biome_gen(grid, size, n_biomas=4, scale=10.0, seed=None, biome_weights=None):
+def biome_gen(grid, size, n_biomas=4, scale=10.0, seed=None, biome_weights=None, octaves=1, persistence=0.5, lacunarity=2.0, rng=None):
     """
     Função para separação de terreno baseada em Perlin Noise.
 
@@ -183,16 +422,22 @@ def biome_gen(grid, size, n_biomas=4, scale=10.0, seed=None, biome_weights=None)
         scale (float): Escala do Perlin Noise.
         seed (int, opcional): Semente para geração aleatória.
         biome_weights (list, opcional): Pesos para cada bioma.
+        octaves (int, opcional): Número de oitavas do ruído fractal. Padrão é 1 (ruído simples).
+        persistence (float, opcional): Fator de amplitude entre oitavas.
+        lacunarity (float, opcional): Fator de frequência entre oitavas.
+        rng (np.random.Generator, opcional): Gerador da simulação. Padrão: `aleatorio.PADRAO`.
 
     Returns:
         new_grid: Matriz resultante com biomas distribuídos.
     """
 
+    rng = rng_de() if rng is None else rng
+
     # Definição da Seed
     if seed is None:
-        seed = np.random.randint(0, 10000)
+        seed = int(rng.integers(0, 10000))
 
-    noise_map = generate_perlin_noise_2d((size, size), scale=scale, seed=seed)
+    noise_map = generate_perlin_noise_2d((size, size), scale=scale, seed=seed, octaves=octaves, persistence=persistence, lacunarity=lacunarity)
    
    # Separação de Biomas
     
@@ -208,52 +453,129 @@ def biome_gen(grid, size, n_biomas=4, scale=10.0, seed=None, biome_weights=None)
         new_grid[mask] = b
 
     # Suavização
-    for _ in range(2):
-        temp_grid = new_grid.copy()
-        for i in range(size):
-            for j in range(size):
-                neighbors = temp_grid[max(0, i-1):min(size, i+2),
-                                      max(0, j-1):min(size, j+2)].flatten()
-                counts = np.bincount(neighbors.astype(int), minlength=n_biomas)
-                current = temp_grid[i, j].astype(int)
-                counts[current] -= 1
-                max_type = np.argmax(counts)
-                if max_type != current and counts[max_type] > 3:
-                    if np.random.rand() < 0.7:
-                        new_grid[i, j] = max_type
+    return suavizar_biomas(new_grid, n_biomas, rng=rng)
+
+def suavizar_biomas(grid, n_biomas, passes=2, limiar=3, chance=0.7, rng=None):
+    """
+    Suavização local dos biomas, calculada para todas as células de uma vez.
+
+    Em cada passagem, conta quantos vizinhos de cada célula (janela 3x3, sem a própria célula) pertencem a cada bioma.
+    Se o bioma mais frequente for diferente do atual e aparecer em mais de `limiar` vizinhos, a célula passa para ele
+    com probabilidade `chance`.
+
+    Os números aleatórios são sorteados de uma só vez, apenas para as células candidatas e na ordem linha a linha,
+    que é a mesma ordem em que a suavização célula a célula os consumia. O resultado para uma mesma semente não muda.
+
+    Args:
+        grid (matriz): Matriz de biomas.
+        n_biomas (int): Número de biomas diferentes.
+        passes (int, opcional): Número de passagens de suavização. Padrão é 2.
+        limiar (int, opcional): Quantidade de vizinhos que o bioma dominante deve superar. Padrão é 3.
+        chance (float, opcional): Probabilidade de a célula mudar de bioma. Padrão é 0.7.
+        rng (np.random.Generator, opcional): Gerador da simulação. Padrão: `aleatorio.PADRAO`.
+
+    Returns:
+        new_grid: Matriz suavizada.
+    """
+    rng = rng_de() if rng is None else rng
+    n_tipos = max(n_biomas, int(grid.max()) + 1) if grid.size else n_biomas
+    tipo = np.int8 if n_tipos <= np.iinfo(np.int8).max else int
+    new_grid = grid.astype(tipo)
+    altura, largura = new_grid.shape
+
+    for _ in range(passes):
+        max_type = np.zeros((altura, largura), dtype=tipo)
+        max_count = np.full((altura, largura), -1, dtype=np.int8)
+
+        for b in range(n_tipos):
+            mascara = np.pad((new_grid == b).astype(np.int8), 1)
+
+            # Soma da janela 3x3 separada em linhas e colunas, menos a própria célula
+            linhas_somadas = mascara[:-2] + mascara[1:-1] + mascara[2:]
+            contagem = linhas_somadas[:, :-2] + linhas_somadas[:, 1:-1] + linhas_somadas[:, 2:]
+            contagem -= mascara[1:-1, 1:-1]
+
+            # Em empates vence o menor bioma, como no np.argmax
+            maior = contagem > max_count
+            np.maximum(max_count, contagem, out=max_count)
+            np.putmask(max_type, maior, b)
+
+        candidatos = (max_type != new_grid) & (max_count > limiar)
+        trocar = candidatos.copy()
+        trocar[candidatos] = rng.random(np.count_nonzero(candidatos)) < chance
+
+        new_grid = np.where(trocar, max_type, new_grid)
     return new_grid.astype(int)
 
-def fruit_gen(grid,size):
+# Probabilidade de uma célula virar área de recursos, por bioma: [deserto, campo, floresta, montanha]
+BIOMA_PROBS = np.array([0, 0.02, 0.03, 0.001])
+
+def fruit_gen(grid,size,rng=None):
 
     """
     Função para distribuição aleatória de recursos.
 
-    Função para distribuição aleatória de recursos, com probabilidade dependente do bioma.
+    Função para distribuição aleatória de recursos, com probabilidade dependente do bioma. Sorteia de uma vez um
+    número para cada célula de bioma conhecido, na mesma ordem (linha a linha) de um sorteio célula a célula.
 
     Args:
         grid (matriz): Recebe a matriz de terrenos.
         size (int): Tamanho da matriz.
+        rng (np.random.Generator, opcional): Gerador da simulação. Padrão: `aleatorio.PADRAO`.
 
     Returns:
         new_grid: Retorna a matriz resultante depois de uma iteração do algoritmo de distribuição.
 
     """
+    new_grid = np.asarray(grid).astype(int)
 
-    # Definição de Probabilidades
-    bioma_probs = [0, 0.02, 0.03, 0.001]
-        #[deserto, campo, floresta, montanha]
-
-    new_grid = grid.copy()
-    for i in range(size):
-        for j in range(size):
-            bioma = new_grid[i, j]
-            if bioma < len(bioma_probs):
-                prob = bioma_probs[bioma]
-                if np.random.rand() < prob:
-                    new_grid[i, j] = 4
-    return new_grid.astype(int)
+    # Apenas células com bioma em BIOMA_PROBS participam do sorteio
+    validas = new_grid < len(BIOMA_PROBS)
+    probs = BIOMA_PROBS[new_grid[validas]]
+    sorteio = (rng_de() if rng is None else rng).random(len(probs)) < probs
+
+    i, j = np.nonzero(validas)
+    new_grid[i[sorteio], j[sorteio]] = 4
+    return new_grid
+
+def posicoes_frutas(matriz):
+    """
+    Retorna as posições das áreas de recursos (4) da matriz, linha a linha.
+
+    Returns:
+        np.ndarray: Array `(k, 2)` com as posições, pronto para `Ambiente.adicionar_frutas`.
+    """
+    return np.argwhere(np.asarray(matriz) == 4)
+
+# Passos laterais de um rio a cada linha e suas probabilidades
+PASSOS_RIO = np.array([-1, 0, 1])
+PROBS_PASSOS_RIO = [0.35, 0.3, 0.35]
 
-def river_gen(grid, size, i = 0, j = None, chance = 0.06):
+def caminho_rio(inicio, n, size, rng):
+    """
+    Calcula as colunas de um rio ao longo de `n` linhas, a partir da coluna `inicio`.
+
+    Os passos laterais são sorteados de uma vez e somados com `cumsum`. Como no algoritmo original
+    (`j = np.clip(j + direcao, 0, size - 1)` a cada linha), a caminhada para nas bordas da grade: um passo que sairia
+    das colunas `0` a `size - 1` é descartado.
+
+    Returns:
+        np.ndarray: As `n + 1` colunas do rio, uma por linha e a coluna da linha seguinte à última.
+    """
+    passos = rng.choice(PASSOS_RIO, size=n, p=PROBS_PASSOS_RIO)
+    colunas = inicio + np.concatenate(([0], np.cumsum(passos)))
+
+    # Cada passo descartado em uma borda desloca todo o resto da caminhada: a soma acumulada é corrigida a partir do
+    # primeiro ponto fora da grade, uma vez por toque na borda
+    k = 0
+    while True:
+        fora = np.flatnonzero((colunas[k:] < 0) | (colunas[k:] > size - 1))
+        if not len(fora):
+            return colunas
+        k += fora[0]
+        colunas[k:] += min(max(colunas[k], 0), size - 1) - colunas[k]
+
+def river_gen(grid, size, i = 0, j = None, chance = 0.06, largura = 2, fontes = 1, rng = None):
     """
     Função para geração de rios.
 
@@ -261,26 +583,52 @@ def river_gen(grid, size, i = 0, j = None, chance = 0.06):
 
     Inicia com uma chance aleatória (0.06 por padrão) de convergir, criando uma bifurcação no rio. Ao convergir, a chance de convergir novamente cai pela metade para ambas as instâncias.
 
+    Os rios pendentes ficam em uma fila, em vez de chamadas recursivas, e o caminho de cada rio é calculado de uma vez
+    por `caminho_rio`. Assim, a memória usada cresce apenas com o tamanho da grade e o número de bifurcações.
+
     Args:
         grid (matriz): Recebe a matriz de terrenos.
         size (int): Tamanho da matriz.
         i (int, optional): Posição inicial na linha vertical. Padrão é 0 (topo).
-        j (int, optional): Posição inicial na linha horizontal. Padrão é None (aleatório).
+        j (int | list[int], optional): Posição inicial na linha horizontal, ou uma por fonte. Padrão é None (aleatório).
         chance (float, optional): Chance inicial de bifurcação. Padrão é 0.06.
+        largura (int, optional): Largura dos rios, em células. Padrão é 2.
+        fontes (int, optional): Quantidade de rios sorteados, se `j` não for informado. Padrão é 1.
+        rng (np.random.Generator, optional): Gerador da simulação. Padrão: `aleatorio.PADRAO`.
 
+    Returns:
+        grid: A matriz de terrenos com os rios (5), modificada no lugar.
     """
-    if (j == None): 
-        j = np.random.randint(0, size)
-
-    while i < size:
-        grid[i, j] = 5 
-        grid[i, j-1] = 5
-        direcao = np.random.choice([-1, 0, 1], p=[0.35, 0.3, 0.35])
-        j = np.clip(j + direcao, 0, size-1)
-        i += 1
-
-        if np.random.rand() < chance and chance > 0:
-            chance = chance * 0.5
-            river_gen(grid, size, i, j, chance)
+    rng = rng_de() if rng is None else rng
+    if j is None:
+        j = rng.integers(0, size, fontes)
+
+    fila = deque((i, int(coluna), chance) for coluna in np.atleast_1d(j))
+    deslocamentos = np.arange(largura) - largura // 2
+
+    while fila:
+        inicio, coluna, chance_rio = fila.popleft()
+        n = size - inicio
+        if n <= 0:
+            continue
+
+        colunas = caminho_rio(coluna, n, size, rng)
+        linhas = np.arange(inicio, size)
+        faixa = np.clip(colunas[:n, None] + deslocamentos, 0, size - 1)
+        grid[linhas[:, None], faixa] = 5
+
+        # Bifurcações: depois de cada uma, a chance do rio atual cai pela metade
+        if chance_rio <= 0:
+            continue
+        sorteios = rng.random(n)
+        t = 0
+        while t < n:
+            candidatas = np.flatnonzero(sorteios[t:] < chance_rio)
+            if not len(candidatas):
+                break
+            t += candidatas[0]
+            chance_rio *= 0.5
+            fila.append((inicio + t + 1, int(colunas[t + 1]), chance_rio))
+            t += 1
 
     return grid
@@ -0,0 +1,78 @@
+"""
+Benchmark da busca de alvos (`Meko.search`) com e sem o índice espacial do ambiente.
+
+Mede ticks por segundo para populações de 100, 1 000 e 10 000 Mekos, mantendo a densidade
+de Mekos por célula constante. A busca linear é quadrática na população, por isso só é
+executada até `--max-linear` Mekos.
+
+Uso:
+    python -m benchmarks.bench_busca
+    python -m benchmarks.bench_busca --populacoes 100 1000 --ticks 20
+"""
+import argparse
+import math
+import time
+
+import numpy as np
+
+import settings
+from aleatorio import Aleatorio
+from ambiente import Ambiente, fruit_gen, river_gen, posicoes_frutas
+from logger import SimulationLogger
+from meko import Meko
+from utils import gerar_nome
+
+DENSIDADE = 0.04  # Mekos por célula (100 Mekos em um grid 50x50)
+
+
+def preparar(n_mekos, indice_espacial, seed=0):
+    """Cria um ambiente aleatório com `n_mekos` Mekos."""
+    aleatorio = Aleatorio(seed)
+    rng, gerador = aleatorio.rng, aleatorio.random
+
+    size = max(50, round(math.sqrt(n_mekos / DENSIDADE)))
+    grid = rng.integers(0, 4, (size, size))
+    grid = fruit_gen(grid, size, rng=rng)
+    grid = river_gen(grid, size, rng=rng)
+
+    ambiente = Ambiente(size, grid, SimulationLogger(filename_prefix="bench_busca"), indice_espacial=indice_espacial,
+                        aleatorio=aleatorio)
+
+    ambiente.adicionar_frutas(posicoes_frutas(grid))
+
+    for _ in range(n_mekos):
+        genoma = [gerador.choice(valores) for _, valores in settings.CARACTERISTICAS]
+        meko = Meko(gerar_nome(gerador), genoma, ambiente, (gerador.randint(0, size - 1), gerador.randint(0, size - 1)))
+        ambiente.adicionar_meko(meko)
+
+    return ambiente
+
+
+def medir(n_mekos, ticks, indice_espacial):
+    ambiente = preparar(n_mekos, indice_espacial)
+    inicio = time.perf_counter()
+    for tick in range(ticks):
+        ambiente.tick(tick)
+    return ticks / (time.perf_counter() - inicio)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--populacoes", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--ticks", type=int, default=10)
+    parser.add_argument("--max-linear", type=int, default=1000,
+                        help="Maior população para a qual a busca linear é medida.")
+    args = parser.parse_args()
+
+    print(f"{'Mekos':>8} {'linear (ticks/s)':>18} {'índice (ticks/s)':>18} {'ganho':>8}")
+    for n in args.populacoes:
+        com_indice = medir(n, args.ticks, True)
+        if n <= args.max_linear:
+            linear = medir(n, args.ticks, False)
+            print(f"{n:>8} {linear:>18.2f} {com_indice:>18.2f} {com_indice / linear:>7.1f}x")
+        else:
+            print(f"{n:>8} {'-':>18} {com_indice:>18.2f} {'-':>8}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,60 @@
+"""
+Benchmark da geração de Perlin Noise (`utils.generate_perlin_noise_2d`).
+
+Compara o laço ponto a ponto com `utils.perlin` (implementação original) com a versão vetorizada,
+para grids de 50 a 4096 células de lado, e confere que os valores são idênticos. O laço original é
+lento, por isso só é executado até `--max-referencia` células de lado.
+
+Uso:
+    python -m benchmarks.bench_perlin
+    python -m benchmarks.bench_perlin --tamanhos 50 100 200 --octaves 4
+"""
+import argparse
+import time
+
+import numpy as np
+
+from utils import generate_perlin_noise_2d, perlin
+
+
+def perlin_referencia(shape, scale, seed):
+    """Laço ponto a ponto, como a implementação original de `generate_perlin_noise_2d`."""
+    np.random.seed(seed)
+    perm = np.arange(256, dtype=int)
+    np.random.shuffle(perm)
+    perm = np.stack([perm, perm]).flatten()
+    noise = np.zeros(shape)
+    for i in range(shape[0]):
+        for j in range(shape[1]):
+            noise[i][j] = perlin(i / scale, j / scale, perm)
+    return noise
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--tamanhos", type=int, nargs="+", default=[50, 128, 256, 512, 1024, 2048, 4096])
+    parser.add_argument("--scale", type=float, default=10.0)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--octaves", type=int, default=1)
+    parser.add_argument("--max-referencia", type=int, default=512,
+                        help="Maior tamanho para o qual o laço original é medido.")
+    args = parser.parse_args()
+
+    print(f"{'tamanho':>8} {'original (s)':>14} {'vetorizado (s)':>16} {'ganho':>8} {'idêntico':>9}")
+    for n in args.tamanhos:
+        inicio = time.perf_counter()
+        noise = generate_perlin_noise_2d((n, n), args.scale, args.seed, octaves=args.octaves)
+        vetorizado = time.perf_counter() - inicio
+
+        if n <= args.max_referencia and args.octaves == 1:
+            inicio = time.perf_counter()
+            referencia = perlin_referencia((n, n), args.scale, args.seed)
+            original = time.perf_counter() - inicio
+            identico = "sim" if np.array_equal(noise, referencia) else "NÃO"
+            print(f"{n:>8} {original:>14.3f} {vetorizado:>16.3f} {original / vetorizado:>7.1f}x {identico:>9}")
+        else:
+            print(f"{n:>8} {'-':>14} {vetorizado:>16.3f} {'-':>8} {'-':>9}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+# Faz o pytest incluir a raiz do repositório no caminho de importação dos testes em `tests/`
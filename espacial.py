@@ -0,0 +1,279 @@
+import numpy as np
+
+class IndiceEspacial:
+    """
+    Índice espacial em grade uniforme, usado para buscas por raio dentro do ambiente.
+
+    O ambiente é dividido em células quadradas de lado `tamanho_celula`. Cada objeto fica guardado na célula que contém
+    a sua posição, separado pelo nome da sua classe (`Meko`, `Carne` ou `Fruta`). Uma busca por raio examina apenas as
+    células que cruzam o campo de visão, em vez de percorrer a lista inteira de objetos.
+
+    Cada objeto recebe um número de ordem no momento da inserção. Como as listas globais também crescem por `append`,
+    esse número reproduz a ordem das listas e serve de critério de desempate entre objetos à mesma distância.
+
+    Grupos de objetos parados guardados em arrays (como as `Frutas`) são registrados com `adicionar_grupo` e não têm
+    um objeto por célula: as suas posições são ordenadas por célula uma única vez (e de novo quando o grupo cresce), e
+    a busca calcula as distâncias de uma faixa de células de uma vez. A ordem de desempate é o slot no grupo.
+
+    Attributes:
+        size (int): O tamanho do ambiente (size x size).
+        tamanho_celula (int): O lado de cada célula da grade.
+        n_celulas (int): A quantidade de células em cada eixo.
+        celulas (dict): Para cada tipo, um dicionário `célula -> {objeto: ordem}`.
+        grupos (dict): Para cada tipo registrado com `adicionar_grupo`, o grupo de objetos em arrays.
+
+    Methods:
+        `inserir`: Adiciona um objeto ao índice.
+        `remover`: Remove um objeto do índice.
+        `mover`: Atualiza a célula de um objeto após mudança de posição.
+        `consultar`: Retorna os objetos de um tipo dentro de um raio.
+        `adicionar_grupo`: Registra um grupo de objetos parados guardados em arrays.
+    """
+    def __init__(self, size, tamanho_celula=8):
+        self.size = size
+        self.tamanho_celula = tamanho_celula
+        self.n_celulas = max(1, -(-size // tamanho_celula))
+        self.celulas = {}
+        self.grupos = {}
+        # tipo -> (n indexado, slots ordenados por célula, início de cada célula em slots)
+        self._ordenacoes = {}
+
+        # objeto -> (tipo, célula, ordem)
+        self._locais = {}
+        self._contador = 0
+
+    def __len__(self):
+        return len(self._locais)
+
+    def __contains__(self, obj):
+        return obj in self._locais
+
+    def _celula(self, posicao):
+        """
+        Calcula a célula de uma posição. Posições fora do ambiente são presas às células da borda,
+        o que mantém a busca correta mesmo para objetos que saíram dos limites.
+        """
+        limite = self.n_celulas - 1
+        ci = min(max(int(posicao[0]) // self.tamanho_celula, 0), limite)
+        cj = min(max(int(posicao[1]) // self.tamanho_celula, 0), limite)
+        return ci, cj
+
+    def inserir(self, obj):
+        if obj in self._locais:
+            return
+
+        tipo = obj.__class__.__name__
+        celula = self._celula(obj.posicao)
+        self._contador += 1
+
+        self.celulas.setdefault(tipo, {}).setdefault(celula, {})[obj] = self._contador
+        self._locais[obj] = (tipo, celula, self._contador)
+
+    def remover(self, obj):
+        local = self._locais.pop(obj, None)
+        if local is None:
+            return
+
+        tipo, celula, _ = local
+        balde = self.celulas[tipo][celula]
+        del balde[obj]
+        if not balde:
+            del self.celulas[tipo][celula]
+
+    def mover(self, obj):
+        local = self._locais.get(obj)
+        if local is None:
+            return
+
+        tipo, celula, ordem = local
+        nova_celula = self._celula(obj.posicao)
+        if nova_celula == celula:
+            return
+
+        grade = self.celulas[tipo]
+        balde = grade[celula]
+        del balde[obj]
+        if not balde:
+            del grade[celula]
+
+        grade.setdefault(nova_celula, {})[obj] = ordem
+        self._locais[obj] = (tipo, nova_celula, ordem)
+
+    def adicionar_grupo(self, tipo, grupo):
+        """
+        Registra um grupo de objetos parados de um tipo, guardados em arrays.
+
+        Args:
+            tipo (str): O nome da classe dos objetos do grupo.
+            grupo: Objeto com `n`, um array `posicao` de forma `(capacidade, 2)` e um método `obter(slot)` que
+                retorna o objeto de um slot (ver `recursos.Frutas`).
+        """
+        self.grupos[tipo] = grupo
+        self._ordenacoes.pop(tipo, None)
+
+    def _ordenacao(self, tipo):
+        """
+        Ordena os slots do grupo por célula, refazendo a ordenação apenas se o grupo cresceu.
+        """
+        grupo = self.grupos[tipo]
+        ordenacao = self._ordenacoes.get(tipo)
+        if ordenacao is not None and ordenacao[0] == grupo.n:
+            return ordenacao
+
+        posicoes = grupo.posicao[:grupo.n]
+        limite = self.n_celulas - 1
+        celulas = np.clip(posicoes // self.tamanho_celula, 0, limite)
+        ids = celulas[:, 0] * self.n_celulas + celulas[:, 1]
+
+        # Ordenação estável: dentro de cada célula, os slots continuam em ordem crescente
+        slots = np.argsort(ids, kind="stable")
+        inicio = np.zeros(self.n_celulas * self.n_celulas + 1, dtype=np.intp)
+        np.cumsum(np.bincount(ids, minlength=self.n_celulas * self.n_celulas), out=inicio[1:])
+
+        ordenacao = (grupo.n, slots, inicio)
+        self._ordenacoes[tipo] = ordenacao
+        return ordenacao
+
+    def _consultar_grupo(self, tipo, x, y, raio):
+        grupo = self.grupos[tipo]
+        if not grupo.n:
+            return []
+
+        _, slots, inicio = self._ordenacao(tipo)
+        ci_min, cj_min = self._celula((x - raio, y - raio))
+        ci_max, cj_max = self._celula((x + raio, y + raio))
+
+        # Em cada linha da grade, as células de cj_min a cj_max são contíguas em `slots`
+        faixas = [
+            slots[inicio[ci * self.n_celulas + cj_min]:inicio[ci * self.n_celulas + cj_max + 1]]
+            for ci in range(ci_min, ci_max + 1)
+        ]
+        candidatos = np.concatenate(faixas)
+        if not len(candidatos):
+            return []
+
+        posicoes = grupo.posicao[candidatos]
+        dx = posicoes[:, 0] - x
+        dy = posicoes[:, 1] - y
+        d2 = dx * dx + dy * dy
+        dentro = d2 <= raio * raio
+
+        return [
+            (d, slot, grupo.obter(slot))
+            for d, slot in zip(d2[dentro].tolist(), candidatos[dentro].tolist())
+        ]
+
+    def consultar(self, tipo, posicao, raio):
+        """
+        Busca os objetos de um tipo a uma distância euclidiana menor ou igual a `raio` de `posicao`.
+
+        Args:
+            tipo (str): O nome da classe dos objetos buscados.
+            posicao (tuple[int, int]): O centro da busca.
+            raio (int): O raio da busca.
+
+        Returns:
+            list[tuple[int, int, obj]]: Tuplas `(distância ao quadrado, ordem de inserção, objeto)`.
+        """
+        x, y = int(posicao[0]), int(posicao[1])
+        if tipo in self.grupos:
+            return self._consultar_grupo(tipo, x, y, raio)
+
+        grade = self.celulas.get(tipo)
+        if not grade:
+            return []
+
+        raio2 = raio * raio
+        ci_min, cj_min = self._celula((x - raio, y - raio))
+        ci_max, cj_max = self._celula((x + raio, y + raio))
+
+        encontrados = []
+        for ci in range(ci_min, ci_max + 1):
+            for cj in range(cj_min, cj_max + 1):
+                balde = grade.get((ci, cj))
+                if not balde:
+                    continue
+                for obj, ordem in balde.items():
+                    ox, oy = obj.posicao
+                    dx = int(ox) - x
+                    dy = int(oy) - y
+                    d2 = dx * dx + dy * dy
+                    if d2 <= raio2:
+                        encontrados.append((d2, ordem, obj))
+        return encontrados
+
+# Quantidade de consultas processadas de uma vez por `mais_proximos_em_lote`, para limitar a memória usada
+CONSULTAS_POR_LOTE = 1024
+
+def mais_proximos_em_lote(consultas, raios, alvos, k=1, proprios=None):
+    """
+    Busca em lote, para cada ponto de `consultas`, os `k` pontos de `alvos` mais próximos a uma distância euclidiana
+    menor ou igual ao raio da consulta, com o mesmo critério de `IndiceEspacial.consultar`.
+
+    Os alvos são ordenados em uma grade de células com o lado do maior raio, então cada consulta examina apenas as 9
+    células em volta da sua, e as distâncias de todos os pares são calculadas de uma vez. Empates são resolvidos pelo
+    índice do alvo, que faz o papel da ordem de inserção das buscas individuais.
+
+    Args:
+        consultas (np.ndarray): Array `(q, 2)` com os centros das buscas.
+        raios (np.ndarray): Array `(q,)` com o raio de cada busca.
+        alvos (np.ndarray): Array `(m, 2)` com as posições dos alvos.
+        k (int): Quantidade de vizinhos por consulta.
+        proprios (np.ndarray, opcional): Array `(q,)` com o índice em `alvos` que cada consulta ignora (ex: o próprio
+            Meko), ou -1.
+
+    Returns:
+        np.ndarray: Array `(q, k)` com os índices dos alvos, do mais próximo ao mais distante, e -1 onde não houver.
+    """
+    consultas = np.asarray(consultas, dtype=np.int64).reshape(-1, 2)
+    alvos = np.asarray(alvos, dtype=np.int64).reshape(-1, 2)
+    q = len(consultas)
+    resultado = np.full((q, k), -1, dtype=np.intp)
+    if not q or not len(alvos):
+        return resultado
+    raios = np.broadcast_to(np.asarray(raios, dtype=np.int64), (q,))
+    proprios = np.full(q, -1, dtype=np.intp) if proprios is None else np.asarray(proprios, dtype=np.intp)
+
+    # Células deslocadas em uma unidade, para que as vizinhas de todas as consultas tenham índices válidos
+    lado = max(1, int(raios.max()))
+    origem = np.minimum(alvos.min(axis=0), consultas.min(axis=0))
+    celulas_alvos = (alvos - origem) // lado + 1
+    celulas_consultas = (consultas - origem) // lado + 1
+    n_linhas, n_colunas = np.maximum(celulas_alvos.max(axis=0), celulas_consultas.max(axis=0)) + 2
+
+    ids = celulas_alvos[:, 0] * n_colunas + celulas_alvos[:, 1]
+    ordem = np.argsort(ids, kind="stable")
+    inicio = np.zeros(n_linhas * n_colunas + 1, dtype=np.intp)
+    np.cumsum(np.bincount(ids, minlength=n_linhas * n_colunas), out=inicio[1:])
+
+    vizinhas = np.array([(di, dj) for di in (-1, 0, 1) for dj in (-1, 0, 1)])
+
+    for a in range(0, q, CONSULTAS_POR_LOTE):
+        b = min(a + CONSULTAS_POR_LOTE, q)
+        celulas = celulas_consultas[a:b, None, :] + vizinhas
+        ids_pares = (celulas[..., 0] * n_colunas + celulas[..., 1]).ravel()
+        consulta_pares = np.repeat(np.arange(a, b), len(vizinhas))
+
+        # Expande cada par (consulta, célula) nos alvos da célula
+        ini = inicio[ids_pares]
+        tamanhos = inicio[ids_pares + 1] - ini
+        total = int(tamanhos.sum())
+        if not total:
+            continue
+        deslocamentos = np.repeat(ini - (np.cumsum(tamanhos) - tamanhos), tamanhos)
+        candidatos = ordem[np.arange(total) + deslocamentos]
+        consulta = np.repeat(consulta_pares, tamanhos)
+
+        d = consultas[consulta] - alvos[candidatos]
+        d2 = d[:, 0] * d[:, 0] + d[:, 1] * d[:, 1]
+        dentro = (d2 <= raios[consulta] ** 2) & (candidatos != proprios[consulta])
+        consulta, candidatos, d2 = consulta[dentro], candidatos[dentro], d2[dentro]
+
+        # Ordena por consulta, distância e índice, e guarda os k primeiros de cada consulta
+        ordenados = np.lexsort((candidatos, d2, consulta))
+        consulta, candidatos = consulta[ordenados], candidatos[ordenados]
+        posto = np.arange(len(consulta)) - np.searchsorted(consulta, consulta)
+        guardar = posto < k
+        resultado[consulta[guardar], posto[guardar]] = candidatos[guardar]
+
+    return resultado
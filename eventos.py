@@ -0,0 +1,135 @@
+"""
+Eventos narrativos dos Mekos (o texto guardado em `Meko.log`).
+
+Cada mensagem tem um tipo de evento (`TipoEvento`) com código, nível e modelo de texto. Em vez de montar a string na hora,
+`registrar` guarda apenas o tipo e os argumentos, e o texto só é formatado quando o log é lido. Eventos abaixo do nível
+configurado no ambiente (`Ambiente.nivel_eventos`) são descartados antes de qualquer alocação, então com
+`NIVEL_DESLIGADO` o loop da simulação não cria nenhuma string de log.
+"""
+
+# Níveis dos eventos
+NIVEL_DEBUG = 10
+NIVEL_INFO = 20
+NIVEL_DESLIGADO = 100
+
+NIVEIS = {
+    "debug": NIVEL_DEBUG,
+    "info": NIVEL_INFO,
+    "desligado": NIVEL_DESLIGADO,
+}
+
+# Nível usado pelos Mekos que não estão em um ambiente
+NIVEL_PADRAO = NIVEL_DEBUG
+
+class TipoEvento:
+    """
+    Um tipo de evento do log dos Mekos.
+
+    Attributes:
+        codigo (str): Identificador curto do evento.
+        nivel (int): O nível do evento (`NIVEL_DEBUG` ou `NIVEL_INFO`).
+        modelo (str): O texto do evento, com um `{}` para cada argumento.
+    """
+    __slots__ = ("codigo", "nivel", "modelo")
+
+    def __init__(self, codigo, nivel, modelo):
+        self.codigo = codigo
+        self.nivel = nivel
+        self.modelo = modelo
+
+    def __repr__(self):
+        return f"TipoEvento({self.codigo!r})"
+
+class Evento:
+    """
+    Um evento registrado no log de um Meko. O texto é formatado apenas quando o evento é convertido para string.
+    """
+    __slots__ = ("tipo", "args")
+
+    def __init__(self, tipo, args):
+        self.tipo = tipo
+        self.args = args
+
+    @property
+    def codigo(self):
+        return self.tipo.codigo
+
+    def __str__(self):
+        return self.tipo.modelo.format(*self.args)
+
+    def __repr__(self):
+        # Mantém a mesma representação de uma lista de strings ao imprimir `meko.log`
+        return repr(str(self))
+
+def nivel_ativo(meko):
+    """
+    Retorna o nível mínimo dos eventos registrados para um Meko, definido pelo seu ambiente.
+    """
+    ambiente = meko.ambiente
+    if ambiente is None:
+        return NIVEL_PADRAO
+    return getattr(ambiente, "nivel_eventos", NIVEL_PADRAO)
+
+def registrar(meko, tipo, *args):
+    """
+    Registra um evento no log de um Meko, se o nível do evento estiver habilitado.
+
+    Args:
+        meko (Meko): O Meko em cujo log o evento é guardado.
+        tipo (TipoEvento): O tipo do evento.
+        *args: Os valores do modelo de texto, na ordem.
+    """
+    if tipo.nivel < nivel_ativo(meko):
+        return
+    meko.log.append(Evento(tipo, args))
+
+# --- Estados (FSM) ---
+
+DEFENDER_ATACADO = TipoEvento("defender_atacado", NIVEL_INFO, "{} foi atacado e vai se defender.")
+DEFENDER_LUTA = TipoEvento("defender_luta", NIVEL_INFO, "{} decide lutar.")
+FUGA = TipoEvento("fuga", NIVEL_INFO, "{} foge para sobreviver!")
+COMBATE = TipoEvento("combate", NIVEL_INFO, "{} está em combate com {}!")
+COMBATE_DERROTA = TipoEvento("combate_derrota", NIVEL_INFO, "{} foi derrotado por {}!")
+COMBATE_PERSEGUE = TipoEvento("combate_persegue", NIVEL_DEBUG, "{} persegue {}!")
+COMBATE_DESISTE = TipoEvento("combate_desiste", NIVEL_DEBUG, "{} decide não perseguir {}.")
+ALVO_COMER = TipoEvento("alvo_comer", NIVEL_DEBUG, "{} chegou ao alvo e agora vai comer.")
+ALVO_COMBATER = TipoEvento("alvo_combater", NIVEL_INFO, "{} chegou ao alvo e agora vai combater.")
+ALVO_MOVE = TipoEvento("alvo_move", NIVEL_DEBUG, "{} se move em direção ao alvo.")
+PAR_ENCONTRADO = TipoEvento("par_encontrado", NIVEL_INFO, "{} encontrou seu par e agora vai tentar acasalar.")
+CACA_PROCURA = TipoEvento("caca_procura", NIVEL_DEBUG, "{} procura uma criatura para caçar.")
+CACA_ENCONTRA = TipoEvento("caca_encontra", NIVEL_INFO, "{} encontrou {} em {} e começa a caçá-lo.")
+CARNE_PROCURA = TipoEvento("carne_procura", NIVEL_DEBUG, "{} procura carne no ambiente.")
+CARNE_ENCONTRA = TipoEvento("carne_encontra", NIVEL_DEBUG, "{} encontrou carne em {} e vai até lá.")
+FRUTA_PROCURA = TipoEvento("fruta_procura", NIVEL_DEBUG, "{} procura frutas no ambiente.")
+FRUTA_ENCONTRA = TipoEvento("fruta_encontra", NIVEL_DEBUG, "{} encontrou fruta em {} e vai até lá.")
+VAGUEIA = TipoEvento("vagueia", NIVEL_DEBUG, "{} vagueia sem rumo.")
+REPRODUCAO_INFERTIL = TipoEvento("reproducao_infertil", NIVEL_DEBUG, "{} não é mais fértil e desistiu de reproduzir.")
+REPRODUCAO_INDISPONIVEL = TipoEvento("reproducao_indisponivel", NIVEL_DEBUG, "{} desistiu, {} não está disponível.")
+REPRODUCAO = TipoEvento("reproducao", NIVEL_INFO, "{} e {} começam a acasalar.")
+PARCEIRO_PROCURA = TipoEvento("parceiro_procura", NIVEL_DEBUG, "{} procura um parceiro para acasalar.")
+PARCEIRO_ENCONTRA = TipoEvento("parceiro_encontra", NIVEL_DEBUG, "{} se interessou por {} e tenta acasalar.")
+PARCEIRO_DESISTE = TipoEvento("parceiro_desiste", NIVEL_DEBUG, "{} desistiu de procurar um parceiro.")
+COME = TipoEvento("come", NIVEL_DEBUG, "{} está se alimentando.")
+CONSUMIDA = TipoEvento("consumida", NIVEL_DEBUG, "{} foi consumida.")
+COME_DESCONHECIDO = TipoEvento("come_desconhecido", NIVEL_DEBUG, "{} não sabe o que fazer com {}.")
+
+# --- Ciclo de vida ---
+
+GESTACAO = TipoEvento("gestacao", NIVEL_INFO, "{} iniciou a gestação. Filhote nascerá em {} ticks.")
+NASCIMENTO = TipoEvento("nascimento", NIVEL_INFO, "Um novo Meko nasceu: {} na posição {}")
+MORTE = TipoEvento("morte", NIVEL_INFO, "{} morreu. Causa: {}.")
+
+# --- Habilidades ---
+
+SEM_ENERGIA = TipoEvento("sem_energia", NIVEL_DEBUG, "{} não tem energia suficiente para usar {}.")
+HABILIDADE = TipoEvento("habilidade", NIVEL_INFO, "{} usa {}.")
+HABILIDADE_ALVO = TipoEvento("habilidade_alvo", NIVEL_INFO, "{} usa {} em {}.")
+HABILIDADE_DANO = TipoEvento("habilidade_dano", NIVEL_INFO, "{} usa {} em {} e causa {} de dano.")
+HABILIDADE_CRITICO = TipoEvento("habilidade_critico", NIVEL_INFO, "A habilidade {} de {} causou um golpe crítico!")
+HABILIDADE_DRENO = TipoEvento("habilidade_dreno", NIVEL_INFO, "{} usa {} em {}, causa {} de dano e recupera {} de saúde.")
+HABILIDADE_CURA = TipoEvento("habilidade_cura", NIVEL_INFO, "{} usa {} e recupera {} de saúde.")
+HABILIDADE_ESQUIVA = TipoEvento("habilidade_esquiva", NIVEL_INFO, "{} usa {} e se move para {}.")
+DEFESA = TipoEvento("defesa", NIVEL_INFO, "{} usa {} e neutraliza o Dano.")
+DEFESA_ANULADA = TipoEvento("defesa_anulada", NIVEL_INFO, "{} teve seu ataque anulado por {} de {}.")
+VENENO = TipoEvento("veneno", NIVEL_INFO, "{} sofre com veneno e toma {}.")
+VENENO_IMUNE = TipoEvento("veneno_imune", NIVEL_INFO, "{} é imune ao veneno.")
@@ -0,0 +1,169 @@
+"""
+Codificação compacta dos genomas e cache dos atributos derivados de cada genoma.
+
+Cada locus do genoma (as categorias de `settings.CARACTERISTICAS`) guarda um alelo, codificado como o índice do valor
+na lista de valores da categoria. Um genoma codificado é uma tupla de inteiros pequenos (`alelos`), que também pode ser
+empacotada em um único inteiro (`codigo`) ou guardada em arrays `uint8` para vários Mekos. A conversão para o formato em
+strings usado nos arquivos `.pkl` é feita sem perdas.
+"""
+from functools import lru_cache
+
+from settings import EFEITOS, CARACTERISTICAS
+
+# --- Codificação ---
+
+# Nomes dos loci e valores possíveis de cada um, na ordem do genoma
+LOCI = [nome for nome, _ in CARACTERISTICAS]
+VALORES = [tuple(valores) for _, valores in CARACTERISTICAS]
+CODIGOS = [{valor: codigo for codigo, valor in enumerate(valores)} for valores in VALORES]
+
+# Índices dos loci
+TIPO, ALIMENTACAO, TAMANHO, OLHOS, PRESAS, PATAS, GARRAS, CAUDA, DEFESA, EXTRA = range(len(LOCI))
+
+# Bits ocupados por cada locus no código empacotado e a posição do primeiro bit
+BITS = [max(1, (len(valores) - 1).bit_length()) for valores in VALORES]
+DESLOCAMENTOS = [sum(BITS[:i]) for i in range(len(BITS))]
+
+def alelo(locus, valor):
+    """
+    Retorna o código do valor `valor` no locus `locus` (ex: `alelo(ALIMENTACAO, "Onivoro")`).
+    """
+    return CODIGOS[locus][valor]
+
+def codificar(genoma):
+    """
+    Codifica um genoma em strings.
+
+    Raises:
+        KeyError: Se algum valor não pertencer ao seu locus.
+
+    Returns:
+        tuple[int]: Os alelos do genoma.
+    """
+    return tuple(codigos[valor] for codigos, valor in zip(CODIGOS, genoma))
+
+def decodificar(alelos):
+    """
+    Converte alelos de volta para o genoma em strings.
+
+    Returns:
+        list[str]: O genoma, no formato usado pelos Mekos.
+    """
+    return [valores[codigo] for valores, codigo in zip(VALORES, alelos)]
+
+def empacotar(alelos):
+    """
+    Empacota os alelos em um único inteiro (22 bits com as características atuais).
+    """
+    codigo = 0
+    for alelo_locus, deslocamento in zip(alelos, DESLOCAMENTOS):
+        codigo |= int(alelo_locus) << deslocamento
+    return codigo
+
+def desempacotar(codigo):
+    """
+    Separa um código empacotado nos alelos de cada locus.
+    """
+    return tuple((codigo >> deslocamento) & ((1 << bits) - 1) for bits, deslocamento in zip(BITS, DESLOCAMENTOS))
+
+def alelos_validos(alelos):
+    """
+    Verifica se alelos formam um genoma válido, com as mesmas regras de `utils.validar_genoma`.
+    """
+    if len(alelos) != len(LOCI):
+        return False
+    if any(not 0 <= codigo < len(valores) for codigo, valores in zip(alelos, VALORES)):
+        return False
+    # Olhos Compostos só são válidos para Insetos
+    if alelos[OLHOS] == alelo(OLHOS, "Compostos") and alelos[TIPO] != alelo(TIPO, "Inseto"):
+        return False
+    # Garras só são válidas para criaturas com patas
+    if alelos[PATAS] == alelo(PATAS, "Apode") and alelos[GARRAS] != alelo(GARRAS, "Nenhuma"):
+        return False
+    return True
+
+def genoma_para_dict(genoma):
+    """
+    Converte um genoma (em strings ou alelos) para o dicionário `locus -> valor` gravado nos arquivos `.pkl`.
+    """
+    if genoma and not isinstance(genoma[0], str):
+        genoma = decodificar(genoma)
+    return dict(zip(LOCI, genoma))
+
+def genoma_de_dict(genoma_dict):
+    """
+    Converte o dicionário `locus -> valor` dos arquivos `.pkl` para o genoma em strings.
+    """
+    return [genoma_dict[locus] for locus in LOCI]
+
+# --- Atributos derivados ---
+
+# Quantidade de genomas distintos guardados no cache de atributos derivados
+TAMANHO_CACHE_GENOMAS = 4096
+
+# Atributos antes dos modificadores do genoma
+ATRIBUTOS_BASE = {
+    "peso": 10,
+    "velocidade": 5,
+    "resistencia": 8,
+    "forca": 8,
+    "visao": 10,
+    "agressividade": 8,
+}
+SAUDE_BASE = 70
+
+def calcular_atributos(genoma):
+    """
+    Calcula os atributos derivados de um genoma já validado, com as mesmas regras de `Meko.gerar_atributos`.
+
+    Args:
+        genoma (tuple[str]): O genoma, como tupla.
+
+    Returns:
+        dict[str, int]: Peso, velocidade, resistência, força, visão, agressividade e saúde máxima.
+    """
+    atributos = dict(ATRIBUTOS_BASE)
+
+    # Os modificadores são aplicados aos atributos
+    for i, efeitos_dict in enumerate(EFEITOS):
+        for atributo, valor in efeitos_dict.get(genoma[i], {}).items():
+            atributos[atributo] += valor
+
+    # Ajustes Finais Baseados em Peso
+    peso = atributos["peso"]
+    atributos["velocidade"] = max(1, min(10, atributos["velocidade"] - ((max(0, peso - 10)) // 15)))
+    atributos["resistencia"] = max(1, atributos["resistencia"] + (peso // 8))
+
+    # A vida é maior quanto maior o Meko
+    mod_vida = 30 if genoma[2] == "Grande" else 0 if genoma[2] == "Medio" else -30
+    atributos["saudeMAX"] = SAUDE_BASE + mod_vida
+
+    # Garantir Limites Mínimos
+    atributos["forca"] = max(1, atributos["forca"])
+    atributos["visao"] = max(3, min(20, atributos["visao"]))
+    atributos["agressividade"] = max(0, min(20, atributos["agressividade"]))
+
+    return atributos
+
+@lru_cache(maxsize=TAMANHO_CACHE_GENOMAS)
+def derivados_do_genoma(codigo):
+    """
+    Atributos derivados, habilidades e capacidades de um genoma, guardados em um cache LRU.
+
+    Mekos com o mesmo genoma recebem o mesmo resultado, então criar um Meko de um genoma já visto custa apenas
+    uma consulta ao cache. O resultado é compartilhado e não deve ser modificado.
+
+    Args:
+        codigo (int): O genoma validado, empacotado por `empacotar`.
+
+    Returns:
+        tuple[tuple[tuple[str, int]], tuple[Habilidade], int]: Os pares `(atributo, valor)`, as habilidades e os
+        bits de capacidade.
+    """
+    # Importado aqui porque `habilidades` usa a codificação deste módulo
+    from habilidades import habilidades_do_genoma
+
+    genoma = tuple(decodificar(desempacotar(codigo)))
+    atributos = tuple(calcular_atributos(genoma).items())
+    habilidades, capacidades = habilidades_do_genoma(genoma)
+    return atributos, habilidades, capacidades
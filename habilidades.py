@@ -1,17 +1,109 @@
-import random
-from settings import TABELA_EFETIVIDADE_TIPO
+import numpy as np
+
+from settings import TABELA_EFETIVIDADE_TIPO, EFETIVIDADE_ELETRICO, TERRENO_FLORESTA, TERRENO_MONTANHA, TERRENO_RIO
+from eventos import *
+from genoma import TIPO, TAMANHO, VALORES, alelo
+
+# Capacidades, guardadas como bits em `Meko.capacidades`
+PODE_NADAR = 1
+PODE_ESCALAR = 2
+PODE_CAMUFLAR = 4
+PODE_DEFENDER = 8
+PODE_ENVENENAR = 16
+
+# Terreno cujo custo de movimento é anulado por cada capacidade
+TERRENO_POR_CAPACIDADE = {PODE_NADAR: TERRENO_RIO, PODE_ESCALAR: TERRENO_MONTANHA, PODE_CAMUFLAR: TERRENO_FLORESTA}
+# Bits que mudam o custo de movimento: `capacidades & CAPACIDADES_TERRENO` escolhe a variante de `Ambiente.custos_terreno`
+CAPACIDADES_TERRENO = PODE_NADAR | PODE_ESCALAR | PODE_CAMUFLAR
+
+# Alelos consultados pelas habilidades
+TIPO_FOGO = alelo(TIPO, "Fogo")
+TIPO_AGUA = alelo(TIPO, "Agua")
+TIPO_TERRA = alelo(TIPO, "Terra")
+TIPO_INSETO = alelo(TIPO, "Inseto")
+TIPO_SOMBRA = alelo(TIPO, "Sombra")
+TAMANHO_MEDIO = alelo(TAMANHO, "Medio")
+TAMANHO_GRANDE = alelo(TAMANHO, "Grande")
+
+## EFETIVIDADE
+
+# Linhas da matriz de ataques: um ataque por tipo (na ordem dos alelos de Tipo) e o ataque elétrico
+TIPOS = VALORES[TIPO]
+ATAQUE_ELETRICO = len(TIPOS)
+
+# MATRIZ_ATAQUES[ataque, tipo do alvo] -> multiplicador de dano, compilada uma vez a partir das tabelas do `settings`
+MATRIZ_ATAQUES = np.array(
+    [[TABELA_EFETIVIDADE_TIPO.get(tipo, {}).get(tipo_def, 1.0) for tipo_def in TIPOS] for tipo in TIPOS]
+    + [[EFETIVIDADE_ELETRICO.get(tipo_def, 1) for tipo_def in TIPOS]],
+    dtype=float
+)
+# Efetividade entre tipos (6x6): MATRIZ_EFETIVIDADE[tipo do ataque, tipo do alvo]
+MATRIZ_EFETIVIDADE = MATRIZ_ATAQUES[:ATAQUE_ELETRICO]
+
+# Cópias em listas para os ataques individuais, que evitam escalares NumPy nos atributos dos Mekos
+EFETIVIDADE = MATRIZ_EFETIVIDADE.tolist()
+EFETIVIDADE_ELETRICA = [EFETIVIDADE_ELETRICO.get(tipo_def, 1) for tipo_def in TIPOS]
+
+def calcular_danos(forca, resistencia, tipo_alvo, dano_base, ataque):
+    """
+    Calcula de uma vez o dano de vários ataques elementais, com as mesmas regras de cada habilidade.
+
+    Todos os argumentos são arrays (ou escalares) com um valor por par de combate.
+
+    Args:
+        forca (np.ndarray): Força de cada atacante.
+        resistencia (np.ndarray): Resistência de cada alvo.
+        tipo_alvo (np.ndarray): Alelo de Tipo de cada alvo.
+        dano_base (np.ndarray): Dano base de cada habilidade.
+        ataque (np.ndarray): Linha de `MATRIZ_ATAQUES` de cada habilidade (`Habilidade.ataque`).
+
+    Returns:
+        np.ndarray: O dano de cada par, antes de efeitos aleatórios como o crítico da Garra Noturna.
+    """
+    dano_base = np.asarray(dano_base, dtype=float)
+    dano = np.maximum(dano_base, dano_base + np.asarray(forca) - np.asarray(resistencia))
+    return dano * MATRIZ_ATAQUES[ataque, tipo_alvo]
+
+def danos_dos_combates(atacantes, alvos, habilidades):
+    """
+    Calcula o dano de uma lista de combates (atacante, alvo, habilidade elemental) em uma única chamada de `calcular_danos`.
+
+    Raises:
+        ValueError: Se alguma habilidade não for elemental (`ataque` é `None`).
+
+    Returns:
+        np.ndarray: O dano de cada combate, na ordem recebida.
+    """
+    if any(habilidade.ataque is None for habilidade in habilidades):
+        raise ValueError("Apenas habilidades elementais podem ter o dano calculado em lote.")
+
+    n = len(habilidades)
+    return calcular_danos(
+        np.fromiter((meko.forca for meko in atacantes), dtype=float, count=n),
+        np.fromiter((meko.resistencia for meko in alvos), dtype=float, count=n),
+        np.fromiter((meko.alelos[TIPO] for meko in alvos), dtype=np.intp, count=n),
+        np.fromiter((habilidade.dano for habilidade in habilidades), dtype=float, count=n),
+        np.fromiter((habilidade.ataque for habilidade in habilidades), dtype=np.intp, count=n),
+    )
 
 ## CLASSE GERAL
 
 class Habilidade():
+
+    # Bits de capacidade concedidos pela habilidade (ver `Meko.capacidades`)
+    capacidade = 0
+    # Linha de `MATRIZ_ATAQUES` das habilidades elementais
+    ataque = None
     
     def __init__(self, custo_energia, nome):
         self.custo_energia = custo_energia
         self.nome = nome
         
     def calcular_fraqueza(self,tipo,tipo_def):
-        multiplicadores = TABELA_EFETIVIDADE_TIPO.get(tipo, {})
-        return multiplicadores.get(tipo_def, 1.0) 
+        """
+        Multiplicador de dano de um ataque do tipo `tipo` contra um alvo do tipo `tipo_def` (ambos alelos de Tipo).
+        """
+        return EFETIVIDADE[tipo][tipo_def]
         
     def calcular_dano_base(self, atacante, alvo, dano_base):
         """
@@ -21,11 +113,42 @@ class Habilidade():
     
         return max(dano_base, dano_base + atacante.forca - alvo.resistencia)
 
+    def efetividade(self, alvo):
+        """
+        Multiplicador de dano da habilidade elemental contra o Tipo de `alvo`.
+        """
+        return self.calcular_fraqueza(self.ataque, alvo.alelos[TIPO])
+
+    def atacar(self, atacante, alvo, multiplicador=1):
+        """
+        Causa o dano da habilidade elemental em `alvo`.
+
+        No modo síncrono, o ataque é guardado na `Resolucao` do tick, que calcula o dano de todos os ataques do tick em
+        uma única chamada de `danos_dos_combates` e então chama `concluir`. Fora dele, o dano é calculado na hora.
+
+        Args:
+            multiplicador (float): Fator aplicado depois da efetividade (ex: o crítico da Garra Noturna).
+        """
+        resolucao = atacante.ambiente.resolucao if atacante.ambiente is not None else None
+        if resolucao is not None:
+            resolucao.adicionar_ataque(atacante, alvo, self, multiplicador)
+            return
+
+        dano_total = self.calcular_dano_base(atacante,alvo,self.dano) * self.efetividade(alvo)
+        if multiplicador != 1:
+            dano_total *= multiplicador
+        self.concluir(atacante, alvo, dano_total)
+
+    def concluir(self, atacante, alvo, dano_total):
+        """
+        Aplica em `alvo` o dano já calculado de um ataque elemental e registra o evento.
+        """
+        alvo.saude -= dano_total
+        registrar(atacante, HABILIDADE_DANO, atacante.nome, self.nome, alvo.nome, dano_total)
 
     def execute(self, user, alvo):
         if self.custo_energia > user.energia:
-            log = f"{user.nome} não tem energia suficiente para usar {self.nome}."
-            user.log.append(log)
+            registrar(user, SEM_ENERGIA, user.nome, self.nome)
             return False
         user.energia -= self.custo_energia
         return True
@@ -38,6 +161,8 @@ class HabilidadeLancarBrasas(Habilidade):
     """
     Causa dano elemental de Fogo
     """
+    ataque = TIPO_FOGO
+
     def __init__(self):
         super().__init__(custo_energia=5,nome="Lançar Brasas")
         self.dano = 5
@@ -46,16 +171,14 @@ class HabilidadeLancarBrasas(Habilidade):
         if not super().execute(atacante, alvo):
             return
 
-        dano_total = self.calcular_dano_base(atacante,alvo,self.dano) * self.calcular_fraqueza("Fogo",alvo.genoma[0])
-        alvo.saude -= dano_total
-        
-        log = f"{atacante.nome} usa Lançar Brasas em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        self.atacar(atacante, alvo)
 
 class HabilidadeJatoDagua(Habilidade):
     """
     Causa dano elemental de Agua
     """
+    ataque = TIPO_AGUA
+
     def __init__(self):
         super().__init__(custo_energia=5,nome="Jato D'agua")
         self.dano = 5
@@ -63,36 +186,30 @@ class HabilidadeJatoDagua(Habilidade):
         if not super().execute(atacante, alvo):
             return
 
-        dano_total = self.calcular_dano_base(atacante,alvo,self.dano) * self.calcular_fraqueza("Agua",alvo.genoma[0])
-        alvo.saude -= dano_total
-
-        # Resposta
-        log = f"{atacante.nome} usa Jato d'Água em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        self.atacar(atacante, alvo)
 
 class HabilidadeEnterrar(Habilidade):
     """
     Causa dano elemental de Terra
     """
+    ataque = TIPO_TERRA
+
     def __init__(self):
         super().__init__(custo_energia=5,nome="Enterrar")
         self.dano = 5
 
     def execute(self, atacante, alvo):
-        if not super().execute(atacante, alvo):   
+        if not super().execute(atacante, alvo):
             return
 
-        dano_total = self.calcular_dano_base(atacante,alvo,self.dano) * self.calcular_fraqueza("Terra",alvo.genoma[0])
-        alvo.saude -= dano_total
-
-        # Resposta
-        log = f"{atacante.nome} usa Enterrar em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        self.atacar(atacante, alvo)
 
 class HabilidadeSanguessuga(Habilidade):
     """
     Causa dano de inseto e se cura pela metade do dano.
     """
+    ataque = TIPO_INSETO
+
     def __init__(self):
         super().__init__(custo_energia=5,nome="Sanguessuga")
         self.dano = 5
@@ -101,7 +218,9 @@ class HabilidadeSanguessuga(Habilidade):
         if not super().execute(atacante, alvo):
             return
 
-        dano_total = self.calcular_dano_base(atacante,alvo,self.dano) * self.calcular_fraqueza("Inseto",alvo.genoma[0])
+        self.atacar(atacante, alvo)
+
+    def concluir(self, atacante, alvo, dano_total):
         cura = round(dano_total / 2)
 
         # Efeito
@@ -109,13 +228,14 @@ class HabilidadeSanguessuga(Habilidade):
         atacante.saude -= cura
 
         # Resposta
-        log = f"{atacante.nome} usa Sanguessuga em {alvo.nome}, causa {dano_total} de dano e recupera {cura} de saúde."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE_DRENO, atacante.nome, self.nome, alvo.nome, dano_total, cura)
 
 class HabilidadeGarraNoturna(Habilidade):
     """
     Causa dano elemental de Sombras, possui 20% de chance de acerto crítico (Dano dobrado)
     """
+    ataque = TIPO_SOMBRA
+
     def __init__(self):
         super().__init__(custo_energia=5,nome="Garra Noturna")
         self.dano = 5
@@ -124,18 +244,12 @@ class HabilidadeGarraNoturna(Habilidade):
         if not super().execute(atacante, alvo):
             return
 
-        dano_total = self.calcular_dano_base(atacante,alvo,self.dano) * self.calcular_fraqueza("Sombra",alvo.genoma[0])
-
         # Efeito
-        if random.random() > 0.2:
-            dano_total *= 2
-            log = f"A habilidade Garra Noturna de {atacante.nome} causou um golpe crítico!"
-            atacante.log.append(log)
-        alvo.saude -= dano_total
-
-        # Resposta
-        log = f"{atacante.nome} usa Garra Noturna em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        multiplicador = 1
+        if atacante.random.random() > 0.2:
+            multiplicador = 2
+            registrar(atacante, HABILIDADE_CRITICO, self.nome, atacante.nome)
+        self.atacar(atacante, alvo, multiplicador)
 
 class HabilidadeCura(Habilidade):
     """
@@ -152,8 +266,7 @@ class HabilidadeCura(Habilidade):
         atacante.saude = max(atacante.saude + 20, atacante.saudeMAX)
 
         # Resposta
-        log = f"{atacante.nome} usa Cura e recupera 20 de saúde."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE_CURA, atacante.nome, self.nome, 20)
 
 ## POR TAMANHO
 
@@ -171,16 +284,15 @@ class HabilidadeEsquivar(Habilidade):
         # Efeito
         i, j = atacante.posicao
         
-        randi = random.choice([-3, 0, 3])
-        randj = random.choice([-3, 0, 3])
+        randi = atacante.random.choice([-3, 0, 3])
+        randj = atacante.random.choice([-3, 0, 3])
         i = i + randi if 0 >= i + randi < atacante.ambiente.size else i + (randi * -1)
         j = j + randj if 0 >= j + randj < atacante.ambiente.size else j + (randj * -1)
 
         atacante.posicao = (i, j)
         
         # Resposta
-        log = f"{atacante.nome} usa Esquivar e se move para {atacante.posicao}."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE_ESQUIVA, atacante.nome, self.nome, atacante.posicao)
 
 class HabilidadeEsmagar(Habilidade):
     """
@@ -196,8 +308,8 @@ class HabilidadeEsmagar(Habilidade):
         
         dano = self.dano
 
-        if atacante.genoma[2] == "Grande": dano += 7
-        elif atacante.genoma[2] == "Medio": dano += 3
+        if atacante.alelos[TAMANHO] == TAMANHO_GRANDE: dano += 7
+        elif atacante.alelos[TAMANHO] == TAMANHO_MEDIO: dano += 3
 
         # Dano
         dano_total = self.calcular_dano_base(atacante,alvo,dano)
@@ -206,8 +318,7 @@ class HabilidadeEsmagar(Habilidade):
         alvo.saude -= dano_total
 
         # Resposta
-        log = f"{atacante.nome} usa Esmagar em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE_DANO, atacante.nome, self.nome, alvo.nome, dano_total)
 
 class HabilidadeMordiscar(Habilidade):
     """
@@ -229,8 +340,7 @@ class HabilidadeMordiscar(Habilidade):
         alvo.saude -= dano_total
 
         # Resposta
-        log = f"{atacante.nome} usa Mordiscar em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE_DANO, atacante.nome, self.nome, alvo.nome, dano_total)
 
 class HabilidadeMordida(Habilidade):
     """
@@ -252,8 +362,7 @@ class HabilidadeMordida(Habilidade):
         alvo.saude -= dano_total
 
         # Resposta
-        log = f"{atacante.nome} usa Mordida em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE_DANO, atacante.nome, self.nome, alvo.nome, dano_total)
 
 class HabilidadeMordidaAprimorada(Habilidade):
     """
@@ -274,8 +383,7 @@ class HabilidadeMordidaAprimorada(Habilidade):
         # Efeito
         alvo.saude -= dano_total
         # Resposta
-        log = f"{atacante.nome} usa Mordida Aprimorada em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE_DANO, atacante.nome, self.nome, alvo.nome, dano_total)
 
 class HabilidadePrender(Habilidade):
     def __init__(self):
@@ -286,10 +394,11 @@ class HabilidadePrender(Habilidade):
             return
         # TODO Implementar Prender
         # Resposta
-        log = f"{atacante.nome} usa Prender em {alvo.nome}."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE_ALVO, atacante.nome, self.nome, alvo.nome)
 
 class HabilidadeEscalar(Habilidade):
+    capacidade = PODE_ESCALAR
+
     def __init__(self):
         super().__init__(custo_energia=5,nome="Escalar")
 
@@ -298,8 +407,7 @@ class HabilidadeEscalar(Habilidade):
             return
         # TODO Implementar Escalar
         # Resposta
-        log = f"{atacante.nome} usa Escalar."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE, atacante.nome, self.nome)
 
 class HabilidadeCorrer(Habilidade):
     def __init__(self):
@@ -310,8 +418,7 @@ class HabilidadeCorrer(Habilidade):
             return
         # TODO Implementar Correr
         # Resposta
-        log = f"{atacante.nome} usa Correr."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE, atacante.nome, self.nome)
 
 class HabilidadeArranhar(Habilidade):
     """
@@ -333,8 +440,7 @@ class HabilidadeArranhar(Habilidade):
         alvo.saude -= dano_total
 
         # Resposta
-        log = f"{atacante.nome} usa Arranhar em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE_DANO, atacante.nome, self.nome, alvo.nome, dano_total)
 
 class HabilidadeRasgar(Habilidade):
     def __init__(self):
@@ -354,8 +460,7 @@ class HabilidadeRasgar(Habilidade):
         alvo.saude -= dano_total
 
         # Resposta
-        log = f"{atacante.nome} usa Rasgar em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE_DANO, atacante.nome, self.nome, alvo.nome, dano_total)
 
 class HabilidadeMartelar(Habilidade):
     def __init__(self):
@@ -376,8 +481,7 @@ class HabilidadeMartelar(Habilidade):
         #TODO Efeito Confusão
 
         # Resposta
-        log = f"{atacante.nome} usa Martelar em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE_DANO, atacante.nome, self.nome, alvo.nome, dano_total)
 
 class HabilidadeRetaliar(Habilidade):
     def __init__(self):
@@ -395,10 +499,11 @@ class HabilidadeRetaliar(Habilidade):
         alvo.saude -= dano_total
 
         # Resposta
-        log = f"{atacante.nome} usa Retaliar em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE_DANO, atacante.nome, self.nome, alvo.nome, dano_total)
 
 class HabilidadeNadar(Habilidade):
+    capacidade = PODE_NADAR
+
     def __init__(self):
         super().__init__(custo_energia=5,nome="Nadar")
 
@@ -407,10 +512,11 @@ class HabilidadeNadar(Habilidade):
             return
         # TODO Implementar Nadar
         # Resposta
-        log = f"{atacante.nome} usa Nadar."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE, atacante.nome, self.nome)
 
 class HabilidadeDefender(Habilidade):
+    capacidade = PODE_DEFENDER
+
     def __init__(self):
         super().__init__(custo_energia=0,nome="Defender")
 
@@ -418,13 +524,13 @@ class HabilidadeDefender(Habilidade):
         if not super().execute(atacante, alvo):
             return
         
-        log = f"{atacante.nome} usa Defender e neutraliza o Dano."
-        atacante.log.append(log)
+        registrar(atacante, DEFESA, atacante.nome, self.nome)
 
-        log = f"{alvo.nome} teve seu ataque anulado por Defender de {atacante}."
-        alvo.log.append(log)
+        registrar(alvo, DEFESA_ANULADA, alvo.nome, self.nome, atacante.nome)
 
 class HabilidadeCamuflagem(Habilidade):
+    capacidade = PODE_CAMUFLAR
+
     def __init__(self):
         super().__init__(custo_energia=5,nome="Camuflagem")
 
@@ -433,10 +539,11 @@ class HabilidadeCamuflagem(Habilidade):
             return
         # TODO Efeito Camuflagem
         # Resposta
-        log = f"{atacante.nome} usa Camuflagem."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE, atacante.nome, self.nome)
 
 class HabilidadeVeneno(Habilidade):
+    capacidade = PODE_ENVENENAR
+
     def __init__(self):
         super().__init__(custo_energia=0,nome="Veneno")
         self.dano = 3
@@ -445,14 +552,12 @@ class HabilidadeVeneno(Habilidade):
         if not super().execute(atacante, alvo):
             return
         
-        if any(habilidade.nome == "Veneno" for habilidade in alvo.habilidades):
+        if alvo.capacidades & PODE_ENVENENAR:
             alvo.saude -= self.dano
 
-            log = f"{alvo.nome} sofre com veneno e toma {self.dano}."
-            atacante.log.append(log)
+            registrar(atacante, VENENO, alvo.nome, self.dano)
         else:
-            log = f"{alvo.nome} é imune ao veneno."
-            atacante.log.append(log)
+            registrar(atacante, VENENO_IMUNE, alvo.nome)
 
 class HabilidadeIluminar(Habilidade):
     def __init__(self):
@@ -463,10 +568,11 @@ class HabilidadeIluminar(Habilidade):
             return
         # TODO Efeito Cegueira
         # Resposta
-        log = f"{atacante.nome} usa Iluminar."
-        atacante.log.append(log)
+        registrar(atacante, HABILIDADE, atacante.nome, self.nome)
 
 class HabilidadeEletrocutar(Habilidade):
+    ataque = ATAQUE_ELETRICO
+
     def __init__(self):
         super().__init__(custo_energia=5,nome="Eletrocutar")
         self.dano = 5
@@ -474,63 +580,88 @@ class HabilidadeEletrocutar(Habilidade):
     def execute(self, atacante, alvo):
         if not super().execute(atacante, alvo):
             return
-        
-        # Dano
-        dano_total = self.calcular_dano_base(atacante,alvo,self.dano)
-        
-        if alvo.genoma[0] == "Agua": dano_total *= 2
-        elif alvo.genoma[0] == "Terra": dano_total *= 0
-        # Efeito
-        
-        alvo.saude -= dano_total
 
-        # Resposta
-        log = f"{atacante.nome} usa Eletrocutar em {alvo.nome} e causa {dano_total} de dano."
-        atacante.log.append(log)
+        self.atacar(atacante, alvo)
+
+    def efetividade(self, alvo):
+        return EFETIVIDADE_ELETRICA[alvo.alelos[TIPO]]
+
+
+# Registro das habilidades: uma única instância compartilhada por nome
+HABILIDADES = {}
 
+def _unica(classe):
+    instancia = classe()
+    return HABILIDADES.setdefault(instancia.nome, instancia)
 
 HABILIDADES_POR_GENOMA = {
     
     "Tipo": {
-        "Fogo": [HabilidadeLancarBrasas()],
-        "Agua": [HabilidadeJatoDagua()],
-        "Terra": [HabilidadeEnterrar()], 
-        "Inseto": [HabilidadeSanguessuga()],
-        "Sombra": [HabilidadeGarraNoturna()], 
-        "Luz": [HabilidadeCura()]
+        "Fogo": [_unica(HabilidadeLancarBrasas)],
+        "Agua": [_unica(HabilidadeJatoDagua)],
+        "Terra": [_unica(HabilidadeEnterrar)], 
+        "Inseto": [_unica(HabilidadeSanguessuga)],
+        "Sombra": [_unica(HabilidadeGarraNoturna)], 
+        "Luz": [_unica(HabilidadeCura)]
     },
     "Tamanho": {
-        "Pequeno": [HabilidadeEsquivar()],
-        "Grande": [HabilidadeEsmagar()]
+        "Pequeno": [_unica(HabilidadeEsquivar)],
+        "Grande": [_unica(HabilidadeEsmagar)]
     },
     "Presas": {
-        "Pequena": [HabilidadeMordiscar()],
-        "Media": [HabilidadeMordida()],
-        "Grande": [HabilidadeMordida(), HabilidadeMordidaAprimorada(), HabilidadePrender()]
+        "Pequena": [_unica(HabilidadeMordiscar)],
+        "Media": [_unica(HabilidadeMordida)],
+        "Grande": [_unica(HabilidadeMordida), _unica(HabilidadeMordidaAprimorada), _unica(HabilidadePrender)]
     },
     "Patas": {
-        "Apode": [HabilidadeEscalar()],
-        "Bipede": [HabilidadeCorrer()],
-        "Quadrupede": [HabilidadeCorrer()],
-        "Multipede": [HabilidadeCorrer()]
+        "Apode": [_unica(HabilidadeEscalar)],
+        "Bipede": [_unica(HabilidadeCorrer)],
+        "Quadrupede": [_unica(HabilidadeCorrer)],
+        "Multipede": [_unica(HabilidadeCorrer)]
     },
     "Garras": {
-        "Curta": [HabilidadeArranhar()],
-        "Longa": [HabilidadeRasgar(), HabilidadePrender()],
-        "Retrateis": [HabilidadeRasgar()]
+        "Curta": [_unica(HabilidadeArranhar)],
+        "Longa": [_unica(HabilidadeRasgar), _unica(HabilidadePrender)],
+        "Retrateis": [_unica(HabilidadeRasgar)]
     },
     "Cauda": {
-        "Equilibrio": [HabilidadePrender()],
-        "Ataque": [HabilidadeMartelar(), HabilidadeRetaliar()],
-        "Aquatica": [HabilidadeNadar()]
+        "Equilibrio": [_unica(HabilidadePrender)],
+        "Ataque": [_unica(HabilidadeMartelar), _unica(HabilidadeRetaliar)],
+        "Aquatica": [_unica(HabilidadeNadar)]
     },
     "Defesa": {
-        "Carapaca": [HabilidadeDefender()], 
+        "Carapaca": [_unica(HabilidadeDefender)], 
     },
     "Extra": {
-        "Camuflagem": [HabilidadeCamuflagem()], 
-        "Veneno": [HabilidadeVeneno()], 
-        "Bioluminescencia": [HabilidadeIluminar()], 
-        "Campo-eletrico": [HabilidadeEletrocutar()]
+        "Camuflagem": [_unica(HabilidadeCamuflagem)], 
+        "Veneno": [_unica(HabilidadeVeneno)], 
+        "Bioluminescencia": [_unica(HabilidadeIluminar)], 
+        "Campo-eletrico": [_unica(HabilidadeEletrocutar)]
     },
-}
\ No newline at end of file
+}
+
+# Ordem das categorias no genoma
+CATEGORIAS_GENOMA = [
+    "Tipo", "Alimentação", "Tamanho", "Olhos", "Presas",
+    "Patas", "Garras", "Cauda", "Defesa", "Extra"
+]
+
+def habilidades_do_genoma(genoma):
+    """
+    Resolve as habilidades de um genoma. Os Mekos usam o resultado guardado em cache por `genoma.derivados_do_genoma`.
+
+    Args:
+        genoma (tuple[str]): O genoma, como tupla.
+
+    Returns:
+        tuple[tuple[Habilidade], int]: As habilidades, na ordem das categorias, e os bits de capacidade.
+    """
+    habilidades = []
+    for categoria, traco_genetico in zip(CATEGORIAS_GENOMA, genoma):
+        habilidades.extend(HABILIDADES_POR_GENOMA.get(categoria, {}).get(traco_genetico, ()))
+
+    capacidades = 0
+    for habilidade in habilidades:
+        capacidades |= habilidade.capacidade
+
+    return tuple(habilidades), capacidades
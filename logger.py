@@ -1,7 +1,12 @@
 import os
 import json
+import weakref
 from datetime import datetime
 
+import numpy as np
+
+from genoma import LOCI, VALORES
+
 class SimulationLogger:
     def __init__(self, filename_prefix="sim_log"):
         self.log_geral = []
@@ -16,10 +21,10 @@ class SimulationLogger:
     def log_geral_final(self, ambiente, inicio, fim, loop=None, n_mekos=None):
         """Registra os dados finais da simulação."""
         total_time = fim - inicio
-        total_ticks = loop if loop is not None else len(self.log_geral)
+        total_ticks = loop if loop is not None else self.resumo_ticks()[0]
         tamanho_grid = ambiente.size
         populacao_inicial = n_mekos
-        populacao_final = self.log_geral[-1]['populacao_total']
+        populacao_final = self.resumo_ticks()[1]
         total_nascimentos = ambiente.total_nascimentos
         total_mortes_combate = ambiente.total_mortes_combate
         total_mortes_fome = ambiente.total_mortes_fome
@@ -51,6 +56,21 @@ class SimulationLogger:
             'nascimentos': nascimentos_tick
         })
 
+    def resumo_ticks(self):
+        """
+        Resume o log geral.
+
+        Returns:
+            tuple[int, int, float]: Quantidade de ticks registrados, população no último tick e fitness médio ao longo da simulação.
+        """
+        total_ticks = len(self.log_geral)
+        if total_ticks == 0:
+            return 0, 0, 0
+        
+        populacao_final = self.log_geral[-1]['populacao_total']
+        media_fitness_total = sum(d['fitness_medio'] for d in self.log_geral) / total_ticks
+        return total_ticks, populacao_final, media_fitness_total
+
     def log_meko_data(self, tick, meko):
         """
         Coleta o estado atual de um Meko específico e o armazena em seu histórico individual.
@@ -58,34 +78,46 @@ class SimulationLogger:
         nome = meko.nome
         
         if nome not in self.log_meko_individual:
-            self.log_meko_individual[nome] = {
-                "Genoma": meko.genoma,
-                "Idade maxima": meko.idade,
-                "Abates": meko.abates,
-                "Atributos": {
-                    "Forca": meko.forca,
-                    "Resistencia": meko.resistencia,
-                    "Velocidade": meko.velocidade,
-                    "Visao": meko.visao,
-                    "Agressividade": meko.agressividade,
-                },
-                "Genetica": {
-                    "Nome Mae": meko.nome_mae,
-                    "Genoma Mae": meko.genoma_mae,
-                    "Nome Pai": meko.nome_pai,
-                    "Genoma Pai": meko.genoma_pai
-                },
-                "Historico": []
+            self.log_meko_individual[nome] = self.dados_meko(meko)
+            self.log_meko_individual[nome]["Historico"] = []
+
+        self.log_meko_individual[nome]["Historico"].append(self.evento_meko(tick, meko))
+
+    def dados_meko(self, meko):
+        """
+        Dados fixos de um Meko, registrados na sua primeira aparição.
+        """
+        return {
+            "Genoma": meko.genoma,
+            "Idade maxima": meko.idade,
+            "Abates": meko.abates,
+            "Atributos": {
+                "Forca": meko.forca,
+                "Resistencia": meko.resistencia,
+                "Velocidade": meko.velocidade,
+                "Visao": meko.visao,
+                "Agressividade": meko.agressividade,
+            },
+            "Genetica": {
+                "Nome Mae": meko.nome_mae,
+                "Genoma Mae": meko.genoma_mae,
+                "Nome Pai": meko.nome_pai,
+                "Genoma Pai": meko.genoma_pai
             }
-        
+        }
+
+    def evento_meko(self, tick, meko):
+        """
+        Registro do estado de um Meko em um tick.
+        """
         estado_fsm = meko.fsm.current_state.name
 
         evento_log = f"HP: {meko.saude}/{meko.saudeMAX}, E: {meko.energia}/{meko.energiaMAX}, Fit: {meko.fitness:.2f}\n {estado_fsm} em ({int(meko.posicao[0])}, {int(meko.posicao[1])})\n {meko.log}"
 
-        self.log_meko_individual[nome]["Historico"].append({
+        return {
             "tick": int(tick),
             "log": evento_log
-        })
+        }
    
     def gerar_relatorio_final(self, ambiente):
         """
@@ -98,16 +130,11 @@ class SimulationLogger:
             str: O relatório formatado.
         """
         
-        total_ticks = len(self.log_geral)
-        
         # 1. Dados Macroscópicos (do Log Geral)
-        if not self.log_geral:
-            return "Simulação não completou nenhuma iteração para gerar relatório."
-
-        populacao_final = self.log_geral[-1]['populacao_total']
+        total_ticks, populacao_final, media_fitness_total = self.resumo_ticks()
         
-        # Calcula o Fitness Médio Total ao longo da simulação
-        media_fitness_total = sum(d['fitness_medio'] for d in self.log_geral) / total_ticks
+        if total_ticks == 0:
+            return "Simulação não completou nenhuma iteração para gerar relatório."
         
         # 2. Dados de Mortalidade (do Objeto Ambiente)
         mortes_combate = ambiente.total_mortes_combate
@@ -139,17 +166,239 @@ class SimulationLogger:
 
     def export_logs(self):
         """Salva os logs em arquivos JSON (ou CSV, mas JSON é mais fácil com Python)."""
+        self.export_log_geral()
+        self.export_log_individual()
+
+    def export_log_geral(self):
+        """Salva o log geral em JSON."""
         timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
         
-        # Exportar Log Geral
         filename_geral = os.path.join("logs", f"{self.filename_prefix}_geral_{timestamp}.json")
         with open(filename_geral, 'w') as f:
             self.log_geral_final_.append(self.log_geral)
             json.dump(self.log_geral_final_, f, indent=4)
         print(f"\nLOG GERAL salvo em: {filename_geral}")
 
-        # Exportar Log Individual Detalhado
+    def export_log_individual(self):
+        """Salva o log individual detalhado em JSON."""
+        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
+
         filename_individual = os.path.join("logs", f"{self.filename_prefix}_individual_{timestamp}.json")
         with open(filename_individual, 'w') as f:
             json.dump(self.log_meko_individual, f, indent=4)
-        print(f"LOG INDIVIDUAL salvo em: {filename_individual}")
\ No newline at end of file
+        print(f"LOG INDIVIDUAL salvo em: {filename_individual}")
+
+class StreamingSimulationLogger(SimulationLogger):
+    """
+    Variante do `SimulationLogger` que grava os registros em disco conforme a simulação avança.
+
+    Os registros são escritos em arquivos JSON Lines (um objeto JSON por linha) através de um escritor com buffer,
+    esvaziado a cada `intervalo_flush` ticks. Nada é acumulado em memória além de contadores para o relatório final,
+    então o uso de memória não cresce com o número de ticks. Se a simulação for interrompida, o arquivo contém todos os
+    ticks até o último flush e pode ser lido com `ler_jsonl`.
+
+    Arquivos gerados na pasta `logs/`:
+        `<prefixo>_geral_<timestamp>.jsonl`: um registro `"tick"` por tick e um registro `"final"` ao término.
+        `<prefixo>_individual_<timestamp>.jsonl`: um registro `"meko"` na primeira aparição de cada Meko e um registro `"historico"` por Meko por tick.
+    """
+    def __init__(self, filename_prefix="sim_log", intervalo_flush=50, buffer_bytes=1 << 16):
+        super().__init__(filename_prefix)
+        self.intervalo_flush = max(1, intervalo_flush)
+
+        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
+        self.filename_geral = os.path.join("logs", f"{self.filename_prefix}_geral_{timestamp}.jsonl")
+        self.filename_individual = os.path.join("logs", f"{self.filename_prefix}_individual_{timestamp}.jsonl")
+        self.arquivo_geral = open(self.filename_geral, "w", buffering=buffer_bytes)
+        self.arquivo_individual = open(self.filename_individual, "w", buffering=buffer_bytes)
+
+        # Contadores para o relatório final
+        self.mekos_registrados = set()
+        self.ticks_registrados = 0
+        self.ultima_populacao = 0
+        self.soma_fitness_medio = 0.0
+
+    def _escrever(self, arquivo, registro):
+        arquivo.write(json.dumps(registro, default=_converter_json))
+        arquivo.write("\n")
+
+    def flush(self):
+        """Esvazia os buffers de escrita para o disco."""
+        self.arquivo_geral.flush()
+        self.arquivo_individual.flush()
+
+    def log_geral_final(self, ambiente, inicio, fim, loop=None, n_mekos=None):
+        super().log_geral_final(ambiente, inicio, fim, loop, n_mekos)
+        self._escrever(self.arquivo_geral, {"tipo": "final", **self.log_geral_final_.pop()})
+        self.flush()
+
+    def log_geral_tick(self, tick, mekos_list, nascimentos_tick=0):
+        """Escreve os dados macro do tick no arquivo geral."""
+        super().log_geral_tick(tick, mekos_list, nascimentos_tick)
+        registro = self.log_geral.pop()
+
+        self.ticks_registrados += 1
+        self.ultima_populacao = registro["populacao_total"]
+        self.soma_fitness_medio += registro["fitness_medio"]
+        self._escrever(self.arquivo_geral, {"tipo": "tick", **registro})
+
+        if self.ticks_registrados % self.intervalo_flush == 0:
+            self.flush()
+
+    def resumo_ticks(self):
+        if self.ticks_registrados == 0:
+            return 0, 0, 0
+        return self.ticks_registrados, self.ultima_populacao, self.soma_fitness_medio / self.ticks_registrados
+
+    def log_meko_data(self, tick, meko):
+        """Escreve o estado atual de um Meko no arquivo individual."""
+        if meko.nome not in self.mekos_registrados:
+            self.mekos_registrados.add(meko.nome)
+            self._escrever(self.arquivo_individual, {"tipo": "meko", "nome": meko.nome, **self.dados_meko(meko)})
+
+        self._escrever(self.arquivo_individual, {"tipo": "historico", "nome": meko.nome, **self.evento_meko(tick, meko)})
+
+    def export_logs(self):
+        """Esvazia os buffers e fecha os arquivos."""
+        if self.arquivo_geral.closed:
+            return
+        self.flush()
+        self.arquivo_geral.close()
+        self.arquivo_individual.close()
+        print(f"\nLOG GERAL salvo em: {self.filename_geral}")
+        print(f"LOG INDIVIDUAL salvo em: {self.filename_individual}")
+
+
+class TelemetriaSimulationLogger(SimulationLogger):
+    """
+    Variante do `SimulationLogger` que registra o estado dos Mekos em colunas tipadas, em vez de textos formatados.
+
+    A cada chamada de `log_meko_data`, uma linha é escrita em buffers NumPy pré-alocados (que dobram de tamanho quando
+    enchem), com uma coluna por campo:
+        `tick` (int32), `meko` (int32, índice na tabela de Mekos), `saude`, `energia`, `fitness` (float32),
+        `estado` (uint8, índice na tabela de estados), `x`, `y` (int32), `n_eventos` (int16, tamanho de `meko.log`).
+
+    As tabelas de Mekos (nome, genoma, pais) e de nomes de estados são exportadas junto com as colunas em um arquivo
+    `.npz`, que pode ser lido com `np.load`. Os genomas são gravados codificados (`mekos_genoma`, `uint8`, um alelo por
+    locus); `genoma_valores[locus, alelo]` devolve o valor em texto. Com `verbose=False` (padrão), nenhum texto é
+    formatado por Meko por tick e o log individual em JSON não é gerado; com `verbose=True`, o log textual do
+    `SimulationLogger` também é mantido.
+    """
+    COLUNAS = {
+        "tick": np.int32,
+        "meko": np.int32,
+        "saude": np.float32,
+        "energia": np.float32,
+        "fitness": np.float32,
+        "estado": np.uint8,
+        "x": np.int32,
+        "y": np.int32,
+        "n_eventos": np.int16,
+    }
+
+    def __init__(self, filename_prefix="sim_log", verbose=False, capacidade=4096):
+        super().__init__(filename_prefix)
+        self.verbose = verbose
+        self.n_linhas = 0
+        self.colunas = {nome: np.empty(capacidade, dtype=tipo) for nome, tipo in self.COLUNAS.items()}
+
+        # Tabelas de referência
+        self.ids_mekos = weakref.WeakKeyDictionary()
+        self.tabela_mekos = []
+        self.codigos_estados = {}
+
+    def _garantir_capacidade(self):
+        capacidade = len(self.colunas["tick"])
+        if self.n_linhas < capacidade:
+            return
+        for nome, coluna in self.colunas.items():
+            nova = np.empty(capacidade * 2, dtype=coluna.dtype)
+            nova[:capacidade] = coluna
+            self.colunas[nome] = nova
+
+    def _id_meko(self, meko):
+        id_meko = self.ids_mekos.get(meko)
+        if id_meko is None:
+            id_meko = len(self.tabela_mekos)
+            self.ids_mekos[meko] = id_meko
+            self.tabela_mekos.append((meko.nome, meko.alelos, meko.nome_mae or "", meko.nome_pai or ""))
+        return id_meko
+
+    def _codigo_estado(self, nome_estado):
+        codigo = self.codigos_estados.get(nome_estado)
+        if codigo is None:
+            codigo = len(self.codigos_estados)
+            self.codigos_estados[nome_estado] = codigo
+        return codigo
+
+    def log_meko_data(self, tick, meko):
+        """Escreve o estado atual de um Meko em uma linha das colunas."""
+        if self.verbose:
+            super().log_meko_data(tick, meko)
+
+        self._garantir_capacidade()
+        linha = self.n_linhas
+        c = self.colunas
+        x, y = meko.posicao
+
+        c["tick"][linha] = tick
+        c["meko"][linha] = self._id_meko(meko)
+        c["saude"][linha] = meko.saude
+        c["energia"][linha] = meko.energia
+        c["fitness"][linha] = meko.fitness
+        c["estado"][linha] = self._codigo_estado(meko.fsm.current_state.name)
+        c["x"][linha] = x
+        c["y"][linha] = y
+        c["n_eventos"][linha] = len(meko.log)
+        self.n_linhas += 1
+
+    def tabelas(self):
+        """
+        Retorna as colunas preenchidas e as tabelas de referência, no formato gravado no `.npz`.
+        """
+        dados = {nome: coluna[:self.n_linhas] for nome, coluna in self.colunas.items()}
+        dados["estados"] = np.array(list(self.codigos_estados), dtype=str)
+        dados["mekos_nome"] = np.array([m[0] for m in self.tabela_mekos], dtype=str)
+        dados["mekos_genoma"] = np.array([m[1] for m in self.tabela_mekos], dtype=np.uint8).reshape(-1, len(LOCI))
+        # Tabela para decodificar os alelos: genoma_valores[locus, alelo]
+        dados["genoma_loci"] = np.array(LOCI, dtype=str)
+        dados["genoma_valores"] = np.array(
+            [list(valores) + [""] * (max(map(len, VALORES)) - len(valores)) for valores in VALORES], dtype=str
+        )
+        dados["mekos_nome_mae"] = np.array([m[2] for m in self.tabela_mekos], dtype=str)
+        dados["mekos_nome_pai"] = np.array([m[3] for m in self.tabela_mekos], dtype=str)
+        return dados
+
+    def export_logs(self):
+        """Salva o log geral em JSON, as colunas em `.npz` e, se `verbose`, o log individual em JSON."""
+        self.export_log_geral()
+        if self.verbose:
+            self.export_log_individual()
+
+        timestamp = self.start_time.strftime("%Y%m%d_%H%M%S")
+        filename_telemetria = os.path.join("logs", f"{self.filename_prefix}_telemetria_{timestamp}.npz")
+        np.savez(filename_telemetria, **self.tabelas())
+        print(f"TELEMETRIA salva em: {filename_telemetria}")
+
+
+def _converter_json(valor):
+    """Converte escalares e arrays do NumPy para tipos aceitos pelo `json`."""
+    if hasattr(valor, "tolist"):
+        return valor.tolist()
+    raise TypeError(f"Objeto do tipo {type(valor).__name__} não é serializável em JSON")
+
+
+def ler_jsonl(caminho):
+    """
+    Lê um log JSON Lines, ignorando uma última linha incompleta (ex: simulação interrompida).
+
+    Returns:
+        list[dict]: Os registros do arquivo.
+    """
+    registros = []
+    with open(caminho) as f:
+        for linha in f:
+            try:
+                registros.append(json.loads(linha))
+            except json.JSONDecodeError:
+                break
+    return registros
@@ -1,10 +1,31 @@
-import random
+from functools import partial
+
 import numpy as np
 
 from utils import gerar_nome, validar_genoma, distancia
-from settings import CUSTO_TERRENO, EFEITOS, GRID_SIZE, PERDA_ENERGIA_POR_TICK, TERRENO_FLORESTA, TERRENO_MONTANHA, TERRENO_RIO, C_ENERGIA, C_SAUDE, C_LONGEVIDADE, PERCENTUAL_GESTAO
+from settings import GRID_SIZE, PERDA_ENERGIA_POR_TICK, C_ENERGIA, C_SAUDE, C_LONGEVIDADE, PERCENTUAL_GESTAO
 from FSM import *
 from habilidades import *
+from eventos import *
+from populacao import CampoPopulacao, FERTILIDADES, CODIGO_FERTILIDADE
+from genoma import derivados_do_genoma, codificar, empacotar
+from aleatorio import random_de
+from percepcao import COLECOES
+
+def nascer(mae, pai, filhote):
+    """
+    Adiciona o filhote ao ambiente da mãe e encerra o par: o pai deixa de ser fértil e de ter a mãe como parceira.
+
+    Returns:
+        bool: Sempre `True` (o nascimento aconteceu).
+    """
+    pai.fertilidade = "Incapaz"
+    if pai.love == mae:
+        pai.love = None
+
+    mae.ambiente.adicionar_meko(filhote)
+    registrar(mae, NASCIMENTO, filhote.nome, filhote.posicao)
+    return True
 
 class Meko:
 
@@ -15,8 +36,11 @@ class Meko:
     Attributes:
         nome (string): O nome é a identificação de cada indivíduo.
         genoma (list[str]): O genoma é  o conjunto de características de cada Meko.
+        alelos (tuple[int]): O genoma codificado, um inteiro por locus (ver `genoma.py`).
+        codigo_genoma (int): Os alelos empacotados em um único inteiro.
         idade (int): A idade máxima de um indivíduo, que corresponde à quantidade de iterações que ele vai permanecer vivo antes de morrer naturalmente.
         posicao (tuple[int, int]): A posição atual do Meko no ambiente.
+        mundo (Mundo): As coleções de Mekos, frutas e carnes da simulação, obtidas pelo ambiente do Meko.
         target (obj): O objeto que o Meko está atualmente buscando ou atacando.
         saude (int): O valor que representa a sobrevivência, diminui ao ser atacado ou quando a energia está baixa (fome). Quando chegar a zero ou menos, o indivíduo morre.
         energia(int): O valor que representa a capacidade de agir, sendo gasta com o tempo, ao se mover, ao usar habilidades em combate ou reprodução.
@@ -27,15 +51,39 @@ class Meko:
         resistencia(int): Representa a quantidade de dano que o indivíduo pode reduzir dos ataques recebidos.
         visao(int): Representa a distância que o indivíduo pode ver outros objetos no ambiente.
         agressividade(int): Representa a pré-disposição do indivíduo a atacar outros indivíduos
+        habilidades (tuple[Habilidade]): As habilidades do indivíduo, compartilhadas com os Mekos de mesmo genoma.
+        capacidades (int): Bits de capacidade das habilidades (`PODE_NADAR`, `PODE_ESCALAR`, `PODE_CAMUFLAR`, `PODE_DEFENDER`, `PODE_ENVENENAR`).
+
+    Quando o ambiente usa uma `Populacao` (ver populacao.py), posição, saúde, energia, idade, fitness, fertilidade e
+    atributos derivados ficam guardados nos arrays da população e o Meko passa a ser uma visão da sua linha.
 
     """
+    _populacao = None
+    _slot = None
+
+    saude = CampoPopulacao()
+    saudeMAX = CampoPopulacao()
+    energia = CampoPopulacao()
+    energiaMAX = CampoPopulacao()
+    idade = CampoPopulacao()
+    idadeMAX = CampoPopulacao()
+    fitness = CampoPopulacao()
+    peso = CampoPopulacao()
+    velocidade = CampoPopulacao()
+    resistencia = CampoPopulacao()
+    forca = CampoPopulacao()
+    visao = CampoPopulacao()
+    agressividade = CampoPopulacao()
+
 # Criação do Meko
     def gerar_atributos(self, genoma):
         """
         Gera os atributos iniciais de uma criatura a partir de seu genoma.
 
         Cada característica do genoma aplica modificadores aos atributos base,
-        alterando valores como peso, velocidade, força e agressividade.
+        alterando valores como peso, velocidade, força e agressividade (ver `genoma.calcular_atributos`).
+        Os resultados e as habilidades são consultados no cache de `genoma.derivados_do_genoma`, compartilhado entre
+        Mekos de mesmo genoma.
 
         Args:
             genoma (list[str]): Lista de 10 características na ordem:
@@ -51,56 +99,21 @@ class Meko:
                 [9] Extra - "Nenhuma", "Camuflagem", "Veneno", "Bioluminescencia", "Campo-eletrico"
 
         Modifica:
-                self.atributos (dict): Dicionário com os atributos finais.
+                Os alelos e o código do genoma, os atributos derivados, `saudeMAX`, `saude`, `habilidades` e `capacidades` do Meko.
         """
 
-        self.peso = 10
-        self.velocidade = 5
-        self.resistencia = 8
-        self.forca = 8
-        self.visao = 10
-        self.agressividade = 8
-
-        # Os modificadores são aplicados aos atributos
-
-        for i, efeitos_dict in enumerate(EFEITOS):
-            efeitos = efeitos_dict.get(genoma[i], {})
-            for atributo, valor in efeitos.items():
-                setattr(self, atributo, getattr(self, atributo) + valor)
-                
-        # Ajustes Finais Baseados em Peso
-        self.velocidade = max(1, min(10,self.velocidade - ((max(0, self.peso - 10)) // 15))) # Reduz 1 de velocidade a cada 15 pontos de peso, Limita velocidade entre 1 e 10
-        self.resistencia = max(1, self.resistencia + (self.peso // 8)) # Aumenta 1 de resistência a cada 8 pontos de peso, garante mínimo 1 resistência
-
-        # A vida é maior quanto maior o Meko
-        mod_vida = 30 if genoma[2] == "Grande" else 0 if genoma[2] == "Medio" else -30
-        self.saudeMAX += mod_vida
-        self.saude = self.saudeMAX
-
-        # Garantir Limites Mínimos
-        self.forca = max(1, self.forca)
-        self.visao = max(3, min(20, self.visao)) # Limita visão entre 3 e 20
-        self.agressividade = max(0, min(20, self.agressividade)) # Limita agressividade entre 0 e 20
-
-    def gerar_habilidades(self, genoma):
-        categorias_genoma = [
-            "Tipo", "Alimentação", "Tamanho", "Olhos", "Presas",
-            "Patas", "Garras", "Cauda", "Defesa", "Extra"
-        ]
+        self.alelos = codificar(genoma)
+        self.codigo_genoma = empacotar(self.alelos)
 
-        habilidades_do_meko = []
-        for i, categoria in enumerate(categorias_genoma):
-            traco_genetico = genoma[i]
-            if categoria in HABILIDADES_POR_GENOMA and \
-               traco_genetico in HABILIDADES_POR_GENOMA[categoria]:
-                habilidades_do_meko.extend(HABILIDADES_POR_GENOMA[categoria][traco_genetico])
-
-        return habilidades_do_meko
+        atributos, self.habilidades, self.capacidades = derivados_do_genoma(self.codigo_genoma)
+        for atributo, valor in atributos:
+            setattr(self, atributo, valor)
+        self.saude = self.saudeMAX
 
     def __init__(self, nome, genoma, ambiente = None, posicao = (0,0),idade = 200, nome_mae=None, nome_pai=None, genoma_mae=None, genoma_pai=None):
         
         # Atributos de criação
-        self.posicao = posicao
+        self._posicao = posicao
         self.genoma = genoma
         self.nome = nome
         self.idadeMAX = idade
@@ -134,17 +147,79 @@ class Meko:
         self.target = None
         self.love = None
 
-        # Gerar Atributos
-        if(validar_genoma(genoma)): self.gerar_atributos(genoma)
-
-        #Gerar Habilidades
-        self.habilidades = self.gerar_habilidades(genoma)
+        # Gerar Atributos e Habilidades
+        if(validar_genoma(genoma, self.random)): self.gerar_atributos(genoma)
         
 # Funções de acompanhamento do Meko
+    @property
+    def posicao(self):
+        populacao = self._populacao
+        if populacao is not None:
+            if populacao.le_retrato(self._slot):
+                return tuple(populacao.congelado["posicao"][self._slot].tolist())
+            return tuple(populacao.posicao[self._slot].tolist())
+        return self._posicao
+
+    @posicao.setter
+    def posicao(self, posicao):
+        """
+        Atualiza a posição do Meko e a sua célula no índice espacial do ambiente.
+
+        Durante um tick síncrono, o índice continua com as posições do início do tick e é atualizado na resolução.
+        """
+        populacao = self._populacao
+        if populacao is not None:
+            populacao.posicao[self._slot] = posicao
+            if populacao.congelado is not None:
+                return
+        else:
+            self._posicao = posicao
+        if self.ambiente is not None and self.ambiente.indice is not None:
+            self.ambiente.indice.mover(self)
+
+    @property
+    def fertilidade(self):
+        populacao = self._populacao
+        if populacao is not None:
+            if populacao.le_retrato(self._slot):
+                return FERTILIDADES[populacao.congelado["fertilidade"].item(self._slot)]
+            return FERTILIDADES[populacao.fertilidade.item(self._slot)]
+        return self._fertilidade
+
+    @fertilidade.setter
+    def fertilidade(self, fertilidade):
+        if self._populacao is not None:
+            self._populacao.fertilidade[self._slot] = CODIGO_FERTILIDADE[fertilidade]
+        else:
+            self._fertilidade = fertilidade
+
+    @property
+    def mundo(self):
+        """
+        O `Mundo` da simulação em que o Meko está, ou `None` se ele não estiver em um ambiente.
+        """
+        if self.ambiente is None:
+            return None
+        return self.ambiente.mundo
+
+    @property
+    def random(self):
+        """
+        O gerador `random.Random` da simulação do Meko (ver `aleatorio.py`), ou o gerador padrão fora de um ambiente.
+        """
+        if self.ambiente is None:
+            return random_de()
+        return self.ambiente.mundo.aleatorio.random
+
     def esta_vivo(self):
         """
         Verifica se o Meko está vivo com base em sua saúde.
+
+        Durante um tick síncrono, os outros Mekos apenas consultam a saúde do retrato, sem aplicar fome nem idade.
         """
+        if self._populacao is not None and self._populacao.le_retrato(self._slot):
+            return self.saude >= 0
+
         if self.saude < 0: return False
         
         if self.energia <= 0:
@@ -182,26 +257,14 @@ class Meko:
         """
         Calcula o gasto extra de movimento devido ao terreno na posição atual.
         Retorna a penalidade de velocidade (int).
+
+        O custo vem de `Ambiente.custos_terreno`, calculado uma vez por terreno com as regras de `CUSTO_TERRENO`: o
+        rio não custa para quem nada, a montanha para quem escala e a floresta para quem se camufla.
+
+        Ainda não é chamado pela simulação: o movimento dos Mekos não cobra o custo do terreno.
         """
-        
         x, y = self.posicao
-        tipo_terreno = self.ambiente.matriz[x, y] 
-        
-        penalidade = CUSTO_TERRENO.get(tipo_terreno, 0)
-
-        if tipo_terreno == TERRENO_RIO:
-            if any(habilidade.nome == "Nadar" for habilidade in self.habilidades):
-                penalidade = 0 
-
-        elif tipo_terreno == TERRENO_MONTANHA:
-            if any(habilidade.nome == "Escalar" for habilidade in self.habilidades):
-                penalidade = 0
-                
-        elif tipo_terreno == TERRENO_FLORESTA:
-            if any(habilidade.nome == "Camuflagem" for habilidade in self.habilidades):
-                penalidade = 0
-                
-        return penalidade
+        return int(self.ambiente.custos_terreno[self.capacidades & CAPACIDADES_TERRENO, int(self.ambiente.matriz[x, y])])
     
     def random_step(self):
         """
@@ -215,9 +278,9 @@ class Meko:
             
         i, j = self.posicao
         
-        distancia_passo = random.randint(0, max(1,self.velocidade))
-        di = random.choice([-1, 0, 1])
-        dj = random.choice([-1, 0, 1])
+        distancia_passo = self.random.randint(0, max(1,self.velocidade))
+        di = self.random.choice([-1, 0, 1])
+        dj = self.random.choice([-1, 0, 1])
 
         new_i = i + di * distancia_passo
         new_j = j + dj * distancia_passo
@@ -229,8 +292,28 @@ class Meko:
             self.posicao = (new_i, new_j)
             self.energia -= distancia_passo * PERDA_ENERGIA_POR_TICK
 
+    def perceber(self, tipo, breed=False):
+        """
+        Busca o objeto do tipo `tipo` (`Meko`, `Carne` ou `Fruta`) mais próximo dentro do campo de visão do Meko.
+
+        Se o ambiente tiver a percepção em lote (`percepcao.Percepcao`), o resultado vem das buscas do tick, calculadas
+        para todos os Mekos de uma vez. Caso contrário, é feita uma busca individual com `search`.
+        """
+        percepcao = self.ambiente.percepcao
+        if percepcao is not None:
+            return percepcao.buscar(self, tipo, breed)
+        return self.search(getattr(self.mundo, COLECOES[tipo]), tipo, breed)
+
     def search(self, objetos, tipo, breed=False):
-        
+        """
+        Busca o objeto do tipo `tipo` mais próximo dentro do campo de visão do Meko.
+
+        Se o ambiente possuir um índice espacial, a busca consulta apenas as células próximas. Caso contrário,
+        percorre toda a lista `objetos`. Em ambos os casos, empates são resolvidos pela ordem da lista.
+        """
+        if self.ambiente is not None and self.ambiente.indice is not None:
+            return self.search_indice(tipo, breed)
+
         candidatos = [
             obj for obj in objetos
             if distancia(self, obj) <= self.visao and obj != self and obj.__class__.__name__ == tipo
@@ -250,6 +333,24 @@ class Meko:
 
         alvo = min(proximos, key=lambda o: distancia(self,o))
         return alvo
+
+    def search_indice(self, tipo, breed=False):
+        """
+        Versão de `search` que usa o índice espacial do ambiente.
+        """
+        melhor = None
+        for d2, ordem, obj in self.ambiente.indice.consultar(tipo, self.posicao, self.visao):
+            if obj is self:
+                continue
+            if breed:
+                if obj.fertilidade != "Fertil" or obj.love is not None:
+                    continue
+            elif obj is self.target:
+                continue
+            if melhor is None or (d2, ordem) < melhor[:2]:
+                melhor = (d2, ordem, obj)
+
+        return melhor[2] if melhor is not None else None
 #Funções de reprodução do Meko
     def iniciar_gestacao(self, genoma_filhote, parceiro):
         """
@@ -260,17 +361,19 @@ class Meko:
         self.genoma_espera = genoma_filhote
         self.fertilidade = "Gestante"
 
-        log = f"{self.nome} iniciou a gestação. Filhote nascerá em {int(self.idadeMAX * PERCENTUAL_GESTAO)} ticks."
-        self.log.append(log)
+        registrar(self, GESTACAO, self.nome, int(self.idadeMAX * PERCENTUAL_GESTAO))
 
     def gerar_filhote(self, genoma_espera):
         """
         Cria o objeto Meko no ambiente, chamado no final da gestação.
+
+        O nascimento, com as mudanças no pai e o evento de nascimento, é um efeito (`nascer`): no modo síncrono, só
+        acontece na resolução do tick, e é descartado se a mãe morrer no mesmo tick.
         """
         genoma = genoma_espera[0]
         nome = genoma_espera[1]
         
-        offset = random.choice([-1, 0, 1])
+        offset = self.random.choice([-1, 0, 1])
         posicao_nascimento = (
             np.clip(self.posicao[0] + offset, 0, self.ambiente.size - 1),
             np.clip(self.posicao[1] + offset, 0, self.ambiente.size - 1)
@@ -280,17 +383,10 @@ class Meko:
 
         
         self.fertilidade = "Incapaz"
-        self.love.fertilidade = "Incapaz"
-        
-        if self.love.love == self:
-            self.love.love = None
-            
+        pai = self.love
         self.love = None
-        
-        self.ambiente.adicionar_meko(filhote)
-        mekos_list.append(filhote) 
-        log = f"Um novo Meko nasceu: {nome} na posição {filhote.posicao}"
-        self.log.append(log)
+
+        self.ambiente.aplicar_efeito(self, partial(nascer, self, pai, filhote))
 # Função de atualização do Meko
     def update(self):
         """
@@ -310,6 +406,14 @@ class Meko:
             if self.fertilidade != "Gestante":
                 self.fertilidade = "Incapaz"
         
+        self.agir()
+
+    def agir(self):
+        """
+        Avança a gestação e executa o estado atual da FSM.
+
+        É a parte de `update` que não é vetorizada pela `Populacao`.
+        """
         ## Gestação
         if self.fertilidade == "Gestante":
             self.gestacao_contador += 1
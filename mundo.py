@@ -0,0 +1,138 @@
+import itertools
+
+from recursos import Frutas
+from aleatorio import Aleatorio
+
+class Colecao:
+    """
+    Coleção de entidades (Mekos, frutas ou carnes) com identificadores estáveis e remoção em O(1).
+
+    Cada entidade recebe, na primeira vez em que é adicionada a uma coleção do mundo, um identificador inteiro
+    (`id_entidade`) que não muda até o fim da simulação. Remover uma entidade apenas marca a sua posição como vazia
+    (lápide); as posições vazias são descartadas de uma vez em `compactar`, chamada pelo ambiente ao fim de cada tick.
+    A iteração pula as lápides e segue sempre a ordem de inserção, como uma lista comum, o que mantém as simulações
+    reprodutíveis. Entidades adicionadas durante uma iteração também são visitadas por ela.
+
+    Methods:
+        `adicionar`: Adiciona uma entidade ao fim da coleção.
+        `remover`: Remove uma entidade, deixando uma lápide no seu lugar.
+        `obter`: Retorna a entidade com um identificador.
+        `compactar`: Descarta as lápides.
+    """
+    def __init__(self, gerar_id=None):
+        self._gerar_id = gerar_id if gerar_id is not None else itertools.count(1).__next__
+        self._itens = []
+        # id_entidade -> posição em _itens
+        self._posicoes = {}
+        self._lapides = 0
+
+    def __len__(self):
+        return len(self._posicoes)
+
+    def __bool__(self):
+        return bool(self._posicoes)
+
+    def __iter__(self):
+        # Lápides são None; as entidades nunca são falsas
+        return filter(None, self._itens)
+
+    def __contains__(self, entidade):
+        id_entidade = getattr(entidade, "id_entidade", None)
+        posicao = self._posicoes.get(id_entidade)
+        return posicao is not None and self._itens[posicao] is entidade
+
+    def __repr__(self):
+        return f"Colecao({list(self)!r})"
+
+    def adicionar(self, entidade):
+        if getattr(entidade, "id_entidade", None) is None:
+            entidade.id_entidade = self._gerar_id()
+        elif entidade in self:
+            return
+
+        self._posicoes[entidade.id_entidade] = len(self._itens)
+        self._itens.append(entidade)
+
+    def remover(self, entidade):
+        """
+        Remove uma entidade da coleção.
+
+        Returns:
+            bool: Se a entidade estava na coleção.
+        """
+        if entidade not in self:
+            return False
+
+        posicao = self._posicoes.pop(entidade.id_entidade)
+        self._itens[posicao] = None
+        self._lapides += 1
+        return True
+
+    def obter(self, id_entidade):
+        """
+        Retorna a entidade com o identificador informado, ou `None` se ela não estiver na coleção.
+        """
+        posicao = self._posicoes.get(id_entidade)
+        if posicao is None:
+            return None
+        return self._itens[posicao]
+
+    def compactar(self):
+        """
+        Descarta as lápides deixadas pelas remoções, mantendo a ordem das entidades.
+        """
+        if not self._lapides:
+            return
+
+        self._itens = [entidade for entidade in self._itens if entidade is not None]
+        self._posicoes = {entidade.id_entidade: posicao for posicao, entidade in enumerate(self._itens)}
+        self._lapides = 0
+
+    def limpar(self):
+        self._itens.clear()
+        self._posicoes.clear()
+        self._lapides = 0
+
+class Mundo:
+    """
+    Contexto de uma simulação: as coleções de Mekos, frutas e carnes que antes ficavam em listas globais do `settings`,
+    e os geradores aleatórios da simulação.
+
+    Cada `Ambiente` tem o seu próprio `Mundo`, e os Mekos e os estados da FSM chegam a ele através de `meko.mundo`.
+    Assim, várias simulações podem rodar no mesmo processo sem compartilhar estado.
+
+    As coleções de Mekos e carnes compartilham o mesmo contador de identificadores, então o `id_entidade` de cada
+    entidade é único dentro da simulação. As frutas ficam em arrays (`recursos.Frutas`) e são identificadas pelo slot.
+
+    Attributes:
+        mekos (Colecao): Os Mekos vivos. Um Meko sai desta coleção assim que morre, antes do fim do tick.
+        frutas (Frutas): As frutas do ambiente, guardadas em arrays.
+        carnes (Colecao): As carnes deixadas pelos Mekos mortos.
+        aleatorio (Aleatorio): Os geradores aleatórios da simulação (ver `aleatorio.py`).
+
+    Methods:
+        `nova_colecao`: Cria uma coleção que usa o contador de identificadores do mundo.
+        `compactar`: Descarta as lápides das coleções de Mekos e carnes.
+        `limpar`: Esvazia todas as coleções do mundo.
+    """
+    def __init__(self, aleatorio=None):
+        self.aleatorio = aleatorio if aleatorio is not None else Aleatorio()
+        self._gerar_id = itertools.count(1).__next__
+        self.mekos = self.nova_colecao()
+        self.frutas = Frutas()
+        self.carnes = self.nova_colecao()
+
+    def nova_colecao(self):
+        return Colecao(self._gerar_id)
+
+    def compactar(self):
+        self.mekos.compactar()
+        self.carnes.compactar()
+
+    def limpar(self):
+        """
+        Esvazia todas as coleções do mundo.
+        """
+        self.mekos.limpar()
+        self.frutas.limpar()
+        self.carnes.limpar()
@@ -0,0 +1,142 @@
+"""
+Fase de percepção em lote dos Mekos.
+
+Com `Ambiente(..., percepcao=True)`, o início de cada tick guarda as posições e a visão de todos os Mekos (`iniciar`).
+Na primeira busca de um tipo durante o tick, o Meko mais próximo, o parceiro fértil, a carne e a fruta mais próximos
+são calculados de uma vez com `espacial.mais_proximos_em_lote`, e as buscas seguintes do mesmo tipo apenas leem o
+resultado. Só entram no lote os Mekos cujo estado da FSM no início do tick busca aquele tipo (`State.percepcoes`).
+
+As buscas partem das posições do início do tick (o Meko percebe antes de se mover). Cada busca guarda os
+`CANDIDATOS_POR_BUSCA` objetos mais próximos, para pular o alvo atual do Meko e os objetos que deixaram o mundo
+durante o tick. Se todos os candidatos guardados forem descartados e ainda puder haver outro objeto no alcance, a
+busca individual (`Meko.search`) é usada.
+
+É um modo opcional e experimental: nas medições feitas até agora, a busca individual com o índice espacial é mais
+rápida, porque a cópia do estado de todos os Mekos a cada tick custa mais do que as buscas que ela substitui.
+"""
+import numpy as np
+
+from espacial import mais_proximos_em_lote
+
+# Objetos mais próximos guardados por busca
+CANDIDATOS_POR_BUSCA = 3
+
+# Coleção do `Mundo` em que cada tipo de objeto é buscado
+COLECOES = {"Meko": "mekos", "Carne": "carnes", "Fruta": "frutas"}
+
+class Percepcao:
+    """
+    Buscas dos Mekos de um ambiente, calculadas em lote uma vez por tick.
+
+    Attributes:
+        ambiente (Ambiente): O ambiente dos Mekos.
+        mekos (list[Meko]): Os Mekos do início do tick, na ordem do ambiente.
+        posicoes (np.ndarray): Array `(n, 2)` com as posições do início do tick.
+        raios (np.ndarray): Array `(n,)` com a visão de cada Meko.
+        consultas (dict[str, np.ndarray]): Para cada tipo, as linhas dos Mekos que buscam aquele tipo neste tick.
+
+    Methods:
+        `iniciar`: Guarda o estado do início do tick e descarta as buscas do tick anterior.
+        `buscar`: Retorna o objeto mais próximo de um tipo para um Meko.
+    """
+    def __init__(self, ambiente):
+        self.ambiente = ambiente
+        self.mekos = []
+        self.posicoes = np.zeros((0, 2), dtype=np.int64)
+        self.raios = np.zeros(0, dtype=np.int64)
+        self.consultas = {}
+        self._linhas = {}
+        # (tipo, breed) -> (objetos candidatos, índices (n, CANDIDATOS_POR_BUSCA) em objetos)
+        self._buscas = {}
+
+    def iniciar(self):
+        """
+        Guarda as posições e a visão dos Mekos do ambiente e descarta as buscas do tick anterior.
+        """
+        self.mekos = list(self.ambiente.mekos)
+        self._linhas = {meko: linha for linha, meko in enumerate(self.mekos)}
+        n = len(self.mekos)
+        self.posicoes = np.array([meko.posicao for meko in self.mekos], dtype=np.int64).reshape(n, 2)
+        self.raios = np.fromiter((meko.visao for meko in self.mekos), dtype=np.int64, count=n)
+
+        consultas = {}
+        for linha, meko in enumerate(self.mekos):
+            for tipo in meko.fsm.current_state.percepcoes:
+                consultas.setdefault(tipo, []).append(linha)
+        self.consultas = {tipo: np.array(linhas, dtype=np.intp) for tipo, linhas in consultas.items()}
+        self._buscas = {}
+
+    def _calcular(self, tipo, breed):
+        """
+        Calcula a busca de um tipo para os Mekos que o buscam neste tick.
+
+        Returns:
+            tuple: Os objetos candidatos, o mapa `linha -> posição no lote` e os índices `(q, CANDIDATOS_POR_BUSCA)`
+            dos objetos mais próximos de cada consulta.
+        """
+        mundo = self.ambiente.mundo
+        consultas = self.consultas.get(tipo, np.zeros(0, dtype=np.intp))
+        proprios = None
+
+        if tipo == "Meko":
+            linhas = [
+                linha for linha, meko in enumerate(self.mekos)
+                if meko in mundo.mekos and (not breed or (meko.fertilidade == "Fertil" and meko.love is None))
+            ]
+            objetos = [self.mekos[linha] for linha in linhas]
+            posicoes = self.posicoes[linhas]
+            # Cada Meko ignora a si mesmo
+            indice_objeto = np.full(len(self.mekos), -1, dtype=np.intp)
+            indice_objeto[linhas] = np.arange(len(linhas))
+            proprios = indice_objeto[consultas]
+        elif tipo == "Fruta":
+            frutas = mundo.frutas
+            objetos = frutas
+            posicoes = frutas.posicao[:frutas.n]
+        else:
+            objetos = list(mundo.carnes)
+            posicoes = np.array([obj.posicao for obj in objetos], dtype=np.int64).reshape(len(objetos), 2)
+
+        indices = mais_proximos_em_lote(self.posicoes[consultas], self.raios[consultas], posicoes,
+                                        CANDIDATOS_POR_BUSCA, proprios)
+        lotes = {linha: i for i, linha in enumerate(consultas.tolist())}
+        return objetos, lotes, indices
+
+    def _valido(self, tipo, obj):
+        mundo = self.ambiente.mundo
+        if tipo == "Meko":
+            return obj in mundo.mekos
+        if tipo == "Carne":
+            return obj in mundo.carnes
+        return True
+
+    def buscar(self, meko, tipo, breed=False):
+        """
+        Retorna o objeto do tipo `tipo` mais próximo de `meko`, com as mesmas regras de `Meko.search`, a partir das
+        posições do início do tick.
+
+        Mekos que não estavam no lote do tipo (ex: nascidos durante o tick) usam a busca individual, assim como os
+        Mekos cujos `CANDIDATOS_POR_BUSCA` candidatos foram todos descartados.
+        """
+        busca = self._buscas.get((tipo, breed))
+        if busca is None:
+            busca = self._buscas[(tipo, breed)] = self._calcular(tipo, breed)
+        objetos, lotes, indices = busca
+
+        linha = self._linhas.get(meko)
+        lote = lotes.get(linha) if linha is not None else None
+        if lote is None:
+            return meko.search(getattr(self.ambiente.mundo, COLECOES[tipo]), tipo, breed)
+
+        for indice in indices[lote].tolist():
+            if indice < 0:
+                # Não há mais objetos no alcance
+                return None
+            obj = objetos.obter(indice) if tipo == "Fruta" else objetos[indice]
+            if not breed and obj is meko.target:
+                continue
+            if self._valido(tipo, obj):
+                return obj
+
+        # Todos os candidatos foram descartados, mas pode haver outro objeto no alcance
+        return meko.search(getattr(self.ambiente.mundo, COLECOES[tipo]), tipo, breed)
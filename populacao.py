@@ -0,0 +1,257 @@
+import numpy as np
+
+from settings import PERDA_ENERGIA_POR_TICK, C_ENERGIA, C_SAUDE, C_LONGEVIDADE
+
+# Códigos de fertilidade usados no array `fertilidade`
+FERTILIDADES = ["Incapaz", "Fertil", "Gestante"]
+CODIGO_FERTILIDADE = {nome: codigo for codigo, nome in enumerate(FERTILIDADES)}
+INCAPAZ, FERTIL, GESTANTE = range(len(FERTILIDADES))
+
+# Atributos guardados em arrays e seus tipos
+CAMPOS = {
+    "saude": float,
+    "saudeMAX": int,
+    "energia": float,
+    "energiaMAX": int,
+    "idade": int,
+    "idadeMAX": int,
+    "fitness": float,
+    "peso": int,
+    "velocidade": int,
+    "resistencia": int,
+    "forca": int,
+    "visao": int,
+    "agressividade": int,
+}
+
+class CampoPopulacao:
+    """
+    Descritor dos atributos de um Meko que podem ficar guardados em uma `Populacao`.
+
+    Se o Meko pertence a uma população, o valor é lido e escrito no array do atributo, na linha do Meko.
+    Caso contrário, o valor fica no próprio objeto, como um atributo comum.
+
+    Durante um tick síncrono (ver `Populacao.congelar`), os outros Mekos são lidos do retrato congelado.
+    """
+    def __set_name__(self, owner, nome):
+        self.nome = nome
+
+    def __get__(self, meko, owner=None):
+        if meko is None:
+            return self
+        populacao = meko._populacao
+        if populacao is None:
+            try:
+                return meko.__dict__[self.nome]
+            except KeyError:
+                raise AttributeError(self.nome) from None
+        if populacao.congelado is not None and meko._slot != populacao.ator:
+            return populacao.congelado[self.nome].item(meko._slot)
+        return populacao.arrays[self.nome].item(meko._slot)
+
+    def __set__(self, meko, valor):
+        populacao = meko._populacao
+        if populacao is None:
+            meko.__dict__[self.nome] = valor
+        elif populacao.congelado is not None and meko._slot != populacao.ator:
+            populacao.escrever_em_outro(self.nome, meko._slot, valor)
+        else:
+            populacao.arrays[self.nome][meko._slot] = valor
+
+class Populacao:
+    """
+    Armazenamento em estrutura de arrays (structure of arrays) do estado dos Mekos.
+
+    Cada Meko ocupa uma linha (`slot`) em arrays NumPy contíguos de posição, saúde, energia, idade, fitness, fertilidade
+    e atributos derivados. Os objetos `Meko` continuam existindo e funcionam como visões dessas linhas, então o restante
+    do código (FSM, habilidades, GUI) continua lendo e escrevendo `meko.saude`, `meko.posicao` etc. normalmente.
+
+    O envelhecimento, o gasto de energia por tick, a morte por fome ou idade, o fitness e a fertilidade de toda a população
+    são calculados de uma vez em `atualizar`.
+
+    No modo síncrono, os arrays funcionam como um buffer duplo: `congelar` copia o estado do início do tick para
+    `congelado`, e, enquanto o tick durar, o Meko que está agindo (`ator`) lê e escreve o próprio estado nos arrays, mas
+    lê o estado de todos os outros no retrato congelado. Escritas no estado de outro Meko (ex: dano) são aplicadas como
+    a diferença em relação ao retrato, então os efeitos de vários Mekos sobre o mesmo alvo se somam, em qualquer ordem.
+
+    Attributes:
+        n (int): A quantidade de Mekos na população.
+        mekos (list[Meko]): Os Mekos na ordem de seus slots.
+        arrays (dict[str, np.ndarray]): Os arrays de cada atributo, com capacidade maior ou igual a `n`.
+        posicao (np.ndarray): Array `(capacidade, 2)` com as posições.
+        fertilidade (np.ndarray): Array com os códigos de fertilidade (`INCAPAZ`, `FERTIL` ou `GESTANTE`).
+        congelado (dict[str, np.ndarray]): O retrato do início do tick síncrono em andamento, ou `None`.
+        ator (int): O slot do Meko que está agindo no tick síncrono.
+        danos (list[tuple[int, int, float]]): Os danos `(ator, alvo, dano)` causados no tick síncrono em andamento.
+
+    Methods:
+        `adicionar`: Copia o estado de um Meko para a população e o transforma em visão.
+        `remover`: Devolve o estado ao Meko e libera sua linha.
+        `atualizar`: Aplica um tick de envelhecimento, energia, fome, fitness e fertilidade a todos os Mekos.
+        `congelar`: Inicia um tick síncrono, copiando o estado atual para o retrato.
+        `descongelar`: Encerra o tick síncrono.
+        `le_retrato`: Se os valores de um slot são lidos do retrato.
+    """
+    def __init__(self, capacidade=64):
+        self.n = 0
+        self.mekos = []
+        self.arrays = {nome: np.zeros(capacidade, dtype=tipo) for nome, tipo in CAMPOS.items()}
+        self.posicao = np.zeros((capacidade, 2), dtype=int)
+        self.fertilidade = np.zeros(capacidade, dtype=np.int8)
+        self.congelado = None
+        self.ator = None
+        self.danos = []
+
+    def __len__(self):
+        return self.n
+
+    def _garantir_capacidade(self, capacidade):
+        atual = len(self.fertilidade)
+        if capacidade <= atual:
+            return
+        nova = max(capacidade, atual * 2)
+
+        for nome, array in self.arrays.items():
+            self.arrays[nome] = np.resize(array, nova)
+
+        self.posicao = np.resize(self.posicao, (nova, 2))
+        self.fertilidade = np.resize(self.fertilidade, nova)
+
+    def adicionar(self, meko):
+        if meko._populacao is not None:
+            return
+
+        self._garantir_capacidade(self.n + 1)
+        slot = self.n
+
+        for nome in CAMPOS:
+            self.arrays[nome][slot] = meko.__dict__.pop(nome)
+        self.posicao[slot] = meko._posicao
+        self.fertilidade[slot] = CODIGO_FERTILIDADE[meko.__dict__.pop("_fertilidade")]
+
+        meko._populacao = self
+        meko._slot = slot
+        self.mekos.append(meko)
+        self.n += 1
+
+    def remover(self, meko):
+        """
+        Devolve o estado atual ao objeto Meko e libera sua linha, movendo o último Meko para ela.
+        """
+        if meko._populacao is not self:
+            return
+
+        slot = meko._slot
+        for nome, tipo in CAMPOS.items():
+            meko.__dict__[nome] = tipo(self.arrays[nome][slot])
+        meko._posicao = (int(self.posicao[slot, 0]), int(self.posicao[slot, 1]))
+        meko._fertilidade = FERTILIDADES[self.fertilidade[slot]]
+        meko._populacao = None
+        meko._slot = None
+
+        ultimo = self.n - 1
+        if slot != ultimo:
+            for array in self.arrays.values():
+                array[slot] = array[ultimo]
+            self.posicao[slot] = self.posicao[ultimo]
+            self.fertilidade[slot] = self.fertilidade[ultimo]
+
+            movido = self.mekos[ultimo]
+            movido._slot = slot
+            self.mekos[slot] = movido
+
+        self.mekos.pop()
+        self.n -= 1
+
+    def atualizar(self):
+        """
+        Aplica um tick de envelhecimento, fome, gasto de energia, fitness e fertilidade a toda a população.
+
+        Segue as mesmas regras de `Meko.esta_vivo` e da primeira parte de `Meko.update`, na mesma ordem, mas para todos
+        os Mekos antes de qualquer FSM ser executada. No `Ambiente.tick` sem `Populacao`, essas regras e a FSM são
+        intercaladas Meko a Meko: um Meko ainda não atualizado pode ser atacado, ou ter a energia e a fertilidade
+        lidas por outro, com os valores do tick anterior. Por isso, a mesma semente gera simulações diferentes com e sem
+        a `Populacao`.
+
+        Returns:
+            tuple[np.ndarray, np.ndarray, np.ndarray]: Máscaras por slot dos Mekos vivos, mortos de fome e mortos de idade.
+        """
+        n = self.n
+        a = self.arrays
+        idade, idadeMAX = a["idade"][:n], a["idadeMAX"][:n]
+        saude, saudeMAX = a["saude"][:n], a["saudeMAX"][:n]
+        energia, energiaMAX = a["energia"][:n], a["energiaMAX"][:n]
+        fitness = a["fitness"][:n]
+        fertilidade = self.fertilidade[:n]
+
+        idade += 1
+
+        # esta_vivo
+        vivo = saude >= 0
+        faminto = vivo & (energia <= 0)
+        perde_saude = faminto & (saude > 10)
+        saude[perde_saude] -= 10
+        morte_fome = faminto & ~perde_saude
+        vivo &= ~morte_fome
+        morte_idade = vivo & (idade >= idadeMAX)
+        vivo &= ~morte_idade
+
+        # update
+        energia[vivo] -= PERDA_ENERGIA_POR_TICK
+
+        longevidade_score = C_LONGEVIDADE * (idade / idadeMAX)
+        saude_score = C_SAUDE * (saude / saudeMAX)
+        energia_score = C_ENERGIA * (energia / energiaMAX)
+        novo_fitness = np.maximum(1.0, saude_score + (energia_score + longevidade_score))
+        fitness[vivo] = novo_fitness[vivo]
+
+        is_adulto = (idade > 30) & (idade < idadeMAX * 0.8)
+        is_saudavel = (saude > saudeMAX * 0.4) & (energia > energiaMAX * 0.3)
+        muda = vivo & (fertilidade != GESTANTE)
+        fertilidade[muda] = np.where(is_adulto & is_saudavel, FERTIL, INCAPAZ)[muda]
+
+        return vivo, morte_fome, morte_idade
+
+    def congelar(self):
+        """
+        Inicia um tick síncrono: copia saúde, energia, atributos, posições e fertilidade para o retrato `congelado`.
+        """
+        n = self.n
+        self.congelado = {nome: array[:n].copy() for nome, array in self.arrays.items()}
+        self.congelado["posicao"] = self.posicao[:n].copy()
+        self.congelado["fertilidade"] = self.fertilidade[:n].copy()
+        self.ator = None
+        self.danos = []
+
+    def descongelar(self):
+        """
+        Encerra o tick síncrono. A partir daqui, todos os Mekos voltam a ser lidos dos arrays.
+
+        Returns:
+            tuple[dict[str, np.ndarray], list[tuple[int, int, float]]]: O retrato do início do tick e os danos
+            `(ator, alvo, dano)` causados durante ele.
+        """
+        congelado, danos = self.congelado, self.danos
+        self.congelado = None
+        self.ator = None
+        self.danos = []
+        return congelado, danos
+
+    def le_retrato(self, slot):
+        """
+        Se os valores do Meko em `slot` são lidos do retrato congelado (um tick síncrono está em andamento e o Meko
+        não é o que está agindo).
+        """
+        return self.congelado is not None and slot != self.ator
+
+    def escrever_em_outro(self, nome, slot, valor):
+        """
+        Escrita do `ator` no atributo `nome` de outro Meko durante um tick síncrono.
+
+        O valor foi calculado a partir do retrato, então é aplicada apenas a diferença, que se soma às dos outros
+        Mekos. As reduções de saúde ficam registradas em `danos`.
+        """
+        delta = valor - self.congelado[nome][slot]
+        self.arrays[nome][slot] += delta
+        if nome == "saude" and delta < 0:
+            self.danos.append((self.ator, slot, -delta))
@@ -0,0 +1,233 @@
+import numpy as np
+
+from settings import PERIODO_RECARGA_FRUTA
+
+# Atributos das frutas guardados em arrays e seus tipos
+CAMPOS_FRUTA = {
+    "quant": np.int32,
+    "quantMAX": np.int32,
+    "recarga": np.int32,
+}
+
+# Estado inicial de uma fruta
+QUANT_INICIAL = 1
+QUANT_MAX = 3
+
+class CampoFruta:
+    """
+    Descritor dos atributos de uma `Fruta` que podem ficar guardados em um `Frutas`.
+
+    Se a fruta pertence a um `Frutas`, o valor é lido e escrito no array do atributo, na linha da fruta.
+    Caso contrário, o valor fica no próprio objeto, como um atributo comum.
+    """
+    def __set_name__(self, owner, nome):
+        self.nome = nome
+
+    def __get__(self, fruta, owner=None):
+        if fruta is None:
+            return self
+        frutas = fruta._frutas
+        if frutas is None:
+            try:
+                return fruta.__dict__[self.nome]
+            except KeyError:
+                raise AttributeError(self.nome) from None
+        return frutas.arrays[self.nome].item(fruta._slot)
+
+    def __set__(self, fruta, valor):
+        frutas = fruta._frutas
+        if frutas is None:
+            fruta.__dict__[self.nome] = valor
+        else:
+            frutas.arrays[self.nome][fruta._slot] = valor
+
+class Fruta:
+    """
+    Classe que representa as frutas. Os objetos são gerados nas áreas de recursos no ambiente.
+
+    Dentro de um ambiente, o estado das frutas fica nos arrays de um `Frutas`, e cada objeto `Fruta` é apenas uma visão
+    de uma linha desses arrays, criada quando a fruta é encontrada por um Meko.
+
+    Attributes:
+        posicao (tuple[int, int]): A posição da fruta no ambiente.
+        nome (string): O nome da fruta, gerado a partir de sua posição.
+        quantMAX (int): A quantidade máxima de frutas que podem ser geradas.
+        quant (int): A quantidade atual de frutas disponíveis.
+        recarga (int): Índice de contagem do tempo de recarga.
+
+    Methods:
+        recarregar: Recarrega a fruta após um tempo de espera. Dentro de um ambiente, a recarga de todas as frutas é
+            feita de uma vez por `Frutas.recarregar`.
+    """
+    _frutas = None
+    _slot = None
+
+    quant = CampoFruta()
+    quantMAX = CampoFruta()
+    recarga = CampoFruta()
+
+    def __init__(self, posicao):
+        self.posicao = posicao
+        x,y = posicao
+        self.nome = str("fruit" + str(x) + str(y))
+        self.quantMAX = QUANT_MAX
+        self.quant = QUANT_INICIAL
+        self.recarga = 0
+
+    def recarregar(self, periodo=PERIODO_RECARGA_FRUTA):
+        """
+        Aplica um tick de recarga a esta fruta, com as mesmas regras de `Frutas.recarregar`.
+        """
+        if not periodo or self.quant >= self.quantMAX:
+            self.recarga = 0
+            return
+        self.recarga += 1
+        if self.recarga >= periodo:
+            self.quant = min(self.quant + 1, self.quantMAX)
+            self.recarga = 0
+
+class Frutas:
+    """
+    Armazenamento em estrutura de arrays (structure of arrays) das frutas de um ambiente.
+
+    Cada fruta ocupa uma linha (`slot`) nos arrays de posição, quantidade, quantidade máxima e recarga. Frutas não são
+    removidas (uma fruta consumida fica com `quant` zero), então o slot também serve de identificador estável.
+    Objetos `Fruta` só são criados quando alguém pede a fruta de um slot (`obter`), por exemplo o resultado de uma
+    busca, e são reaproveitados nas chamadas seguintes. Assim, um mapa com centenas de milhares de frutas é montado
+    com algumas operações sobre arrays.
+
+    Attributes:
+        n (int): A quantidade de frutas.
+        posicao (np.ndarray): Array `(capacidade, 2)` com as posições.
+        arrays (dict[str, np.ndarray]): Os arrays de `quant`, `quantMAX` e `recarga`, com capacidade maior ou igual a `n`.
+
+    Methods:
+        `adicionar`: Adiciona um objeto `Fruta`, que passa a ser a visão do seu slot.
+        `adicionar_posicoes`: Adiciona de uma vez frutas novas em várias posições.
+        `obter`: Retorna o objeto `Fruta` de um slot.
+        `recarregar`: Aplica um tick de recarga a todas as frutas.
+        `limpar`: Remove todas as frutas.
+    """
+    def __init__(self, capacidade=64):
+        self.n = 0
+        self.posicao = np.zeros((capacidade, 2), dtype=np.int32)
+        self.arrays = {nome: np.zeros(capacidade, dtype=tipo) for nome, tipo in CAMPOS_FRUTA.items()}
+        # slot -> Fruta, apenas para as frutas que já foram pedidas
+        self._visoes = {}
+
+    def __len__(self):
+        return self.n
+
+    def __bool__(self):
+        return self.n > 0
+
+    def __iter__(self):
+        for slot in range(self.n):
+            yield self.obter(slot)
+
+    def __repr__(self):
+        return f"Frutas(n={self.n})"
+
+    def _garantir_capacidade(self, capacidade):
+        atual = len(self.posicao)
+        if capacidade <= atual:
+            return
+        nova = max(capacidade, atual * 2)
+
+        for nome, array in self.arrays.items():
+            self.arrays[nome] = np.resize(array, nova)
+        self.posicao = np.resize(self.posicao, (nova, 2))
+
+    def adicionar(self, fruta):
+        """
+        Copia o estado de um objeto `Fruta` para um novo slot e o transforma na visão desse slot.
+
+        Returns:
+            int: O slot da fruta.
+        """
+        if fruta._frutas is not None:
+            return fruta._slot
+
+        self._garantir_capacidade(self.n + 1)
+        slot = self.n
+
+        for nome in CAMPOS_FRUTA:
+            self.arrays[nome][slot] = fruta.__dict__.pop(nome)
+        self.posicao[slot] = fruta.posicao
+
+        fruta._frutas = self
+        fruta._slot = slot
+        self._visoes[slot] = fruta
+        self.n += 1
+        return slot
+
+    def adicionar_posicoes(self, posicoes):
+        """
+        Adiciona frutas novas em todas as posições de `posicoes`, sem criar objetos.
+
+        Args:
+            posicoes (np.ndarray): Array `(k, 2)` de posições, como o retornado por `np.argwhere`.
+
+        Returns:
+            range: Os slots das frutas adicionadas.
+        """
+        posicoes = np.asarray(posicoes, dtype=np.int32).reshape(-1, 2)
+        k = len(posicoes)
+        self._garantir_capacidade(self.n + k)
+        inicio, fim = self.n, self.n + k
+
+        self.posicao[inicio:fim] = posicoes
+        self.arrays["quant"][inicio:fim] = QUANT_INICIAL
+        self.arrays["quantMAX"][inicio:fim] = QUANT_MAX
+        self.arrays["recarga"][inicio:fim] = 0
+        self.n = fim
+        return range(inicio, fim)
+
+    def obter(self, slot):
+        """
+        Retorna o objeto `Fruta` de um slot, criando a visão na primeira vez.
+        """
+        fruta = self._visoes.get(slot)
+        if fruta is None:
+            x, y = self.posicao[slot].tolist()
+            fruta = Fruta.__new__(Fruta)
+            fruta.posicao = (x, y)
+            fruta.nome = str("fruit" + str(x) + str(y))
+            fruta._frutas = self
+            fruta._slot = slot
+            self._visoes[slot] = fruta
+        return fruta
+
+    def recarregar(self, periodo=PERIODO_RECARGA_FRUTA):
+        """
+        Aplica um tick de recarga a todas as frutas de uma vez.
+
+        O contador `recarga` de cada fruta abaixo de `quantMAX` avança um tick; ao chegar a `periodo`, a fruta ganha
+        mais uma unidade e o contador volta a zero. Frutas cheias ficam com o contador zerado.
+
+        Args:
+            periodo (int): Ticks entre duas unidades de recarga. Com 0 ou `None`, nenhuma fruta recarrega.
+        """
+        if not periodo or not self.n:
+            return
+
+        n = self.n
+        quant = self.arrays["quant"][:n]
+        quantMAX = self.arrays["quantMAX"][:n]
+        recarga = self.arrays["recarga"][:n]
+
+        abaixo = quant < quantMAX
+        recarga += abaixo
+        pronta = abaixo & (recarga >= periodo)
+        quant += pronta
+        # Zera as prontas e as que já estão cheias
+        recarga[pronta | ~abaixo] = 0
+
+    def limpar(self):
+        for fruta in self._visoes.values():
+            for nome in CAMPOS_FRUTA:
+                fruta.__dict__[nome] = self.arrays[nome].item(fruta._slot)
+            fruta._frutas = None
+            fruta._slot = None
+        self._visoes.clear()
+        self.n = 0
@@ -0,0 +1,101 @@
+"""
+Renderização incremental do ambiente com matplotlib.
+
+O terreno é desenhado uma única vez (`imshow`) e os Mekos ficam em uma única coleção de pontos (`PathCollection`), cujas
+posições e cores são atualizadas em bloco a cada quadro. Os nomes são opcionais, reaproveitam os mesmos objetos de
+texto e só são desenhados enquanto houver poucos Mekos na tela (`settings.LIMITE_ROTULOS`). O desenho parte de um
+`simulador.Retrato`, então pode acompanhar uma simulação que roda em outra thread.
+
+`atualizar` retorna os artistas que mudam a cada quadro, então o renderizador pode ser usado diretamente com
+`FuncAnimation(..., blit=True)`: apenas os pontos e os nomes são redesenhados sobre o fundo guardado.
+"""
+import numpy as np
+from matplotlib.colors import to_rgba_array
+
+import settings
+
+from simulador import Retrato
+
+# Cores dos Mekos vivos e dos mortos durante o tick
+COR_VIVO = "red"
+COR_MORTO = "gray"
+
+class Renderizador:
+    """
+    Desenha um `Ambiente` em um eixo do matplotlib, atualizando apenas o que muda entre os quadros.
+
+    Attributes:
+        ambiente (Ambiente): O ambiente desenhado.
+        ax (matplotlib.axes.Axes): O eixo do gráfico.
+        rotulos (bool): Se os nomes dos Mekos são desenhados.
+        limite_rotulos (int): Quantidade máxima de Mekos para que os nomes sejam desenhados.
+        terreno (AxesImage): A imagem do terreno.
+        pontos (PathCollection): Os pontos dos Mekos.
+        textos (list[Text]): Os objetos de texto dos nomes, reaproveitados entre os quadros.
+
+    Methods:
+        `iniciar`: Desenha o terreno e cria os artistas dos Mekos.
+        `atualizar`: Desenha o estado atual do ambiente.
+        `desenhar`: Atualiza as posições, as cores e os nomes dos Mekos a partir de um `Retrato`.
+        `artistas`: Os artistas que mudam a cada quadro.
+    """
+    def __init__(self, ambiente, ax, rotulos=True, limite_rotulos=settings.LIMITE_ROTULOS):
+        self.ambiente = ambiente
+        self.ax = ax
+        self.rotulos = rotulos
+        self.limite_rotulos = limite_rotulos
+        self.terreno = None
+        self.pontos = None
+        self.textos = []
+        self._cores = to_rgba_array([COR_MORTO, COR_VIVO])
+
+    def iniciar(self):
+        """
+        Desenha o terreno e cria a coleção de pontos vazia. Chamado uma única vez, no primeiro quadro.
+
+        Returns:
+            list[Artist]: Os artistas que mudam a cada quadro (para o `init_func` do `FuncAnimation`).
+        """
+        self.terreno = self.ax.imshow(self.ambiente.matriz, cmap=settings.CMAP, interpolation="none")
+        self.pontos = self.ax.scatter(np.empty(0), np.empty(0), s=100, alpha=0.6, marker="o")
+        return self.artistas()
+
+    def artistas(self):
+        return [self.pontos, *self.textos]
+
+    def atualizar(self):
+        """
+        Desenha o estado atual do ambiente (ver `desenhar`).
+        """
+        return self.desenhar(Retrato.do_ambiente(self.ambiente))
+
+    def desenhar(self, retrato):
+        """
+        Atualiza as posições e as cores de todos os Mekos de uma vez a partir de um `Retrato` e, se houver poucos
+        Mekos, os seus nomes.
+
+        Returns:
+            list[Artist]: Os artistas que mudam a cada quadro (para o `FuncAnimation` com `blit=True`).
+        """
+        if self.pontos is None:
+            self.iniciar()
+
+        posicoes = retrato.posicoes
+        # As posições são (linha, coluna); no gráfico, x é a coluna
+        self.pontos.set_offsets(posicoes[:, ::-1])
+        self.pontos.set_facecolors(self._cores[retrato.vivos.astype(np.intp)])
+
+        n_rotulos = len(retrato) if self.rotulos and len(retrato) <= self.limite_rotulos else 0
+        while len(self.textos) < n_rotulos:
+            self.textos.append(self.ax.text(0, 0, "", color="white", ha="center", va="center", weight="bold",
+                                            animated=self.pontos.get_animated()))
+        for k, texto in enumerate(self.textos):
+            if k < n_rotulos:
+                i, j = posicoes[k].tolist()
+                texto.set_position((j, i))
+                texto.set_text(retrato.nomes[k])
+                texto.set_visible(True)
+            else:
+                texto.set_visible(False)
+
+        return self.artistas()
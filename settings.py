@@ -1,17 +1,37 @@
-from matplotlib.colors import ListedColormap, BoundaryNorm
 import numpy as np
 
 cores = ["#5C9128", "#277B12", "#0E5A28", "#6F4823", "#C47225", "#3B8B91"]
 legendas = ["Deserto", "Campo", "Floresta", "Montanha", "Frutas", "Rios"]
-CMAP = ListedColormap(cores)
 bounds = np.arange(-0.5, len(cores)+0.5, 1)
-NORM = BoundaryNorm(bounds, CMAP.N)
+
+def __getattr__(nome):
+    """
+    Cria `CMAP` e `NORM` apenas quando são usados, para que a simulação sem interface
+    (`simulacao.py`) não precise importar o matplotlib.
+    """
+    if nome in ("CMAP", "NORM"):
+        from matplotlib.colors import ListedColormap, BoundaryNorm
+        global CMAP, NORM
+        CMAP = ListedColormap(cores)
+        NORM = BoundaryNorm(bounds, CMAP.N)
+        return globals()[nome]
+    raise AttributeError(f"module {__name__!r} has no attribute {nome!r}")
 
 # AMBIENTE
 GRID_SIZE = 50
 SIMULATION_STEPS = 200
 SIMULATION_DELAY = 0
 
+# Ticks até uma fruta abaixo da quantidade máxima ganhar mais uma unidade (0 desliga a recarga)
+PERIODO_RECARGA_FRUTA = 15
+
+# Acima desta quantidade de Mekos na tela, os nomes deixam de ser desenhados
+LIMITE_ROTULOS = 60
+
+# Ritmo da interface: retratos desenhados por segundo e limite de ticks por segundo (None = o mais rápido possível)
+QUADROS_POR_SEGUNDO = 10
+TICKS_POR_SEGUNDO = None
+
 CUSTO_TERRENO = {
     0: 0,   # Deserto (0) - Custo normal
     1: 0,   # Campo (1) - Custo normal
@@ -26,11 +46,6 @@ TERRENO_FLORESTA = 2
 TERRENO_MONTANHA = 3
 TERRENO_RIO = 5
 
-## LISTAS
-mekos_list = []
-fruit_list = []
-meat_list = []
-
 # MEKOS
 
 PERDA_ENERGIA_POR_TICK = 0.5
@@ -103,6 +118,9 @@ LOC_CARACTERISTICAS = {
     }
 }
 
+# Atlas pré-carregado das camadas de sprite (gerado com `python -m sprites`). Se não existir, os PNGs são usados.
+CAMINHO_ATLAS_SPRITES = "assets/sprites/atlas.npz"
+
 CARACTERISTICAS = [
     ("Tipo", ["Fogo", "Agua", "Terra", "Inseto", "Sombra", "Luz"]),
     ("Alimentacao", ["Herbivoro", "Carnivoro", "Onivoro"]),
@@ -159,6 +177,12 @@ TABELA_EFETIVIDADE_TIPO = {
     },
 }
 
+# Multiplicadores do ataque elétrico (Eletrocutar), que não tem um tipo próprio
+EFETIVIDADE_ELETRICO = {
+    "Agua": 2,
+    "Terra": 0
+}
+
 ## MODIFICADORES
 
 efeitos_tipo = {
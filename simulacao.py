@@ -0,0 +1,208 @@
+"""
+Execução de simulações sem interface gráfica.
+
+Monta o ambiente, as frutas e os Mekos da mesma forma que a Simulação Aleatória do `GUI.py`, mas sem importar
+tkinter ou matplotlib e sem limitar a velocidade dos ticks. Pode ser usado em servidores sem display.
+
+Uso:
+    python -m simulacao --size 100 --mekos 50 --ticks 500 --seed 42
+    python -m simulacao --ambiente assets/ambientes/Floresta.npy --mekos 20
+"""
+import argparse
+import time
+
+import numpy as np
+
+from aleatorio import Aleatorio, random_de, rng_de
+from ambiente import Ambiente, biome_gen, fruit_gen, river_gen, posicoes_frutas
+from eventos import NIVEIS, NIVEL_DEBUG
+from logger import SimulationLogger, StreamingSimulationLogger, TelemetriaSimulationLogger
+from meko import Meko
+from settings import CARACTERISTICAS, GRID_SIZE, SIMULATION_STEPS, PERIODO_RECARGA_FRUTA
+from utils import gerar_nome
+
+def gerar_ambiente_aleatorio(size, n_biomas=None, scale=None, biome_weights=None, aleatorio=None):
+    """
+    Gera uma matriz de terreno com biomas, frutas e rios a partir de parâmetros aleatórios.
+
+    Os parâmetros informados são usados diretamente; os demais são sorteados como na Simulação Aleatória.
+
+    Args:
+        size (int): Tamanho da matriz.
+        n_biomas (int, opcional): Quantidade de biomas (2 a 4). Se omitido, usa o tamanho de `biome_weights` ou sorteia.
+        scale (float, opcional): Escala do ruído de Perlin.
+        biome_weights (list[float], opcional): Pesos de cada bioma. São normalizados para somar 1.
+        aleatorio (Aleatorio, opcional): Geradores da simulação. Padrão: `aleatorio.PADRAO`.
+
+    Returns:
+        np.ndarray: A matriz de terrenos gerada.
+    """
+    gerador = random_de(aleatorio)
+    rng = rng_de(aleatorio)
+
+    grid = np.zeros((size, size))
+    if n_biomas is None:
+        n_biomas = len(biome_weights) if biome_weights is not None else gerador.randint(2, 4)
+    if scale is None:
+        scale = gerador.uniform(5.0, 30.0)
+    if biome_weights is None:
+        biome_weights = [gerador.random() for _ in range(n_biomas)]
+    elif len(biome_weights) != n_biomas:
+        raise ValueError(f"Esperados {n_biomas} pesos de biomas, recebidos {len(biome_weights)}.")
+    soma_total = sum(biome_weights)
+    biome_weights = [w / soma_total for w in biome_weights]
+    seed = gerador.randint(0, 99999)
+
+    matriz = biome_gen(grid, size, n_biomas, scale, seed, biome_weights, rng=rng)
+    matriz = fruit_gen(matriz, size, rng=rng)
+    matriz = river_gen(matriz, size, rng=rng)
+    return matriz
+
+def popular_frutas(ambiente):
+    """
+    Adiciona uma fruta em cada célula de frutas (4) da matriz do ambiente, de uma vez.
+    """
+    ambiente.adicionar_frutas(posicoes_frutas(ambiente.matriz))
+
+def popular_mekos(ambiente, n_mekos):
+    """
+    Adiciona `n_mekos` Mekos com genomas aleatórios em posições aleatórias do ambiente.
+
+    Usa o gerador `random` da simulação do ambiente (`ambiente.mundo.aleatorio`).
+    """
+    gerador = ambiente.mundo.aleatorio.random
+    for _ in range(n_mekos):
+        genoma = [gerador.choice(valores) for _, valores in CARACTERISTICAS]
+        meko = Meko(
+            gerar_nome(gerador),
+            genoma,
+            ambiente,
+            (gerador.randint(0, ambiente.size-1), gerador.randint(0, ambiente.size-1))
+        )
+        ambiente.adicionar_meko(meko)
+
+def executar(size=GRID_SIZE, n_mekos=10, ticks=SIMULATION_STEPS, seed=None, caminho_ambiente=None,
+             prefixo="sim_headless", exportar=True, populacao=False, streaming=False, intervalo_flush=50,
+             telemetria=False, verbose=False, nivel_eventos=NIVEL_DEBUG, n_biomas=None, scale=None,
+             pesos_biomas=None, periodo_recarga=PERIODO_RECARGA_FRUTA, sincrono=False,
+             percepcao=False):
+    """
+    Executa uma simulação completa sem interface gráfica.
+
+    Args:
+        size (int): Tamanho do ambiente gerado. Ignorado se `caminho_ambiente` for informado.
+        n_mekos (int): Quantidade inicial de Mekos.
+        ticks (int): Quantidade de ticks simulados.
+        seed (int | np.random.SeedSequence, opcional): Semente dos geradores aleatórios da simulação (`Aleatorio`).
+            A mesma semente reproduz a mesma simulação. Se omitida, usa entropia do sistema.
+        caminho_ambiente (str, opcional): Arquivo `.npy` com uma matriz de ambiente salva.
+        prefixo (str): Prefixo dos arquivos de log.
+        exportar (bool): Se os logs devem ser salvos na pasta `logs/`.
+        populacao (bool): Se o estado dos Mekos deve ser guardado em arrays (`Populacao`) e atualizado de forma vetorizada.
+            O envelhecimento de todos os Mekos acontece antes das FSMs, então os resultados diferem do modo padrão para
+            a mesma semente.
+        streaming (bool): Se os logs devem ser gravados em disco durante a simulação (`StreamingSimulationLogger`).
+        intervalo_flush (int): Intervalo, em ticks, entre as gravações dos logs em streaming.
+        telemetria (bool): Se o estado dos Mekos deve ser registrado em colunas (`TelemetriaSimulationLogger`).
+        verbose (bool): Com `telemetria`, mantém também o log individual em texto.
+        nivel_eventos (int): Nível mínimo dos eventos guardados em `Meko.log`. Com `NIVEL_DESLIGADO`, nenhum evento é criado.
+        n_biomas (int, opcional): Quantidade de biomas do ambiente gerado. Sorteada se omitida.
+        scale (float, opcional): Escala do ruído de Perlin do ambiente gerado. Sorteada se omitida.
+        pesos_biomas (list[float], opcional): Pesos dos biomas do ambiente gerado. Sorteados se omitidos.
+        periodo_recarga (int): Ticks até uma fruta ganhar mais uma unidade. Com 0, as frutas não recarregam.
+        sincrono (bool): Se os ticks usam o modo síncrono (ver `sincrono.py`). Implica `populacao`.
+        percepcao (bool): Se as buscas dos Mekos são calculadas em lote, uma vez por tick (ver `percepcao.py`).
+
+    Returns:
+        tuple[Ambiente, SimulationLogger]: O ambiente final e o logger da simulação.
+    """
+    aleatorio = Aleatorio(seed)
+
+    inicio = time.time()
+    if telemetria:
+        sim_logger = TelemetriaSimulationLogger(filename_prefix=prefixo, verbose=verbose)
+    elif streaming and exportar:
+        sim_logger = StreamingSimulationLogger(filename_prefix=prefixo, intervalo_flush=intervalo_flush)
+    else:
+        sim_logger = SimulationLogger(filename_prefix=prefixo)
+
+    # --- Ambiente ---
+    if caminho_ambiente is not None:
+        matriz = np.load(caminho_ambiente)
+        size = matriz.shape[0]
+    else:
+        matriz = gerar_ambiente_aleatorio(size, n_biomas, scale, pesos_biomas, aleatorio)
+
+    ambiente = Ambiente(size, matriz, sim_logger, populacao=populacao, nivel_eventos=nivel_eventos,
+                        periodo_recarga=periodo_recarga, aleatorio=aleatorio, sincrono=sincrono,
+                        percepcao=percepcao)
+    popular_frutas(ambiente)
+
+    # --- Mekos ---
+    popular_mekos(ambiente, n_mekos)
+
+    # --- Loop da simulação ---
+    try:
+        for tick in range(ticks):
+            ambiente.tick(tick)
+    except BaseException:
+        # Em streaming, os logs continuam legíveis até o último tick concluído
+        if isinstance(sim_logger, StreamingSimulationLogger):
+            sim_logger.export_logs()
+        raise
+
+    sim_logger.log_geral_final(ambiente, inicio, time.time(), ticks, n_mekos)
+    if exportar:
+        sim_logger.export_logs()
+
+    return ambiente, sim_logger
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, default=GRID_SIZE, help="Tamanho do ambiente gerado.")
+    parser.add_argument("--mekos", type=int, default=10, help="Quantidade inicial de Mekos.")
+    parser.add_argument("--ticks", type=int, default=SIMULATION_STEPS, help="Quantidade de ticks simulados.")
+    parser.add_argument("--seed", type=int, default=None, help="Semente dos geradores aleatórios.")
+    parser.add_argument("--ambiente", default=None, help="Arquivo .npy com a matriz do ambiente.")
+    parser.add_argument("--prefixo", default="sim_headless", help="Prefixo dos arquivos de log.")
+    parser.add_argument("--sem-logs", action="store_true", help="Não salva os arquivos de log.")
+    parser.add_argument("--populacao", action="store_true",
+                        help="Guarda o estado dos Mekos em arrays (Populacao). O envelhecimento de todos os Mekos "
+                             "acontece antes das FSMs, então a mesma semente gera resultados diferentes do modo padrão.")
+    modo_log = parser.add_mutually_exclusive_group()
+    modo_log.add_argument("--streaming", action="store_true", help="Grava os logs em JSON Lines durante a simulação.")
+    modo_log.add_argument("--telemetria", action="store_true", help="Registra o estado dos Mekos em colunas (.npz).")
+    parser.add_argument("--flush", type=int, default=50, help="Intervalo, em ticks, entre gravações dos logs em streaming.")
+    parser.add_argument("--verbose", action="store_true", help="Com --telemetria, mantém também o log individual em texto.")
+    parser.add_argument("--eventos", choices=NIVEIS, default="debug",
+                        help="Nível mínimo dos eventos no log individual ('desligado' não cria nenhum evento).")
+    parser.add_argument("--recarga", type=int, default=PERIODO_RECARGA_FRUTA,
+                        help="Ticks até uma fruta ganhar mais uma unidade (0 desliga a recarga).")
+    parser.add_argument("--sincrono", action="store_true",
+                        help="Cada tick lê o estado do início do tick e resolve os conflitos no fim (implica --populacao).")
+    parser.add_argument("--percepcao", action="store_true",
+                        help="Calcula as buscas de todos os Mekos em lote, uma vez por tick.")
+    args = parser.parse_args(argv)
+
+    ambiente, sim_logger = executar(
+        size=args.size,
+        n_mekos=args.mekos,
+        ticks=args.ticks,
+        seed=args.seed,
+        caminho_ambiente=args.ambiente,
+        prefixo=args.prefixo,
+        exportar=not args.sem_logs,
+        populacao=args.populacao,
+        streaming=args.streaming,
+        intervalo_flush=args.flush,
+        telemetria=args.telemetria,
+        verbose=args.verbose,
+        nivel_eventos=NIVEIS[args.eventos],
+        periodo_recarga=args.recarga,
+        sincrono=args.sincrono,
+        percepcao=args.percepcao
+    )
+    print(sim_logger.gerar_relatorio_final(ambiente))
+
+if __name__ == "__main__":
+    main()
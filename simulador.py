@@ -0,0 +1,232 @@
+"""
+Condução da simulação com a visualização separada do ritmo dos ticks.
+
+O `Simulador` avança um `Ambiente` em lotes de ticks ou em uma thread de fundo, o mais rápido possível (ou até um
+limite de ticks por segundo), e publica `Retrato`s imutáveis do estado dos Mekos no máximo `quadros_por_segundo`
+vezes por segundo. A interface apenas desenha o retrato mais recente, então a simulação não fica presa ao tempo de
+redesenho da tela, e a tela nunca lê um Meko no meio de um tick.
+
+Uso:
+    simulador = Simulador(ambiente, ticks=500)
+    simulador.iniciar()                     # thread de fundo
+    for retrato in simulador.quadros():     # ex: `frames` de um FuncAnimation
+        renderizador.desenhar(retrato)
+
+    Simulador(ambiente, 500, ticks_por_quadro=10).quadros()   # sem thread: 10 ticks por quadro
+"""
+import threading
+import time
+
+import numpy as np
+
+import settings
+
+class Retrato:
+    """
+    Estado dos Mekos de um ambiente ao fim de um tick, com arrays somente leitura.
+
+    Attributes:
+        tick (int): A quantidade de ticks executados até o retrato.
+        posicoes (np.ndarray): Array `(n, 2)` com as posições (linha, coluna).
+        vivos (np.ndarray): Array booleano `(n,)`, `True` para os Mekos com saúde não negativa.
+        nomes (tuple[str]): Os nomes, na mesma ordem das posições.
+    """
+    __slots__ = ("tick", "posicoes", "vivos", "nomes")
+
+    def __init__(self, tick, posicoes, vivos, nomes):
+        posicoes.setflags(write=False)
+        vivos.setflags(write=False)
+        self.tick = tick
+        self.posicoes = posicoes
+        self.vivos = vivos
+        self.nomes = tuple(nomes)
+
+    def __len__(self):
+        return len(self.nomes)
+
+    def __repr__(self):
+        return f"Retrato(tick={self.tick}, n={len(self)})"
+
+    @classmethod
+    def do_ambiente(cls, ambiente, tick=0):
+        """
+        Copia o estado atual dos Mekos de `ambiente`.
+
+        Com uma `Populacao`, posições e saúde são copiadas direto dos arrays. A vida é decidida pela saúde, sem chamar
+        `Meko.esta_vivo`, que aplica os efeitos de fome e idade.
+        """
+        populacao = ambiente.populacao
+        if populacao is not None:
+            n = populacao.n
+            posicoes = populacao.posicao[:n].copy()
+            vivos = populacao.arrays["saude"][:n] >= 0
+            nomes = [meko.nome for meko in populacao.mekos]
+        else:
+            mekos = list(ambiente.mekos)
+            n = len(mekos)
+            posicoes = np.array([meko.posicao for meko in mekos], dtype=int).reshape(n, 2)
+            vivos = np.fromiter((meko.saude >= 0 for meko in mekos), dtype=bool, count=n)
+            nomes = [meko.nome for meko in mekos]
+        return cls(tick, posicoes, vivos, nomes)
+
+class Simulador:
+    """
+    Avança um ambiente por `ticks` ticks, separado da visualização.
+
+    Attributes:
+        ambiente (Ambiente): O ambiente simulado. Enquanto a thread de fundo roda, só ela o modifica; use `pausar`
+            antes de ler os Mekos diretamente (ex: na janela de monitoramento).
+        ticks (int): A quantidade total de ticks.
+        tick (int): A quantidade de ticks já executados.
+        ticks_por_quadro (int): Ticks executados por quadro quando não há thread de fundo.
+        quadros_por_segundo (float): Quantidade máxima de retratos publicados por segundo pela thread de fundo.
+        ticks_por_segundo (float): Limite de ticks por segundo da thread de fundo. `None` para não limitar.
+        erro (Exception): A exceção que interrompeu a thread de fundo, se houver.
+
+    Methods:
+        `avancar`: Executa ticks na thread atual e retorna o retrato.
+        `retrato`: Retorna o retrato publicado mais recente.
+        `iniciar`: Inicia a thread de fundo.
+        `pausar`: Pausa a thread de fundo depois do tick em andamento.
+        `continuar`: Retoma a thread de fundo.
+        `parar`: Encerra a thread de fundo e espera por ela.
+        `quadros`: Gera os retratos a desenhar, um por quadro, até o fim da simulação.
+    """
+    def __init__(self, ambiente, ticks, ticks_por_quadro=1, quadros_por_segundo=settings.QUADROS_POR_SEGUNDO,
+                 ticks_por_segundo=settings.TICKS_POR_SEGUNDO):
+        self.ambiente = ambiente
+        self.ticks = ticks
+        self.tick = 0
+        self.ticks_por_quadro = max(1, ticks_por_quadro)
+        self.quadros_por_segundo = quadros_por_segundo
+        self.ticks_por_segundo = ticks_por_segundo
+        self.erro = None
+
+        self._retrato = Retrato.do_ambiente(ambiente, 0)
+        # Mantida durante cada tick, para que `pausar` espere o tick em andamento terminar
+        self._trava = threading.Lock()
+        self._rodando = threading.Event()
+        self._rodando.set()
+        self._parar = threading.Event()
+        self._thread = None
+
+    @property
+    def terminou(self):
+        return self.tick >= self.ticks or self.erro is not None
+
+    @property
+    def em_segundo_plano(self):
+        return self._thread is not None
+
+    def _executar_tick(self):
+        """
+        Executa um tick com a trava mantida. Na thread de fundo, o tick é descartado se `pausar` ou `parar` foi chamado
+        depois da última verificação, para que nenhum tick comece depois que `pausar` retornou.
+
+        Returns:
+            bool: Se o tick foi executado.
+        """
+        with self._trava:
+            if self.em_segundo_plano and (not self._rodando.is_set() or self._parar.is_set()):
+                return False
+            self.ambiente.tick(self.tick)
+            self.tick += 1
+        return True
+
+    def _publicar(self):
+        # A troca de referência é atômica: quem lê `_retrato` vê o retrato antigo ou o novo, nunca um parcial
+        self._retrato = Retrato.do_ambiente(self.ambiente, self.tick)
+
+    def retrato(self):
+        return self._retrato
+
+    def avancar(self, n=None):
+        """
+        Executa até `n` ticks (por padrão, `ticks_por_quadro`) na thread atual e publica o retrato.
+
+        Returns:
+            Retrato: O retrato depois dos ticks.
+        """
+        if self.em_segundo_plano:
+            raise RuntimeError("A simulação já está rodando em segundo plano.")
+
+        for _ in range(min(n or self.ticks_por_quadro, self.ticks - self.tick)):
+            self._executar_tick()
+        self._publicar()
+        return self._retrato
+
+    def iniciar(self):
+        """
+        Inicia a thread de fundo, que executa os ticks restantes o mais rápido possível (ou até `ticks_por_segundo`).
+        """
+        if self._thread is not None:
+            return
+        self._thread = threading.Thread(target=self._executar, name="Simulador", daemon=True)
+        self._thread.start()
+
+    def _executar(self):
+        intervalo_quadro = 1 / self.quadros_por_segundo if self.quadros_por_segundo else 0
+        intervalo_tick = 1 / self.ticks_por_segundo if self.ticks_por_segundo else 0
+        ultima_publicacao = proximo_tick = time.perf_counter()
+
+        try:
+            while not self.terminou and not self._parar.is_set():
+                if not self._rodando.wait(timeout=0.1):
+                    continue
+
+                if not self._executar_tick():
+                    continue
+                agora = time.perf_counter()
+                if agora - ultima_publicacao >= intervalo_quadro:
+                    self._publicar()
+                    ultima_publicacao = agora
+
+                if intervalo_tick:
+                    proximo_tick = max(proximo_tick + intervalo_tick, agora)
+                    self._parar.wait(max(0, proximo_tick - time.perf_counter()))
+        except Exception as e:
+            self.erro = e
+        finally:
+            self._publicar()
+
+    def pausar(self):
+        """
+        Pausa a thread de fundo e espera o tick em andamento terminar, para que o ambiente possa ser lido com segurança.
+        """
+        self._rodando.clear()
+        with self._trava:
+            pass
+
+    def continuar(self):
+        self._rodando.set()
+
+    def parar(self):
+        """
+        Encerra a thread de fundo, sem executar os ticks restantes, e espera por ela.
+        """
+        self._parar.set()
+        self._rodando.set()
+        if self._thread is not None:
+            self._thread.join()
+
+    def quadros(self):
+        """
+        Gera um retrato por quadro até o fim da simulação.
+
+        Com a thread de fundo, cada quadro é o retrato publicado mais recente. Sem ela, cada quadro executa
+        `ticks_por_quadro` ticks. O último retrato gerado é sempre o do fim da simulação.
+
+        Raises:
+            Exception: A exceção que interrompeu a thread de fundo, se houver.
+        """
+        if self.em_segundo_plano:
+            while self._thread.is_alive():
+                yield self._retrato
+            self._thread.join()
+            if self.erro is not None:
+                raise self.erro
+            yield self._retrato
+        else:
+            yield self._retrato
+            while not self.terminou:
+                yield self.avancar()
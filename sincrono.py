@@ -0,0 +1,148 @@
+"""
+Resolução de conflitos do modo síncrono do ambiente.
+
+No modo síncrono (`Ambiente(..., sincrono=True)`), cada tick é dividido em fases:
+
+1. Congelamento: a `Populacao` copia o estado do início do tick (posições, saúde, energia, fertilidade...) para um
+   retrato. Durante o tick, cada Meko lê o próprio estado atual, mas o dos outros Mekos sempre no retrato, e o índice
+   espacial continua com as posições do início do tick. Assim, o que um Meko percebe não depende de quais Mekos já
+   agiram antes dele.
+2. Ações: cada Meko executa a sua FSM. Escritas no próprio estado vão para o buffer do próximo tick; danos em outros
+   Mekos se somam; os ataques elementais são guardados por `Habilidade.atacar`, e os efeitos sobre outras entidades
+   (engajar um alvo, comer, acasalar, nascer um filhote) por `Ambiente.aplicar_efeito`.
+3. Resolução (`Resolucao.resolver`): o índice recebe as novas posições, o dano de todos os ataques elementais do tick
+   é calculado em uma única chamada de `habilidades.danos_dos_combates`, as mortes em combate são atribuídas e os
+   efeitos guardados são aplicados em uma ordem de prioridade sorteada a cada tick, respeitando as chaves exclusivas
+   (ex: um alvo engajado por um único Meko, um acasalamento por Meko) e a quantidade de cada alimento.
+"""
+import numpy as np
+
+from eventos import registrar, COMBATE_DERROTA
+from habilidades import danos_dos_combates
+
+class Resolucao:
+    """
+    Efeitos adiados de um tick síncrono e a fase que os resolve.
+
+    Attributes:
+        ambiente (Ambiente): O ambiente do tick.
+        efeitos (list[tuple[Meko, Callable, tuple]]): Os efeitos `(ator, efeito, exclusivos)` na ordem em que foram pedidos.
+        ataques (list[tuple[Meko, Meko, Habilidade, float]]): Os ataques elementais `(atacante, alvo, habilidade,
+            multiplicador)` do tick, na ordem em que foram feitos.
+
+    Methods:
+        `adicionar`: Guarda um efeito para a resolução.
+        `adicionar_ataque`: Guarda um ataque elemental para a resolução.
+        `resolver`: Encerra o tick síncrono, aplicando posições, mortes em combate e efeitos.
+    """
+    def __init__(self, ambiente):
+        self.ambiente = ambiente
+        self.efeitos = []
+        self.ataques = []
+
+    def __len__(self):
+        return len(self.efeitos)
+
+    def adicionar(self, ator, efeito, exclusivos=()):
+        """
+        Guarda um efeito de `ator`.
+
+        Args:
+            ator (Meko): O Meko que pediu o efeito.
+            efeito (Callable): Função sem argumentos que aplica o efeito. Se retornar `False`, o efeito não aconteceu e
+                as suas chaves exclusivas continuam livres.
+            exclusivos (tuple): Chaves de que o efeito precisa com exclusividade. Um efeito com uma chave já usada por
+                outro efeito do mesmo tick é descartado.
+        """
+        self.efeitos.append((ator, efeito, exclusivos))
+
+    def adicionar_ataque(self, atacante, alvo, habilidade, multiplicador=1):
+        """
+        Guarda um ataque elemental de `atacante` em `alvo`, cujo dano é calculado na resolução (ver `Habilidade.atacar`).
+        """
+        self.ataques.append((atacante, alvo, habilidade, multiplicador))
+
+    def resolver(self):
+        """
+        Descongela a população, atualiza o índice espacial, aplica os ataques elementais, resolve as mortes em combate e
+        aplica os efeitos guardados.
+
+        Returns:
+            list[Meko]: Os Mekos mortos em combate durante o tick, que devem ser removidos do ambiente.
+        """
+        ambiente = self.ambiente
+        populacao = ambiente.populacao
+        congelado, danos = populacao.descongelar()
+        n = len(congelado["saude"])
+
+        # Prioridade de cada slot neste tick (menor primeiro), sorteada para não favorecer a ordem da lista
+        prioridade = ambiente.mundo.aleatorio.rng.permutation(n)
+
+        if ambiente.indice is not None:
+            movidos = np.flatnonzero((populacao.posicao[:n] != congelado["posicao"]).any(axis=1))
+            for slot in movidos.tolist():
+                ambiente.indice.mover(populacao.mekos[slot])
+
+        self._resolver_ataques(danos)
+        mortos = self._resolver_combates(congelado, danos, prioridade)
+
+        usados = set()
+        for ator, efeito, exclusivos in sorted(self.efeitos, key=lambda item: prioridade[item[0]._slot]):
+            if ator.saude < 0 or usados.intersection(exclusivos):
+                continue
+            if efeito() is not False:
+                usados.update(exclusivos)
+
+        self.efeitos = []
+        return mortos
+
+    def _resolver_ataques(self, danos):
+        """
+        Calcula o dano de todos os ataques elementais do tick de uma vez e os aplica, na ordem em que foram feitos. Os
+        danos entram em `danos`, usados para atribuir as mortes em combate.
+        """
+        if not self.ataques:
+            return
+
+        atacantes, alvos, habilidades, multiplicadores = zip(*self.ataques)
+        valores = danos_dos_combates(atacantes, alvos, habilidades) * np.asarray(multiplicadores, dtype=float)
+        for atacante, alvo, habilidade, dano_total in zip(atacantes, alvos, habilidades, valores.tolist()):
+            habilidade.concluir(atacante, alvo, dano_total)
+            danos.append((atacante._slot, alvo._slot, dano_total))
+        self.ataques = []
+
+    def _resolver_combates(self, congelado, danos, prioridade):
+        """
+        Encontra os Mekos mortos por outros durante o tick e atribui cada morte ao Meko que causou mais dano à vítima
+        (empates pela prioridade do tick).
+        """
+        ambiente = self.ambiente
+        populacao = ambiente.populacao
+        n = len(congelado["saude"])
+
+        novos_mortos = np.flatnonzero((populacao.arrays["saude"][:n] < 0) & (congelado["saude"] >= 0))
+        if not len(novos_mortos):
+            return []
+
+        dano_por_par = {}
+        for ator, alvo, dano in danos:
+            dano_por_par[(alvo, ator)] = dano_por_par.get((alvo, ator), 0) + dano
+
+        mortos = []
+        for slot in novos_mortos.tolist():
+            vitima = populacao.mekos[slot]
+            # Mekos que já morreram de fome ou idade neste tick não morrem de novo
+            if vitima not in ambiente.mundo.mekos:
+                continue
+
+            # Sem atacantes, o Meko é removido no próximo tick, como no modo sequencial
+            atacantes = [(dano, -prioridade[ator], ator) for (alvo, ator), dano in dano_por_par.items() if alvo == slot]
+            if not atacantes:
+                continue
+            mortos.append(vitima)
+            vencedor = populacao.mekos[max(atacantes)[2]]
+            registrar(vencedor, COMBATE_DERROTA, vitima.nome, vencedor.nome)
+            ambiente.morte_meko(vitima, 'Combate')
+            vencedor.abates += 1
+
+        return mortos
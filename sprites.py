@@ -0,0 +1,163 @@
+"""
+Sprites dos Mekos: atlas de camadas em memória e cache de sprites compostos.
+
+Todas as camadas de `settings.LOC_CARACTERISTICAS` são decodificadas uma única vez para um `Atlas` em memória, na
+primeira vez que um sprite é pedido. O atlas também pode ser salvo em um único arquivo `.npz` (`Atlas.salvar`), que é
+carregado no lugar dos PNGs quando existe em `CAMINHO_ATLAS_SPRITES`. Os sprites compostos ficam em um cache LRU por
+genoma, então abrir a visão geral de centenas de Mekos não decodifica nenhum PNG depois do primeiro acesso.
+
+Uso:
+    python -m sprites    # gera o arquivo do atlas em CAMINHO_ATLAS_SPRITES
+"""
+import os
+from functools import lru_cache
+
+import numpy as np
+from PIL import Image
+
+from settings import LOC_CARACTERISTICAS, CAMINHO_ATLAS_SPRITES
+
+# Categorias na ordem do genoma
+CATEGORIAS = ["Tipo", "Alimentacao", "Tamanho", "Olhos", "Presas", "Patas", "Garras", "Cauda", "Defesa", "Extra"]
+
+# Quantidade de sprites compostos guardados no cache
+TAMANHO_CACHE_SPRITES = 1024
+
+# Entrada do arquivo do atlas com as camadas que faltavam ao salvá-lo
+CHAVE_FALTANDO = "_faltando"
+
+class Atlas:
+    """
+    Camadas de sprite decodificadas em RGBA, indexadas por `(categoria, chave)` como em `LOC_CARACTERISTICAS`.
+
+    Attributes:
+        camadas (dict[tuple[str, str], Image.Image]): As camadas carregadas.
+        faltando (dict[tuple[str, str], str]): As camadas cujo arquivo não pôde ser lido, com o caminho esperado.
+
+    Methods:
+        `carregar`: Decodifica os PNGs de `LOC_CARACTERISTICAS`.
+        `de_arquivo`: Carrega um atlas salvo por `salvar`.
+        `salvar`: Salva todas as camadas em um único arquivo `.npz`.
+        `compor`: Monta o sprite de um genoma.
+    """
+    def __init__(self, camadas=None, faltando=None):
+        self.camadas = camadas if camadas is not None else {}
+        self.faltando = faltando if faltando is not None else {}
+
+    def __len__(self):
+        return len(self.camadas)
+
+    @classmethod
+    def carregar(cls, locais=LOC_CARACTERISTICAS):
+        """
+        Decodifica todas as camadas de `locais` (por padrão, `LOC_CARACTERISTICAS`).
+        """
+        atlas = cls()
+        for categoria, caminhos in locais.items():
+            for chave, caminho in caminhos.items():
+                try:
+                    atlas.camadas[(categoria, chave)] = Image.open(caminho).convert("RGBA")
+                except (FileNotFoundError, OSError):
+                    atlas.faltando[(categoria, chave)] = caminho
+        return atlas
+
+    @classmethod
+    def de_arquivo(cls, caminho):
+        """
+        Carrega um atlas salvo por `salvar`. As chaves do arquivo têm a forma `categoria/chave`.
+        """
+        atlas = cls()
+        with np.load(caminho) as dados:
+            for nome in dados.files:
+                if nome == CHAVE_FALTANDO:
+                    for linha in dados[nome].tolist():
+                        chave, caminho_camada = linha.split("|", 1)
+                        atlas.faltando[tuple(chave.split("/", 1))] = caminho_camada
+                    continue
+                categoria, chave = nome.split("/", 1)
+                atlas.camadas[(categoria, chave)] = Image.fromarray(dados[nome], "RGBA")
+        return atlas
+
+    def salvar(self, caminho):
+        """
+        Salva todas as camadas em um único arquivo `.npz`, sem compressão, para um carregamento rápido.
+        """
+        arrays = {f"{categoria}/{chave}": np.asarray(camada) for (categoria, chave), camada in self.camadas.items()}
+        arrays[CHAVE_FALTANDO] = np.array(
+            [f"{categoria}/{chave}|{caminho_camada}" for (categoria, chave), caminho_camada in self.faltando.items()],
+            dtype=str
+        )
+        np.savez(caminho, **arrays)
+
+    def compor(self, genoma):
+        """
+        Monta o sprite de um genoma com as mesmas regras e a mesma ordem de camadas do `sprite_por_genoma` original.
+
+        Returns:
+            Image.Image: O sprite composto, ou `None` se alguma camada necessária não pôde ser carregada.
+        """
+        base = self.camadas.get(("Tipo", genoma[0]))
+        if base is None:
+            return None
+
+        sprite_final = Image.new("RGBA", base.size, (255, 255, 255, 0))
+        sprite_final.paste(base, (0, 0), base)
+
+        for i, categoria in enumerate(CATEGORIAS):
+            if categoria == "Tamanho":
+                continue
+            elif categoria == "Garras":
+                chave = f"{genoma[5]}_{genoma[i]}"
+            else:
+                chave = genoma[i]
+
+            if (categoria, chave) in self.faltando:
+                print(f"Falha ao criar sprite: Arquivo não encontrado no caminho: {self.faltando[(categoria, chave)]}.\n Função cancelada.")
+                return None
+
+            camada = self.camadas.get((categoria, chave))
+            if camada is None:
+                continue
+            sprite_final.paste(camada, (0, 0), camada)
+
+        return sprite_final
+
+_atlas = None
+
+def atlas():
+    """
+    Retorna o atlas do processo, carregando-o no primeiro uso: do arquivo em `CAMINHO_ATLAS_SPRITES`, se existir,
+    ou dos PNGs de `LOC_CARACTERISTICAS`.
+    """
+    global _atlas
+    if _atlas is None:
+        if os.path.exists(CAMINHO_ATLAS_SPRITES):
+            _atlas = Atlas.de_arquivo(CAMINHO_ATLAS_SPRITES)
+        else:
+            _atlas = Atlas.carregar()
+    return _atlas
+
+@lru_cache(maxsize=TAMANHO_CACHE_SPRITES)
+def _sprite_em_cache(genoma):
+    return atlas().compor(genoma)
+
+def sprite_por_genoma(genoma):
+    """
+    Gera uma imagem composta de um Meko a partir do genoma.
+    Retorna None se nenhuma camada puder ser carregada.
+
+    O sprite vem de um cache LRU por genoma e é compartilhado: use `resize`, `copy` etc. em vez de modificá-lo.
+    """
+    return _sprite_em_cache(tuple(genoma))
+
+def limpar_cache():
+    """
+    Descarta o atlas e os sprites compostos, para que sejam recarregados no próximo uso.
+    """
+    global _atlas
+    _atlas = None
+    _sprite_em_cache.cache_clear()
+
+if __name__ == "__main__":
+    Atlas.carregar().salvar(CAMINHO_ATLAS_SPRITES)
+    print(f"Atlas salvo em: {CAMINHO_ATLAS_SPRITES}")
@@ -0,0 +1,43 @@
+"""
+Testes do dano em lote das habilidades elementais (`habilidades.danos_dos_combates`).
+"""
+import random
+
+import pytest
+
+import settings
+from habilidades import HABILIDADES, TIPOS, danos_dos_combates
+from meko import Meko
+
+ELEMENTAIS = [habilidade for habilidade in HABILIDADES.values() if habilidade.ataque is not None]
+
+class SemCritico(random.Random):
+    def random(self):
+        return 0.0
+
+def criar_meko(gerador, tipo):
+    genoma = [gerador.choice(valores) for _, valores in settings.CARACTERISTICAS]
+    genoma[0] = tipo
+    return Meko("Teste", genoma)
+
+def test_todas_as_elementais_sao_testadas():
+    nomes = {habilidade.nome for habilidade in ELEMENTAIS}
+    assert nomes == {"Lançar Brasas", "Jato D'agua", "Enterrar", "Sanguessuga", "Garra Noturna", "Eletrocutar"}
+
+@pytest.mark.parametrize("habilidade", ELEMENTAIS, ids=lambda habilidade: habilidade.nome)
+def test_danos_em_lote_iguais_ao_execute(habilidade, monkeypatch):
+    monkeypatch.setattr(Meko, "random", property(lambda meko: SemCritico()))
+    gerador = random.Random(0)
+
+    atacantes, alvos, esperados = [], [], []
+    for tipo in TIPOS:
+        for _ in range(5):
+            atacante, alvo = criar_meko(gerador, gerador.choice(TIPOS)), criar_meko(gerador, tipo)
+            saude = alvo.saude
+            habilidade.execute(atacante, alvo)
+            esperados.append(saude - alvo.saude)
+            atacantes.append(atacante)
+            alvos.append(alvo)
+
+    danos = danos_dos_combates(atacantes, alvos, [habilidade] * len(alvos))
+    assert danos.tolist() == esperados
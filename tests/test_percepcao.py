@@ -0,0 +1,74 @@
+"""
+Testes da fase de percepção em lote (`percepcao.Percepcao`), comparada com a busca individual (`Meko.search_indice`).
+"""
+import numpy as np
+import pytest
+
+from ambiente import Carne
+from benchmarks.bench_busca import preparar
+from percepcao import Percepcao
+from utils import distancia
+
+TIPOS = ["Meko", "Carne", "Fruta"]
+
+def preparar_percepcao(seed):
+    ambiente = preparar(300, indice_espacial=True, seed=seed)
+    for tick in range(20):
+        ambiente.tick(tick)
+
+    # Carnes e parceiros férteis para as buscas de "Carne" e de parceiro
+    for i, meko in enumerate(list(ambiente.mekos)):
+        if i % 10 == 0:
+            ambiente.morte_meko(meko)
+            ambiente.adicionar_carne(Carne(meko.posicao, ambiente))
+        elif i % 3 == 0 and meko.love is None:
+            meko.fertilidade = "Fertil"
+
+    percepcao = Percepcao(ambiente)
+    percepcao.iniciar()
+    # Todos os Mekos entram no lote de todos os tipos, não só os que buscam o tipo no estado atual
+    todos = np.arange(len(percepcao.mekos), dtype=np.intp)
+    percepcao.consultas = {tipo: todos for tipo in TIPOS}
+    return ambiente, percepcao
+
+def mesma_busca(meko, obtido, esperado):
+    if esperado is None:
+        return obtido is None
+    return obtido is not None and distancia(meko, obtido) == distancia(meko, esperado)
+
+@pytest.mark.parametrize("seed", [0, 1])
+@pytest.mark.parametrize("tipo, breed", [("Meko", False), ("Meko", True), ("Carne", False), ("Fruta", False)])
+def test_buscas_iguais_a_search_indice(seed, tipo, breed):
+    ambiente, percepcao = preparar_percepcao(seed)
+    encontrados = 0
+    for meko in ambiente.mekos:
+        esperado = meko.search_indice(tipo, breed)
+        obtido = percepcao.buscar(meko, tipo, breed)
+        assert mesma_busca(meko, obtido, esperado), meko.nome
+        encontrados += esperado is not None
+    assert encontrados > 0
+
+def test_candidatos_descartados_usam_a_busca_individual():
+    ambiente, percepcao = preparar_percepcao(0)
+    # O lote é calculado na primeira busca do tick, antes de os candidatos deixarem o mundo
+    percepcao.buscar(percepcao.mekos[0], "Meko")
+    objetos, lotes, indices = percepcao._buscas[("Meko", False)]
+
+    # Um Meko com todos os candidatos preenchidos e ao menos mais um Meko no alcance depois de removê-los
+    for meko in percepcao.mekos:
+        candidatos = [objetos[i] for i in indices[lotes[percepcao._linhas[meko]]].tolist() if i >= 0]
+        restantes = [
+            outro for outro in ambiente.mekos
+            if outro not in (meko, meko.target) and outro not in candidatos and distancia(meko, outro) <= meko.visao
+        ]
+        if len(candidatos) == indices.shape[1] and restantes:
+            break
+    else:
+        pytest.fail("Nenhum Meko com candidatos suficientes")
+
+    for candidato in candidatos:
+        ambiente.morte_meko(candidato)
+
+    obtido = percepcao.buscar(meko, "Meko")
+    assert obtido is not None and obtido not in candidatos
+    assert mesma_busca(meko, obtido, meko.search_indice("Meko"))
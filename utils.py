@@ -1,12 +1,9 @@
 import numpy as np
 import pickle as pick
 import os
-import random
 
-from PIL import Image
-from tkinter import filedialog
-
-from settings import LOC_CARACTERISTICAS, CARACTERISTICAS
+from genoma import LOCI, VALORES, CODIGOS, codificar, alelos_validos, genoma_de_dict
+from aleatorio import random_de
 
 ## Criação de Mekos
 
@@ -14,7 +11,7 @@ class GenomaInvalidoError(Exception):
     """Erro lançado quando o genoma possui alguma característica/gene que é inválido."""
     pass
 
-def validar_genoma(genoma):
+def validar_genoma(genoma, gerador=None):
     """
     Valida um genoma baseado nas características obrigatórias.
     
@@ -30,6 +27,7 @@ def validar_genoma(genoma):
             [7] Cauda - "Nenhuma", "Equilibrio", "Ataque", "Aquatica"
             [8] Defesa - "Nenhuma", "Carapaça", "Escamas", "Pelagem"
             [9] Extra - "Nenhuma", "Camuflagem", "Veneno", "Bioluminescencia", "Campo-eletrico"
+        gerador (random.Random, opcional): Gerador usado para corrigir olhos Compostos. Padrão: `aleatorio.PADRAO`.
 
     Raises:
         TypeError: O genoma deve conter uma ``list`` de ``string`` que represente as características de uma criatura.
@@ -46,91 +44,30 @@ def validar_genoma(genoma):
     if not all(isinstance(g, str) for g in genoma):
         raise TypeError("Todos os elementos do genoma devem ser strings")
     if genoma[3] == "Compostos" and genoma[0] != "Inseto":
-            genoma[3] = random.choice(["Simples","Avancado"])
+            genoma[3] = (gerador or random_de()).choice(["Simples","Avancado"])
     if genoma[5] == "Apode" and genoma[6] != "Nenhuma":
             genoma[6] = "Nenhuma"
 
 
 
-    # Lista de valores válidos para cada índice
-    valores_validos = [
-        {"Fogo", "Agua", "Terra", "Inseto", "Sombra", "Luz"},
-        {"Herbivoro", "Carnivoro", "Onivoro"},
-        {"Pequeno", "Medio", "Grande"},
-        {"Simples", "Avancado", "Compostos"},
-        {"Nenhuma", "Pequena", "Media", "Grande"},
-        {"Apode", "Bipede", "Quadrupede", "Multipede"},
-        {"Nenhuma", "Curta", "Longa", "Retrateis"},
-        {"Nenhuma", "Equilibrio", "Ataque", "Aquatica"},
-        {"Nenhuma", "Carapaca", "Escamas", "Pelagem"},
-        {"Nenhuma","Camuflagem", "Veneno", "Bioluminescencia", "Campo-eletrico"}
-    ]
-
     # Checar tamanho do genoma
-    if len(genoma) != len(valores_validos):
+    if len(genoma) != len(LOCI):
         raise ValueError("Tamanho do genoma fornecido e incompetivel")
 
     # Checar cada característica
     for i, valor in enumerate(genoma):
         # Característica não listada:
-        if valor not in valores_validos[i]:
-            raise GenomaInvalidoError(f"Posicao {i} contem valor invalido, '{valor}' (Valores validos: {valores_validos[i]}).")
-    
-    # Olhos Compostos:
-    if genoma[3] == "Compostos" and genoma[0] != "Inseto":
-        raise GenomaInvalidoError("Olhos Compostos só são válidos para Insetos.")
-    
-    # Garras em ápodes:
-    if genoma[5] == "Apode" and genoma[6] != "Nenhuma":
-        raise GenomaInvalidoError("Garras só são válidas para criaturas com patas.")
+        if valor not in CODIGOS[i]:
+            raise GenomaInvalidoError(f"Posicao {i} contem valor invalido, '{valor}' (Valores validos: {set(VALORES[i])}).")
+
+    # Regras entre características, verificadas sobre os alelos codificados:
+    # Olhos Compostos só são válidos para Insetos e garras só para criaturas com patas
+    if not alelos_validos(codificar(genoma)):
+        raise GenomaInvalidoError("Olhos Compostos só são válidos para Insetos e garras só para criaturas com patas.")
 
     return True
 
-def sprite_por_genoma(genoma):
-    """
-    Gera uma imagem composta de um Meko a partir do genoma.
-    Retorna None se nenhuma camada puder ser carregada.
-    """
-    categorias = ["Tipo", "Alimentacao", "Tamanho", "Olhos", "Presas", "Patas", "Garras", "Cauda", "Defesa", "Extra"]
-    
-    try:
-        caminho_base = LOC_CARACTERISTICAS["Tipo"].get(genoma[0])
-        base_sprite = Image.open(caminho_base).convert("RGBA")
-        
-    except (FileNotFoundError, OSError, KeyError):
-        return None
-
-    sprite_final = Image.new("RGBA", base_sprite.size, (255, 255, 255, 0))
-    
-    sprite_final.paste(base_sprite, (0, 0), base_sprite)
-
-    for i, cat in enumerate(categorias):
-            
-        caracteristica = genoma[i]
-        
-        if cat == "Tamanho":
-            continue
-        elif cat == "Garras":
-            tipo_patas = genoma[5]
-            chave_sprite = f"{tipo_patas}_{caracteristica}"
-            caminho = LOC_CARACTERISTICAS[cat].get(chave_sprite)
-        else:
-            caminho = LOC_CARACTERISTICAS[cat].get(caracteristica)
-            
-        if caminho == None:
-            continue
-            
-        try:
-            camada = Image.open(caminho).convert("RGBA")
-        except (FileNotFoundError, OSError):
-            print(f"Falha ao criar sprite: Arquivo não encontrado no caminho: {caminho}.\n Função cancelada.")
-            return None
-        
-        sprite_final.paste(camada, (0, 0), camada) 
-        
-    return sprite_final
-
-def gerar_nome():
+def gerar_nome(gerador=None):
     lista = [
     # Sílabas Iniciais/Gerais Comuns (CVC, CV)
     "al", "an", "ar", "bal", "bar", "bel", "dor", "dra", "dun", 
@@ -155,7 +92,8 @@ def gerar_nome():
     "kor", "lok", "nok", "rex", "tus", "tur", "lor", "nis", "nis"
     ]
     
-    nome = "".join(random.choice(lista) for _ in range(random.randint(2,4))).capitalize()
+    gerador = gerador or random_de()
+    nome = "".join(gerador.choice(lista) for _ in range(gerador.randint(2,4))).capitalize()
     
     return nome
 
@@ -233,7 +171,50 @@ def perlin(x, y, perm):
     x2 = lerp(grad(ab, xf, yf - 1), grad(bb, xf - 1, yf - 1), u)
     return (lerp(x1, x2, v) + 1) / 2  # Normaliza para [0,1]
 
-def generate_perlin_noise_2d(shape, scale=10, seed=0):
+_fade_escalar = np.vectorize(fade, otypes=[float])
+_SINAL_GRAD_X = np.array([1.0, -1.0, -1.0, -1.0])
+_SINAL_GRAD_Y = np.array([1.0, 1.0, 1.0, -1.0])
+
+def grad_vetorizado(hash, x, y):
+    """
+    Versão vetorizada de ``grad``: recebe arrays de ``hash``, ``x`` e ``y`` e calcula todos os gradientes de uma vez.
+
+    As quatro direções de ``grad`` equivalem a ``x + y``, ``y - x``, ``y - x`` e ``-x - y``, então basta consultar
+    o sinal de ``x`` e de ``y`` em duas pequenas tabelas.
+    """
+    h = hash & 3
+    return _SINAL_GRAD_X[h] * x + _SINAL_GRAD_Y[h] * y
+
+def perlin_vetorizado(x, y, perm):
+    """
+    Versão vetorizada de ``perlin``.
+
+    ``x`` e ``y`` são arrays combinados por broadcasting, normalmente uma coluna com as coordenadas das linhas e uma linha
+    com as coordenadas das colunas. Para cada ponto, o cálculo é idêntico ao de ``perlin``, mas feito com operações de
+    array sobre a grade inteira.
+
+    O ``fade`` é aplicado valor a valor com floats do Python, pois a potência do NumPy pode diferir no último bit da
+    potência do Python. Como ``x`` e ``y`` são vetores, isso custa apenas ``altura + largura`` chamadas.
+    """
+    xi = x.astype(int)
+    yi = y.astype(int)
+    xf = x - xi
+    yf = y - yi
+    xi = xi & 255
+    yi = yi & 255
+    u = _fade_escalar(xf)
+    v = _fade_escalar(yf)
+
+    aa = perm[perm[xi] + yi]
+    ab = perm[perm[xi] + yi + 1]
+    ba = perm[perm[xi + 1] + yi]
+    bb = perm[perm[xi + 1] + yi + 1]
+
+    x1 = lerp(grad_vetorizado(aa, xf, yf), grad_vetorizado(ba, xf - 1, yf), u)
+    x2 = lerp(grad_vetorizado(ab, xf, yf - 1), grad_vetorizado(bb, xf - 1, yf - 1), u)
+    return (lerp(x1, x2, v) + 1) / 2  # Normaliza para [0,1]
+
+def generate_perlin_noise_2d(shape, scale=10, seed=0, octaves=1, persistence=0.5, lacunarity=2.0):
     """
     Gera uma matriz ``shape=(altura, largura)`` com valores de ruído.
 
@@ -241,22 +222,36 @@ def generate_perlin_noise_2d(shape, scale=10, seed=0):
 
     Normaliza coordenadas ``(i, j)`` pela escala → controla a "frequência" do ruído.
 
-    Para cada ponto da matriz, chama ``perlin(x, y, perm)`` e guarda o valor.
+    Calcula ``perlin_vetorizado`` sobre blocos de linhas da matriz, o que dá os mesmos valores de ``perlin(x, y, perm)``
+    ponto a ponto sem o laço em Python e com uso de memória limitado.
+
+    Com ``octaves > 1``, soma camadas de ruído (ruído fractal): cada oitava multiplica a frequência por ``lacunarity``
+    e a amplitude por ``persistence``. O resultado é dividido pela soma das amplitudes e continua entre ``0`` e ``1``.
 
     Retorna a matriz com valores suaves entre ``0`` e ``1``.
     """
 
-    np.random.seed(seed)
-    perm = np.arange(256, dtype=int)
-    np.random.shuffle(perm)
+    # Gerador local: a mesma tabela de `np.random.seed(seed)` + `shuffle`, sem alterar o estado global do NumPy
+    perm = np.random.RandomState(seed).permutation(256)
     perm = np.stack([perm, perm]).flatten()
+
+    xs = np.arange(shape[0]) / scale
+    ys = np.arange(shape[1]) / scale
+    bloco = max(1, (1 << 20) // max(1, shape[1]))
+
     noise = np.zeros(shape)
-    for i in range(shape[0]):
-        for j in range(shape[1]):
-            x = i / scale
-            y = j / scale
-            noise[i][j] = perlin(x, y, perm)
-    return noise
+    amplitude = 1.0
+    frequencia = 1.0
+    soma_amplitudes = 0.0
+    for _ in range(octaves):
+        y = (ys * frequencia)[None, :]
+        for inicio in range(0, shape[0], bloco):
+            x = (xs[inicio:inicio + bloco] * frequencia)[:, None]
+            noise[inicio:inicio + bloco] += amplitude * perlin_vetorizado(x, y, perm)
+        soma_amplitudes += amplitude
+        amplitude *= persistence
+        frequencia *= lacunarity
+    return noise / soma_amplitudes
 
 # Importação e Exportação
 
@@ -268,11 +263,7 @@ def importar_meko(caminho):
     if not isinstance(dados, dict) or "genoma" not in dados or "nome" not in dados:
         raise ValueError("Arquivo inválido ou corrompido. Deve conter 'genoma' e 'nome'.")
     
-    CARACTERISTICAS_NOMES = [c[0] for c in CARACTERISTICAS]
-    genoma_dict = dados["genoma"]
-    genoma = [genoma_dict[chave] for chave in CARACTERISTICAS_NOMES]
-
-    dados["genoma"] = genoma
+    dados["genoma"] = genoma_de_dict(dados["genoma"])
 
     return dados
 
@@ -283,6 +274,8 @@ def exportar_meko(caminho, dados):
 
 def importar_ambiente():
 
+    from tkinter import filedialog
+
     caminho = filedialog.askopenfilename(
         title="Selecione um ambiente",
         filetypes=[("Arquivos NumPy", "*.npy"), ("Todos os arquivos", "*.*")],
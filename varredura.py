@@ -0,0 +1,273 @@
+"""
+Varredura de parâmetros e execuções de Monte Carlo em vários processos.
+
+Cada combinação de parâmetros (tamanho do ambiente, quantidade de biomas, escala, pesos dos biomas, população e ticks)
+é simulada `repeticoes` vezes com `simulacao.executar`, em processos separados. Cada tarefa recebe uma semente própria,
+derivada da semente base e dos seus parâmetros, então o resultado de uma tarefa não depende da ordem nem do processo em
+que ela roda. Parâmetros omitidos são sorteados por tarefa, como na Simulação Aleatória.
+
+Os resultados são gravados em JSON Lines conforme as tarefas terminam. Se a varredura for interrompida, rodar o mesmo
+comando novamente executa apenas as tarefas que faltam.
+
+Uso:
+    python -m varredura --size 50 100 --mekos 20 50 --repeticoes 10 --ticks 300
+    python -m varredura --biomas 2 3 4 --scale 10 20 --repeticoes 5 --processos 4 --saida logs/biomas.jsonl
+"""
+import argparse
+import itertools
+import json
+import os
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+
+from eventos import NIVEL_DESLIGADO
+from logger import ler_jsonl
+from settings import GRID_SIZE, SIMULATION_STEPS
+from simulacao import executar
+
+# Parâmetros aceitos na grade, na ordem usada para montar as combinações
+PARAMETROS = ("size", "n_mekos", "ticks", "n_biomas", "scale", "pesos_biomas")
+
+# Estatísticas de cada execução que entram no resumo
+ESTATISTICAS = (
+    "populacao_final",
+    "total_nascimentos",
+    "total_mortes_combate",
+    "total_mortes_fome",
+    "total_mortes_idade",
+    "fitness_medio",
+    "tempo_simulacao",
+)
+
+def gerar_tarefas(grade, repeticoes=1, seed=0):
+    """
+    Monta a lista de tarefas de uma varredura.
+
+    Args:
+        grade (dict[str, list]): Para cada parâmetro de `PARAMETROS`, a lista de valores a testar.
+        repeticoes (int): Quantas vezes cada combinação é simulada, com sementes diferentes.
+        seed (int): Semente base da varredura.
+
+    Returns:
+        list[dict]: As tarefas, cada uma com `id`, `seed`, `repeticao` e `parametros`.
+    """
+    desconhecidos = set(grade) - set(PARAMETROS)
+    if desconhecidos:
+        raise ValueError(f"Parâmetros desconhecidos na grade: {sorted(desconhecidos)}")
+
+    nomes = [nome for nome in PARAMETROS if nome in grade]
+    tarefas = []
+    for valores in itertools.product(*(grade[nome] for nome in nomes)):
+        parametros = dict(zip(nomes, valores))
+
+        # Pesos de biomas só combinam com a mesma quantidade de biomas
+        pesos = parametros.get("pesos_biomas")
+        if pesos is not None and parametros.get("n_biomas") not in (None, len(pesos)):
+            continue
+
+        for repeticao in range(repeticoes):
+            chave = json.dumps({"parametros": parametros, "repeticao": repeticao, "seed": seed}, sort_keys=True)
+            semente = np.random.SeedSequence([seed, zlib.crc32(chave.encode())]).generate_state(1)[0]
+            tarefas.append({
+                "id": chave,
+                "seed": int(semente),
+                "repeticao": repeticao,
+                "parametros": parametros,
+            })
+    return tarefas
+
+def executar_tarefa(tarefa):
+    """
+    Executa a simulação de uma tarefa e retorna as estatísticas finais.
+
+    Usa o logger de telemetria sem exportar arquivos e sem eventos de texto, já que só os totais são aproveitados.
+    """
+    parametros = tarefa["parametros"]
+    ambiente, sim_logger = executar(
+        seed=tarefa["seed"],
+        prefixo="varredura",
+        exportar=False,
+        telemetria=True,
+        nivel_eventos=NIVEL_DESLIGADO,
+        **parametros
+    )
+
+    final = sim_logger.log_geral_final_[-1]
+    return {
+        "id": tarefa["id"],
+        "seed": tarefa["seed"],
+        "repeticao": tarefa["repeticao"],
+        "parametros": parametros,
+        "populacao_inicial": parametros.get("n_mekos", 10),
+        "populacao_final": final["populacao_final"],
+        "total_nascimentos": final["total_nascimentos"],
+        "total_mortes_combate": final["total_mortes_combate"],
+        "total_mortes_fome": final["total_mortes_fome"],
+        "total_mortes_idade": final["total_mortes_idade"],
+        "fitness_medio": sim_logger.resumo_ticks()[2],
+        "tempo_simulacao": final["tempo_simulacao"],
+    }
+
+def carregar_resultados(caminho):
+    """
+    Lê os resultados já gravados de uma varredura e descarta uma última linha incompleta, se houver.
+
+    Returns:
+        list[dict]: Os resultados válidos do arquivo, ou uma lista vazia se ele não existir.
+    """
+    if not os.path.exists(caminho):
+        return []
+
+    resultados = ler_jsonl(caminho)
+    # Regrava o arquivo para que novos resultados não sejam emendados em uma linha cortada
+    with open(caminho, "w") as f:
+        for resultado in resultados:
+            f.write(json.dumps(resultado) + "\n")
+    return resultados
+
+def executar_varredura(tarefas, saida, processos=None, retomar=True):
+    """
+    Executa as tarefas em paralelo, gravando cada resultado em `saida` assim que a tarefa termina.
+
+    Args:
+        tarefas (list[dict]): As tarefas geradas por `gerar_tarefas`.
+        saida (str): Arquivo JSON Lines com os resultados.
+        processos (int, opcional): Quantidade de processos. Padrão: número de CPUs. Com 1, roda no processo atual.
+        retomar (bool): Se os resultados já gravados em `saida` devem ser reaproveitados.
+
+    Returns:
+        list[dict]: Os resultados das tarefas, na ordem de `tarefas`.
+    """
+    os.makedirs(os.path.dirname(saida) or ".", exist_ok=True)
+    if retomar:
+        anteriores = carregar_resultados(saida)
+    else:
+        anteriores = []
+        open(saida, "w").close()
+
+    resultados = {resultado["id"]: resultado for resultado in anteriores}
+    pendentes = [tarefa for tarefa in tarefas if tarefa["id"] not in resultados]
+    total = len(tarefas)
+    print(f"{total - len(pendentes)}/{total} tarefas já concluídas, {len(pendentes)} pendentes.")
+
+    inicio = time.time()
+    with open(saida, "a") as f:
+        def gravar(resultado):
+            f.write(json.dumps(resultado) + "\n")
+            f.flush()
+            resultados[resultado["id"]] = resultado
+            print(f"[{len(resultados)}/{total}] {resultado['parametros']} rep {resultado['repeticao']}: "
+                  f"população final {resultado['populacao_final']} ({time.time() - inicio:.1f}s)")
+
+        if processos == 1:
+            for tarefa in pendentes:
+                gravar(executar_tarefa(tarefa))
+        else:
+            executor = ProcessPoolExecutor(max_workers=processos)
+            try:
+                futuros = {executor.submit(executar_tarefa, tarefa): tarefa for tarefa in pendentes}
+                for futuro in as_completed(futuros):
+                    try:
+                        gravar(futuro.result())
+                    except Exception as erro:
+                        # A tarefa fica sem resultado e é executada de novo ao retomar
+                        print(f"Erro na tarefa {futuros[futuro]['parametros']}: {erro!r}")
+            finally:
+                executor.shutdown(wait=True, cancel_futures=True)
+
+    return [resultados[tarefa["id"]] for tarefa in tarefas if tarefa["id"] in resultados]
+
+def agregar(resultados):
+    """
+    Agrupa os resultados por combinação de parâmetros e resume cada estatística.
+
+    Returns:
+        list[dict]: Para cada combinação, os parâmetros, a quantidade de execuções e, para cada item de
+        `ESTATISTICAS`, um dicionário com `media`, `desvio`, `min` e `max`.
+    """
+    grupos = {}
+    for resultado in resultados:
+        chave = json.dumps(resultado["parametros"], sort_keys=True)
+        grupos.setdefault(chave, []).append(resultado)
+
+    resumo = []
+    for execucoes in grupos.values():
+        linha = {"parametros": execucoes[0]["parametros"], "execucoes": len(execucoes)}
+        for estatistica in ESTATISTICAS:
+            valores = np.array([execucao[estatistica] for execucao in execucoes], dtype=float)
+            linha[estatistica] = {
+                "media": float(valores.mean()),
+                "desvio": float(valores.std()),
+                "min": float(valores.min()),
+                "max": float(valores.max()),
+            }
+        resumo.append(linha)
+    return resumo
+
+def formatar_resumo(resumo):
+    """
+    Monta uma tabela em texto com as médias e desvios das principais estatísticas de cada combinação.
+    """
+    colunas = [
+        ("populacao_final", "Pop. final"),
+        ("total_nascimentos", "Nascimentos"),
+        ("total_mortes_combate", "M. combate"),
+        ("total_mortes_fome", "M. fome"),
+        ("total_mortes_idade", "M. idade"),
+        ("fitness_medio", "Fitness"),
+    ]
+    texto = "\n" + "=" * 50 + "\n"
+    texto += "         RESUMO DA VARREDURA         \n"
+    texto += "=" * 50 + "\n"
+    for linha in resumo:
+        parametros = ", ".join(f"{nome}={valor}" for nome, valor in linha["parametros"].items()) or "aleatório"
+        texto += f"{parametros} ({linha['execucoes']} execuções)\n"
+        for estatistica, rotulo in colunas:
+            valores = linha[estatistica]
+            texto += f"  > {rotulo}: {valores['media']:.2f} ± {valores['desvio']:.2f} [{valores['min']:.0f}, {valores['max']:.0f}]\n"
+        texto += "-" * 50 + "\n"
+    return texto
+
+def _pesos(texto):
+    return [float(peso) for peso in texto.split(",")]
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--size", type=int, nargs="+", default=[GRID_SIZE], help="Tamanhos do ambiente.")
+    parser.add_argument("--mekos", type=int, nargs="+", default=[10], help="Populações iniciais.")
+    parser.add_argument("--ticks", type=int, nargs="+", default=[SIMULATION_STEPS], help="Durações, em ticks.")
+    parser.add_argument("--biomas", type=int, nargs="+", default=None, help="Quantidades de biomas (sorteadas se omitidas).")
+    parser.add_argument("--scale", type=float, nargs="+", default=None, help="Escalas do ruído de Perlin (sorteadas se omitidas).")
+    parser.add_argument("--pesos", type=_pesos, nargs="+", default=None,
+                        help="Pesos dos biomas, separados por vírgula (ex: 0.5,0.3,0.2). Sorteados se omitidos.")
+    parser.add_argument("--repeticoes", type=int, default=1, help="Execuções de cada combinação.")
+    parser.add_argument("--seed", type=int, default=0, help="Semente base da varredura.")
+    parser.add_argument("--processos", type=int, default=None, help="Quantidade de processos (padrão: número de CPUs).")
+    parser.add_argument("--saida", default=os.path.join("logs", "varredura.jsonl"), help="Arquivo de resultados (JSON Lines).")
+    parser.add_argument("--sem-retomar", action="store_true", help="Ignora resultados anteriores em --saida.")
+    args = parser.parse_args(argv)
+
+    grade = {"size": args.size, "n_mekos": args.mekos, "ticks": args.ticks}
+    if args.biomas is not None:
+        grade["n_biomas"] = args.biomas
+    if args.scale is not None:
+        grade["scale"] = args.scale
+    if args.pesos is not None:
+        grade["pesos_biomas"] = args.pesos
+
+    tarefas = gerar_tarefas(grade, args.repeticoes, args.seed)
+    resultados = executar_varredura(tarefas, args.saida, args.processos, retomar=not args.sem_retomar)
+    resumo = agregar(resultados)
+
+    caminho_resumo = os.path.splitext(args.saida)[0] + "_resumo.json"
+    with open(caminho_resumo, "w") as f:
+        json.dump(resumo, f, indent=4)
+
+    print(formatar_resumo(resumo))
+    print(f"Resumo salvo em: {caminho_resumo}")
+
+if __name__ == "__main__":
+    main()